@@ -0,0 +1,66 @@
+import hashlib
+import json
+import os
+
+class AssetCache:
+    """Manifest of generated asset files with their generator version and content hash"""
+
+    def __init__(self, manifest_path):
+        self.manifest_path = manifest_path
+        self.entries = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, 'r') as f:
+                    self.entries = json.load(f).get('assets', {})
+            except (OSError, ValueError):
+                # A corrupt manifest just means everything is rebuilt
+                self.entries = {}
+
+    def save(self):
+        if not self.dirty:
+            return
+        with open(self.manifest_path, 'w') as f:
+            json.dump({'assets': self.entries}, f, indent=2, sort_keys=True)
+        self.dirty = False
+
+    def is_fresh(self, path, version, digest=None):
+        """Check that path exists, was built by this generator version and is unmodified
+
+        digest is the file's hash if the caller already has it.
+        """
+        entry = self.entries.get(self._key(path))
+        if entry is None or entry.get('version') != version:
+            return False
+        if not os.path.exists(path):
+            return False
+        if digest is None:
+            digest = self.hash_file(path)
+        return entry.get('sha256') == digest
+
+    def record(self, path, version):
+        """Store the version and content hash of a freshly generated file"""
+        self.entries[self._key(path)] = {
+            'version': version,
+            'sha256': self.hash_file(path)
+        }
+        self.dirty = True
+
+    @staticmethod
+    def hash_data(data):
+        return hashlib.sha256(data).hexdigest()
+
+    def hash_file(self, path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(65536), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _key(self, path):
+        # Manifest keys are relative to the manifest so the tree can move
+        relative = os.path.relpath(path, os.path.dirname(self.manifest_path))
+        return relative.replace(os.sep, '/')
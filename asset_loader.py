@@ -0,0 +1,79 @@
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class AssetLoader:
+    """Runs asset loading jobs on worker threads and finishes them on the main thread
+
+    Each job has a load function, run on a worker in the order jobs were
+    added, and an optional finish function that poll() runs on the calling
+    thread with the load result. Anything that needs the display, such as
+    convert_alpha, belongs in finish.
+    """
+
+    def __init__(self, workers=2):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='asset-loader')
+        self.results = queue.Queue()
+        self.pending = set()
+        self.total = 0
+        self.failed = {}
+        self.start_time = time.perf_counter()
+        self.finish_time = None
+
+    def add(self, name, load, finish=None):
+        self.pending.add(name)
+        self.total += 1
+        self.finish_time = None
+        self.executor.submit(self._load, name, load, finish)
+
+    def _load(self, name, load, finish):
+        try:
+            self.results.put((name, load(), None, finish))
+        except Exception as e:
+            self.results.put((name, None, e, finish))
+
+    def poll(self, budget=0.004):
+        """Finish completed jobs until none are waiting or budget seconds have passed"""
+        deadline = time.perf_counter() + budget
+        while self.pending:
+            try:
+                self._finish(*self.results.get_nowait())
+            except queue.Empty:
+                break
+            if time.perf_counter() > deadline:
+                break
+
+    def wait(self, names=None):
+        """Block until the named jobs (or all jobs) are finished"""
+        while not self.is_loaded(names):
+            self._finish(*self.results.get())
+
+    def _finish(self, name, result, error, finish):
+        if error is None and finish is not None:
+            try:
+                finish(result)
+            except Exception as e:
+                error = e
+        if error is not None:
+            self.failed[name] = error
+            print(f"Error loading {name}: {error}")
+        self.pending.discard(name)
+        if not self.pending:
+            self.finish_time = time.perf_counter()
+            self.executor.shutdown(wait=False)
+
+    def is_loaded(self, names=None):
+        if names is None:
+            return not self.pending
+        return self.pending.isdisjoint(names)
+
+    @property
+    def progress(self):
+        if self.total == 0:
+            return 1.0
+        return (self.total - len(self.pending)) / self.total
+
+    @property
+    def elapsed(self):
+        end = self.finish_time if self.finish_time is not None else time.perf_counter()
+        return end - self.start_time
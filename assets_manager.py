@@ -1,13 +1,33 @@
 import pygame
 import os
 import random
-import math
 import wave
-import array
 import struct
+import music_synth
+import io
+from collections import OrderedDict
+from asset_cache import AssetCache
+from asset_loader import AssetLoader
+from particle_store import ParticleStore
+from quality import QualityGovernor
+from glow import GlowCache
 
 class AssetsManager:
-    def __init__(self):
+    # Quantization step for cached image scale variants
+    SCALE_STEP = 0.05
+    
+    FONT_FILE = 'MedievalSharp-Regular.ttf'
+    FONT_SIZES = {'title': 64, 'subtitle': 48, 'button': 36, 'text': 24}
+    
+    # Loading jobs the main menu needs before it can be shown, queued first
+    MENU_ASSETS = ('fonts', 'image:background', 'image:button_wood', 'image:wizard_staff', 'image:panel_wood')
+    
+    def __init__(self, background=False):
+        """Set up the manager and load all assets
+        
+        With background set, loading continues on worker threads after
+        this returns; call poll_loading() every frame until is_loaded().
+        """
         self.assets_dir = 'assets'
         self.images_dir = os.path.join(self.assets_dir, 'images')
         self.fonts_dir = os.path.join(self.assets_dir, 'fonts')
@@ -33,24 +53,106 @@ class AssetsManager:
             'stars': (255, 255, 220)
         }
         
-        # Create placeholder images if they don't exist
-        self.create_placeholder_images()
+        # Placeholder image generators with their versions. Bump a version
+        # whenever its drawing code changes so cached files are rebuilt.
+        self.image_generators = {
+            'button_wood': (1, self._generate_button_wood),
+            'panel_wood': (1, self._generate_panel_wood),
+            'magic_effect': (1, self._generate_magic_effect),
+            'background': (1, self._generate_background),
+            'wizard_hat': (1, self._generate_wizard_hat),
+            'wizard_staff': (1, self._generate_wizard_staff)
+        }
+        self.asset_cache = AssetCache(os.path.join(self.assets_dir, 'manifest.json'))
+        self.startup_timings = {}
+        
+        # Filled in as loading jobs finish
+        self.fonts = {}
+        self.images = {}
+        self.music = {}
+        self.placeholders_generated = []
+        
+        # Called with the music name once a track is ready to play
+        self.on_music_loaded = None
+        
+        # Create particles for visual effects
+        self.particles = ParticleStore()
+        
+        # Frame-time driven effect quality, read by everything that draws effects
+        self.quality = QualityGovernor()
+        
+        # Pre-rendered radial glows for auras and crystals
+        self.glows = GlowCache()
+        
+        # Scaled/flipped image variants keyed by (name, quantized scale, flip)
+        self.image_variants = {}
+        
+        # Player sprite variants keyed by player size and customization
+        self.player_sprites = {}
         
-        # Create placeholder music if it doesn't exist
-        self.create_placeholder_music()
+        # LRU cache of rendered text surfaces
+        self.text_cache = OrderedDict()
+        self.text_cache_size = 256
+        self.text_cache_hits = 0
+        self.text_cache_misses = 0
         
-        # Initialize pygame font
+        # Worker threads read and decode files; the main thread regenerates
+        # stale placeholders, creates fonts and converts images for the display
+        self.loader = AssetLoader()
+        self.start_loading()
+        if not background:
+            self.finish_loading()
+    
+    def start_loading(self):
+        """Queue every loading job, the main menu's first"""
         pygame.font.init()
+        self.loader.add('fonts', self._read_font_file, self._create_fonts)
+        
+        names = [name[len('image:'):] for name in self.MENU_ASSETS if name.startswith('image:')]
+        names += list(self.image_generators)
+        names += sorted(os.path.splitext(filename)[0] for filename in os.listdir(self.images_dir)
+                        if filename.endswith(('.png', '.jpg', '.bmp')))
+        for name in dict.fromkeys(names):
+            self.loader.add('image:' + name, lambda name=name: self._read_image_file(name),
+                            lambda result, name=name: self._add_image(name, *result))
         
+        self.loader.add('music', self.create_placeholder_music, lambda result: self.load_music())
+    
+    def poll_loading(self):
+        """Finish loading jobs that completed on the worker threads; call once per frame"""
+        if not self.loader.is_loaded():
+            self.loader.poll()
+            if self.loader.is_loaded():
+                self._loading_finished()
+    
+    def finish_loading(self, names=None):
+        """Block until the named loading jobs (or all of them) are done"""
+        if not self.loader.is_loaded():
+            self.loader.wait(names)
+            if self.loader.is_loaded():
+                self._loading_finished()
+    
+    def is_loaded(self, names=None):
+        return self.loader.is_loaded(names)
+    
+    def _loading_finished(self):
+        self.asset_cache.save()
+        elapsed_ms = self.loader.elapsed * 1000
+        self.startup_timings['assets'] = elapsed_ms
+        print(f"Assets loaded in {elapsed_ms:.1f} ms ({self.loader.total} jobs), placeholder images: "
+              f"{len(self.placeholders_generated)} generated, "
+              f"{len(self.image_generators) - len(self.placeholders_generated)} cached")
+    
+    def _read_font_file(self):
+        with open(os.path.join(self.fonts_dir, self.FONT_FILE), 'rb') as f:
+            return f.read()
+    
+    def _create_fonts(self, font_data):
         try:
             # Try to load the custom font
-            self.fonts = {
-                'title': pygame.font.Font(os.path.join(self.fonts_dir, 'MedievalSharp-Regular.ttf'), 64),
-                'subtitle': pygame.font.Font(os.path.join(self.fonts_dir, 'MedievalSharp-Regular.ttf'), 48),
-                'button': pygame.font.Font(os.path.join(self.fonts_dir, 'MedievalSharp-Regular.ttf'), 36),
-                'text': pygame.font.Font(os.path.join(self.fonts_dir, 'MedievalSharp-Regular.ttf'), 24)
-            }
-        except:
+            self.fonts = {name: pygame.font.Font(io.BytesIO(font_data), size)
+                          for name, size in self.FONT_SIZES.items()}
+        except Exception:
             # Fallback to system font
             self.fonts = {
                 'title': pygame.font.SysFont('serif', 64, bold=True),
@@ -58,68 +160,82 @@ class AssetsManager:
                 'button': pygame.font.SysFont('serif', 36),
                 'text': pygame.font.SysFont('serif', 24)
             }
+    
+    def _read_image_file(self, name):
+        """Worker side of an image job: read and decode the file, touching no shared state
         
-        # Load images
-        self.images = {}
-        self.load_images()
-        
-        # Load music
-        self.music = {}
-        self.load_music()
-        
-        # Create particles for visual effects
-        self.particles = []
+        Returns (surface, content hash), or (None, None) if there is no file yet.
+        """
+        for extension in ('.png', '.jpg', '.bmp'):
+            path = os.path.join(self.images_dir, name + extension)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    data = f.read()
+                return pygame.image.load(io.BytesIO(data), name + extension), AssetCache.hash_data(data)
+        return None, None
     
-    def load_images(self):
-        # Load actual images
-        for filename in os.listdir(self.images_dir):
-            if filename.endswith(('.png', '.jpg', '.bmp')):
-                name = os.path.splitext(filename)[0]
-                self.images[name] = pygame.image.load(os.path.join(self.images_dir, filename)).convert_alpha()
+    def _add_image(self, name, surface, digest):
+        """Main thread side: regenerate the placeholder if stale, then convert for the display"""
+        if name in self.image_generators:
+            version, generator = self.image_generators[name]
+            path = os.path.join(self.images_dir, name + '.png')
+            if surface is None or not self.asset_cache.is_fresh(path, version, digest):
+                # Seed each generator by name so rebuilt images are reproducible
+                surface = generator(random.Random(name))
+                pygame.image.save(surface, path)
+                self.asset_cache.record(path, version)
+                self.placeholders_generated.append(name)
+        if surface is None:
+            raise FileNotFoundError(f"no image file for {name}")
+        self.images[name] = surface.convert_alpha()
     
     def load_music(self):
         for filename in os.listdir(self.music_dir):
             if filename.endswith(('.mp3', '.wav')):
                 name = os.path.splitext(filename)[0]
                 self.music[name] = os.path.join(self.music_dir, filename)
+                if self.on_music_loaded:
+                    self.on_music_loaded(name)
     
-    def create_placeholder_images(self):
+    def _generate_button_wood(self, rng):
         # Create wooden button background with texture
         button = pygame.Surface((200, 50))
         button.fill(self.colors['wood_dark'])
         # Add wood grain texture
         for i in range(10):
-            x = random.randint(0, 200)
-            width = random.randint(1, 3)
+            x = rng.randint(0, 200)
+            width = rng.randint(1, 3)
             pygame.draw.line(button, (130, 60, 10), (x, 0), (x, 50), width)
         pygame.draw.rect(button, self.colors['wood_light'], (2, 2, 196, 46))
         # Add more texture details
         for i in range(5):
-            x = random.randint(5, 195)
-            y = random.randint(5, 45)
-            radius = random.randint(2, 5)
+            x = rng.randint(5, 195)
+            y = rng.randint(5, 45)
+            radius = rng.randint(2, 5)
             pygame.draw.circle(button, (180, 150, 120), (x, y), radius)
         pygame.draw.rect(button, self.colors['wood_accent'], (2, 2, 196, 46), 2)
-        pygame.image.save(button, os.path.join(self.images_dir, 'button_wood.png'))
-        
+        return button
+    
+    def _generate_panel_wood(self, rng):
         # Create wooden panel background with texture
         panel = pygame.Surface((400, 300))
         panel.fill(self.colors['wood_dark'])
         # Add wood grain texture
         for i in range(30):
-            x = random.randint(0, 400)
-            width = random.randint(1, 4)
+            x = rng.randint(0, 400)
+            width = rng.randint(1, 4)
             pygame.draw.line(panel, (130, 60, 10), (x, 0), (x, 300), width)
         pygame.draw.rect(panel, self.colors['wood_light'], (4, 4, 392, 292))
         # Add more texture details
         for i in range(20):
-            x = random.randint(10, 390)
-            y = random.randint(10, 290)
-            radius = random.randint(3, 7)
+            x = rng.randint(10, 390)
+            y = rng.randint(10, 290)
+            radius = rng.randint(3, 7)
             pygame.draw.circle(panel, (180, 150, 120), (x, y), radius)
         pygame.draw.rect(panel, self.colors['wood_accent'], (4, 4, 392, 292), 4)
-        pygame.image.save(panel, os.path.join(self.images_dir, 'panel_wood.png'))
-        
+        return panel
+    
+    def _generate_magic_effect(self, rng):
         # Create magic effect with glow
         magic = pygame.Surface((64, 64), pygame.SRCALPHA)
         for radius in range(30, 0, -1):
@@ -132,24 +248,25 @@ class AssetsManager:
                 color = list(self.colors['magic_purple'])
                 color.append(alpha)
                 pygame.draw.circle(magic, color, (32, 32), radius // 2)
-        pygame.image.save(magic, os.path.join(self.images_dir, 'magic_effect.png'))
-        
+        return magic
+    
+    def _generate_background(self, rng):
         # Create starry background
         background = pygame.Surface((800, 600))
         background.fill(self.colors['background'])
         # Add gradient effect
         for y in range(600):
-            alpha = min(255, y // 3)
             pygame.draw.line(background, (15, 10, 20), (0, y), (800, y))
         # Add stars
         for i in range(200):
-            x = random.randint(0, 800)
-            y = random.randint(0, 600)
-            radius = random.randint(1, 3)
-            brightness = random.randint(150, 255)
+            x = rng.randint(0, 800)
+            y = rng.randint(0, 600)
+            radius = rng.randint(1, 3)
+            brightness = rng.randint(150, 255)
             pygame.draw.circle(background, (brightness, brightness, brightness), (x, y), radius)
-        pygame.image.save(background, os.path.join(self.images_dir, 'background.png'))
-        
+        return background
+    
+    def _generate_wizard_hat(self, rng):
         # Create wizard hat
         hat = pygame.Surface((80, 60), pygame.SRCALPHA)  # Smaller dimensions
         # Base hat
@@ -167,8 +284,9 @@ class AssetsManager:
                          [(40, 25), (45, 35), (55, 35), (48, 43), 
                           (50, 55), (40, 49), (30, 55), (32, 43), 
                           (25, 35), (35, 35)])
-        pygame.image.save(hat, os.path.join(self.images_dir, 'wizard_hat.png'))
-        
+        return hat
+    
+    def _generate_wizard_staff(self, rng):
         # Create wizard staff
         staff = pygame.Surface((30, 200), pygame.SRCALPHA)
         # Staff base
@@ -182,7 +300,7 @@ class AssetsManager:
             color = list(self.colors['magic_blue'])
             color.append(alpha if radius > 10 else alpha // 2)
             pygame.draw.circle(staff, color, (15, 15), radius)
-        pygame.image.save(staff, os.path.join(self.images_dir, 'wizard_staff.png'))
+        return staff
     
     def create_placeholder_music(self):
         """Create a simple placeholder background music file"""
@@ -193,51 +311,13 @@ class AssetsManager:
         
         # Create a simple WAV file with a basic melody
         try:
-            # Initialize parameters
-            sample_rate = 44100  # CD quality
-            duration = 10.0      # 10 seconds loop
-            
-            # Create the WAV file
             with wave.open(background_music_path, 'w') as wav_file:
-                wav_file.setparams((1, 2, sample_rate, int(sample_rate * duration), 'NONE', 'not compressed'))
-                
-                # Create the audio data
-                amplitude = 32767  # Max amplitude for 16-bit audio
-                data = array.array('h')
-                
-                # Generate a simple melody with a few notes
-                # C major scale frequencies: C(261.63), D(293.66), E(329.63), F(349.23), G(392.00), A(440.00), B(493.88)
-                notes = [261.63, 329.63, 392.00, 440.00, 392.00, 329.63, 261.63, 0,  # Simple ascending/descending pattern
-                         293.66, 349.23, 440.00, 493.88, 440.00, 349.23, 293.66, 0]  # Another pattern
+                wav_file.setparams((1, 2, music_synth.SAMPLE_RATE, music_synth.total_samples(),
+                                    'NONE', 'not compressed'))
                 
-                note_duration = duration / len(notes)  # Each note's duration
-                
-                for note_freq in notes:
-                    # Generate samples for each note
-                    note_samples = int(note_duration * sample_rate)
-                    
-                    # If frequency is 0, generate silence
-                    if note_freq == 0:
-                        for i in range(note_samples):
-                            data.append(0)
-                    else:
-                        # Generate a sine wave for the note
-                        for i in range(note_samples):
-                            # Apply an envelope to avoid pops/clicks
-                            if i < 1000:  # fade in
-                                env = i / 1000.0
-                            elif i > note_samples - 1000:  # fade out
-                                env = (note_samples - i) / 1000.0
-                            else:
-                                env = 1.0
-                                
-                            # Create the sample
-                            t = float(i) / sample_rate  # time in seconds
-                            sample = int(amplitude * env * math.sin(2 * math.pi * note_freq * t))
-                            data.append(sample)
-                
-                # Write the audio data
-                wav_file.writeframes(data.tobytes())
+                # Synthesize and write one note at a time
+                for chunk in music_synth.melody_chunks():
+                    wav_file.writeframes(chunk)
             
             print("Created placeholder background music")
         except Exception as e:
@@ -246,12 +326,59 @@ class AssetsManager:
     def get_font(self, name):
         return self.fonts.get(name, self.fonts['text'])
     
+    def render_text(self, font, text, color, antialias=True, alpha=None):
+        """Render text through an LRU cache keyed by font, text, color, antialias and alpha
+        
+        font may be a font name or a pygame Font. The returned surface is
+        shared, so callers must not modify it.
+        """
+        if isinstance(font, str):
+            font = self.get_font(font)
+        key = (font, text, tuple(color), antialias, alpha)
+        
+        surface = self.text_cache.get(key)
+        if surface is not None:
+            self.text_cache.move_to_end(key)
+            self.text_cache_hits += 1
+            return surface
+        
+        self.text_cache_misses += 1
+        surface = font.render(text, antialias, color)
+        if alpha is not None:
+            surface.set_alpha(alpha)
+        
+        self.text_cache[key] = surface
+        if len(self.text_cache) > self.text_cache_size:
+            self.text_cache.popitem(last=False)
+        return surface
+    
     def get_color(self, name):
         return self.colors.get(name, (255, 255, 255))
     
     def get_image(self, name):
         return self.images.get(name)
     
+    def get_image_variant(self, name, scale=1.0, flip_x=False):
+        """Return a cached scaled and optionally mirrored copy of an image
+        
+        The scale is quantized to SCALE_STEP so nearby scales share a sprite.
+        """
+        steps = round(scale / self.SCALE_STEP)
+        key = (name, steps, flip_x)
+        image = self.image_variants.get(key)
+        if image is None:
+            original = self.images.get(name)
+            if original is None:
+                return None
+            scale = steps * self.SCALE_STEP
+            width = int(original.get_width() * scale)
+            height = int(original.get_height() * scale)
+            image = pygame.transform.scale(original, (width, height))
+            if flip_x:
+                image = pygame.transform.flip(image, True, False)
+            self.image_variants[key] = image
+        return image
+    
     def get_music(self, name):
         return self.music.get(name)
     
@@ -269,65 +396,14 @@ class AssetsManager:
         if size < 1:
             size = 1
         
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed_val = random.uniform(0.5, speed)
-            lifetime_val = random.randint(lifetime // 2, lifetime)
-            size_val = random.randint(1, size)
-            
-            self.particles.append({
-                'x': x,
-                'y': y,
-                'dx': speed_val * math.cos(angle),
-                'dy': speed_val * math.sin(angle),
-                'color': color,
-                'size': size_val,
-                'lifetime': lifetime_val,
-                'max_lifetime': lifetime_val
-            })
+        # Fewer particles, and a lower live cap, at reduced quality
+        tier = self.quality.tier
+        count = min(int(count * tier['particle_scale']), tier['max_particles'] - len(self.particles))
+        if count > 0:
+            self.particles.emit(x, y, color, count, speed, size, lifetime)
     
     def update_particles(self):
-        for particle in self.particles[:]:
-            particle['x'] += particle['dx']
-            particle['y'] += particle['dy']
-            particle['lifetime'] -= 1
-            
-            if particle['lifetime'] <= 0:
-                self.particles.remove(particle)
+        self.particles.update()
     
-    def draw_particles(self, surface):
-        for particle in self.particles:
-            # Calculate transparency based on lifetime
-            fade_ratio = particle['lifetime'] / particle['max_lifetime']
-            
-            # Get base color
-            if 'color' in particle and isinstance(particle['color'], tuple) and len(particle['color']) >= 3:
-                base_color = particle['color'][:3]  # Ensure only RGB components
-            else:
-                base_color = (255, 200, 100)  # Default gold if invalid color
-            
-            # Fade color to white as the particle ages
-            if fade_ratio > 0.7:
-                color = base_color  # Original color
-            elif fade_ratio > 0.4:
-                # Blend toward white
-                color = (
-                    int(base_color[0] * 0.7 + 255 * 0.3),
-                    int(base_color[1] * 0.7 + 255 * 0.3),
-                    int(base_color[2] * 0.7 + 255 * 0.3)
-                )
-            else:
-                # Fade more toward white
-                color = (
-                    int(base_color[0] * 0.3 + 255 * 0.7),
-                    int(base_color[1] * 0.3 + 255 * 0.7),
-                    int(base_color[2] * 0.3 + 255 * 0.7)
-                )
-            
-            # Draw the particle
-            pygame.draw.circle(
-                surface, 
-                color, 
-                (int(particle['x']), int(particle['y'])), 
-                max(1, int(particle['size'] * fade_ratio))
-            ) 
\ No newline at end of file
+    def draw_particles(self, surface, alpha=1.0, offset=(0, 0)):
+        self.particles.draw(surface, alpha, offset)
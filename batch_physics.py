@@ -0,0 +1,248 @@
+import numpy as np
+
+class BatchPhysics:
+    """Movement, gravity and platform collision for many wizards at once
+
+    Applies the same rules as Player.update to N agents stored as NumPy
+    arrays, one vectorized step per tick. speed, jump_power and gravity
+    are per agent, so a batch can try out many tunings side by side.
+    Positions are float64 and rects are truncated with the same int()
+    rounding as the player's pygame.Rect, so a single agent matches Player
+    exactly. Only gameplay state is simulated: no particles, animation,
+    spells or damage.
+    """
+
+    def __init__(self, count, platforms, world_size, width=40, height=60,
+                 speed=5, jump_power=-15, gravity=0.8, cell_size=64):
+        self.count = count
+        self.width = width
+        self.height = height
+        self.world_width, self.world_height = world_size
+        self.cell_size = cell_size
+
+        # Tuning, one value per agent
+        self.speed = np.full(count, speed, dtype=np.float64)
+        self.jump_power = np.full(count, jump_power, dtype=np.float64)
+        self.gravity = np.full(count, gravity, dtype=np.float64)
+
+        # State, as in Player
+        self.x = np.zeros(count, dtype=np.float64)
+        self.y = np.zeros(count, dtype=np.float64)
+        self.prev_x = np.zeros(count, dtype=np.float64)
+        self.prev_y = np.zeros(count, dtype=np.float64)
+        self.velocity_x = np.zeros(count, dtype=np.float64)
+        self.velocity_y = np.zeros(count, dtype=np.float64)
+        self.on_ground = np.zeros(count, dtype=bool)
+        self.facing_right = np.ones(count, dtype=bool)
+
+        # Top left of each agent's rect, always int() of the position
+        self.rect_x = np.zeros(count, dtype=np.int64)
+        self.rect_y = np.zeros(count, dtype=np.int64)
+
+        self.set_platforms(platforms)
+
+    def set_platforms(self, platforms):
+        """Use a new platform list, e.g. after the level streamed chunks in or out
+
+        Platforms are also filed in a uniform grid, like SpatialHash but as
+        flat arrays: cell_platforms holds the platform indices of every cell
+        in turn, and cell_starts and cell_ends where each cell's run begins
+        and ends, indexed by cell x * rows + cell y.
+        """
+        rects = [platform['rect'] for platform in platforms]
+        self.platform_left = np.array([r.left for r in rects], dtype=np.int64)
+        self.platform_top = np.array([r.top for r in rects], dtype=np.int64)
+        self.platform_right = np.array([r.right for r in rects], dtype=np.int64)
+        self.platform_bottom = np.array([r.bottom for r in rects], dtype=np.int64)
+
+        size = self.cell_size
+        if not rects:
+            self.cell_origin = (0, 0)
+            self.grid_size = (0, 0)
+            return
+        first_x, last_x = self.platform_left // size, (self.platform_right - 1) // size
+        first_y, last_y = self.platform_top // size, (self.platform_bottom - 1) // size
+        self.cell_origin = (first_x.min(), first_y.min())
+        self.grid_size = (last_x.max() - first_x.min() + 1, last_y.max() - first_y.min() + 1)
+        self.platform_first_cell = (first_x, first_y)
+
+        platform, cell_x, cell_y = self._cells(first_x, last_x, first_y, last_y)
+        key = cell_x * self.grid_size[1] + cell_y
+        self.cell_platforms = platform[np.argsort(key, kind='stable')]
+        self.cell_ends = np.cumsum(np.bincount(key, minlength=self.grid_size[0] * self.grid_size[1]))
+        self.cell_starts = self.cell_ends - np.bincount(key, minlength=len(self.cell_ends))
+
+    def _cells(self, first_x, last_x, first_y, last_y):
+        """(owner index, cell x, cell y) for every grid cell in each owner's cell range
+
+        Cell coordinates are relative to cell_origin.
+        """
+        columns = last_x - first_x + 1
+        rows = last_y - first_y + 1
+        per_owner = columns * rows
+        owner = np.repeat(np.arange(len(per_owner)), per_owner)
+        offset = np.arange(len(owner)) - np.repeat(np.cumsum(per_owner) - per_owner, per_owner)
+        cell_x = first_x[owner] + offset // rows[owner] - self.cell_origin[0]
+        cell_y = first_y[owner] + offset % rows[owner] - self.cell_origin[1]
+        return owner, cell_x, cell_y
+
+    def place(self, x, y):
+        """Put every agent at a position (scalars or arrays), at rest"""
+        self.x[:] = x
+        self.y[:] = y
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+        self.rect_x[:] = np.trunc(self.x)
+        self.rect_y[:] = np.trunc(self.y)
+        self.velocity_x[:] = 0
+        self.velocity_y[:] = 0
+        self.on_ground[:] = False
+
+    def _candidates(self, from_x, from_y):
+        """Groups of (agent indices, platform indices) to collide in turn
+
+        An agent can only hit platforms that its padded sweep reaches (the
+        region Player._nearby_platforms queries), found through the platform
+        grid. The k-th group holds each agent's k-th such platform in list
+        order, so agents near several platforms meet them in the order
+        Player does, as pushes move them along.
+        """
+        from_x = np.trunc(from_x).astype(np.int64)
+        from_y = np.trunc(from_y).astype(np.int64)
+        left = np.minimum(self.rect_x, from_x) - 8
+        top = np.minimum(self.rect_y, from_y) - 8
+        right = np.maximum(self.rect_x, from_x) + self.width + 8
+        bottom = np.maximum(self.rect_y, from_y) + self.height + 8
+
+        # Grid cells under each sweep, clipped to the cells platforms occupy
+        size = self.cell_size
+        origin_x, origin_y = self.cell_origin
+        columns, rows = self.grid_size
+        first_x = np.maximum(left // size, origin_x)
+        last_x = np.minimum((right - 1) // size, origin_x + columns - 1)
+        first_y = np.maximum(top // size, origin_y)
+        last_y = np.minimum((bottom - 1) // size, origin_y + rows - 1)
+        inside = np.flatnonzero((first_x <= last_x) & (first_y <= last_y))
+        if len(inside) == 0:
+            return
+        owner, cell_x, cell_y = self._cells(first_x[inside], last_x[inside], first_y[inside], last_y[inside])
+
+        # Platforms filed in those cells, as (agent, platform) pairs that
+        # really overlap
+        key = cell_x * rows + cell_y
+        starts = self.cell_starts[key]
+        counts = self.cell_ends[key] - starts
+        ends = np.cumsum(counts)
+        if ends[-1] == 0:
+            return
+        cell = np.repeat(np.arange(len(key)), counts)
+        agents = inside[owner[cell]]
+        platforms = self.cell_platforms[np.arange(ends[-1]) + np.repeat(starts - ends + counts, counts)]
+        keep = np.flatnonzero((left[agents] < self.platform_right[platforms]) &
+                              (right[agents] > self.platform_left[platforms]) &
+                              (top[agents] < self.platform_bottom[platforms]) &
+                              (bottom[agents] > self.platform_top[platforms]))
+        agents, platforms, cell = agents[keep], platforms[keep], cell[keep]
+
+        # A pair shows up in every cell the sweep and platform share; keep
+        # it only in the first of them
+        platform_x, platform_y = self.platform_first_cell
+        keep = ((cell_x[cell] + origin_x == np.maximum(first_x[agents], platform_x[platforms])) &
+                (cell_y[cell] + origin_y == np.maximum(first_y[agents], platform_y[platforms])))
+        agents, platforms = agents[keep], platforms[keep]
+        if len(agents) == 0:
+            return
+
+        # Each agent's platforms in list order, then one group per rank.
+        # Pairs already come grouped by agent, so the stable sort has
+        # little to do
+        order = np.argsort(agents * len(self.platform_left) + platforms, kind='stable')
+        agents, platforms = agents[order], platforms[order]
+        rank = np.arange(len(agents)) - np.searchsorted(agents, agents)
+        for k in range(rank.max() + 1):
+            group = np.flatnonzero(rank == k)
+            yield agents[group], platforms[group]
+
+    def step(self, left, right, jump):
+        """Advance every agent one tick; left, right and jump are bool arrays of held keys"""
+        width, height = self.width, self.height
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+        prev_x, prev_y = self.prev_x, self.prev_y
+
+        # Horizontal movement, left winning over right
+        vx = self.velocity_x
+        right = right & ~left
+        idle = ~(left | right)
+        vx[left] = np.maximum(vx[left] - 1, -self.speed[left])
+        vx[right] = np.minimum(vx[right] + 1, self.speed[right])
+        self.facing_right[left] = False
+        self.facing_right[right] = True
+        vx[idle] = np.where(vx[idle] > 0, np.maximum(0, vx[idle] - 0.5),
+                            np.where(vx[idle] < 0, np.minimum(0, vx[idle] + 0.5), vx[idle]))
+
+        self.x += vx
+        self.rect_x[:] = np.trunc(self.x)
+
+        # Horizontal collisions, platform by platform in list order as the
+        # rect moves with each push
+        for agents, platform in self._candidates(prev_x, prev_y):
+            platform_left = self.platform_left[platform]
+            platform_right = self.platform_right[platform]
+            rx, ry = self.rect_x[agents], self.rect_y[agents]
+            hit = ((rx < platform_right) & (rx + width > platform_left) &
+                   (ry < self.platform_bottom[platform]) & (ry + height > self.platform_top[platform]))
+            from_left = hit & (prev_x[agents] + width <= platform_left + 2)
+            from_right = hit & ~from_left & (prev_x[agents] >= platform_right - 2)
+
+            self.rect_x[agents] = np.where(from_left, platform_left - width,
+                                           np.where(from_right, platform_right, rx))
+            pushed = agents[from_left | from_right]
+            self.x[pushed] = self.rect_x[pushed]
+            vx[pushed] = 0
+
+        # Level bounds
+        outside = self.x < 0
+        self.x[outside] = 0
+        self.rect_x[outside] = 0
+        vx[outside] = 0
+        outside = self.x > self.world_width - width
+        self.x[outside] = self.world_width - width
+        self.rect_x[outside] = np.trunc(self.x[outside])
+        vx[outside] = 0
+
+        # Jumping, then gravity and vertical movement
+        vy = self.velocity_y
+        jumping = jump & self.on_ground
+        vy[jumping] = self.jump_power[jumping]
+        vy += self.gravity
+        self.y += vy
+        self.rect_y[:] = np.trunc(self.y)
+
+        # Vertical collisions: land on tops, bump into bottoms
+        self.on_ground[:] = False
+        for agents, platform in self._candidates(self.x, prev_y):
+            platform_top = self.platform_top[platform]
+            platform_bottom = self.platform_bottom[platform]
+            rx, ry = self.rect_x[agents], self.rect_y[agents]
+            agent_vy = vy[agents]
+            overlap = ((rx + width > self.platform_left[platform] + 5) &
+                       (rx < self.platform_right[platform] - 5))
+            landing = (overlap & (ry + height >= platform_top) &
+                       (prev_y[agents] + height <= platform_top + 5) & (agent_vy >= 0))
+            ceiling = (overlap & ~landing & (ry <= platform_bottom) &
+                       (prev_y[agents] >= platform_bottom - 5) & (agent_vy < 0))
+
+            self.rect_y[agents] = np.where(landing, platform_top - height,
+                                           np.where(ceiling, platform_bottom, ry))
+            self.on_ground[agents[landing]] = True
+            stopped = agents[landing | ceiling]
+            self.y[stopped] = self.rect_y[stopped]
+            vy[stopped] = 0
+
+        # Bottom of the level
+        fallen = self.y > self.world_height
+        self.y[fallen] = self.world_height - height
+        self.rect_y[fallen] = np.trunc(self.y[fallen])
+        vy[fallen] = 0
+        self.on_ground[fallen] = True
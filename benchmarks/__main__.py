@@ -0,0 +1,26 @@
+import argparse
+
+from benchmarks.harness import run_benchmarks, write_json, compare
+
+def main():
+    parser = argparse.ArgumentParser(description="Wizard Quest benchmark suite")
+    parser.add_argument('--filter', help="only run scenarios whose name contains this text")
+    parser.add_argument('--calls', type=int, default=200, help="timed calls per scenario")
+    parser.add_argument('--warmup', type=int, default=20, help="untimed calls per scenario")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    parser.add_argument('--memory', action='store_true',
+                        help="also report peak Python allocations per scenario (tracemalloc)")
+    parser.add_argument('--json', help="write results to this JSON file")
+    parser.add_argument('--compare', help="compare results against a previous JSON file")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.filter, args.calls, args.warmup, args.seed, args.memory)
+
+    if args.json:
+        write_json(results, args.json)
+        print(f"\nWrote {args.json}")
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == '__main__':
+    main()
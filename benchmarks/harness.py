@@ -0,0 +1,171 @@
+import json
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pygame
+
+import headless
+
+class Scenario:
+    def __init__(self, name, param, setup):
+        self.name = name
+        self.param = param
+        self.setup = setup
+
+    @property
+    def label(self):
+        return self.name if self.param is None else f"{self.name}[{self.param}]"
+
+SCENARIOS = []
+
+def scenario(name, params=(None,)):
+    """Register a setup function as a benchmark scenario, once per parameter
+
+    The setup function receives (context, param) and returns the callable
+    that is timed, one call per sample.
+    """
+    def register(setup):
+        for param in params:
+            SCENARIOS.append(Scenario(name, param, setup))
+        return setup
+    return register
+
+class BenchmarkContext:
+    """Headless game shared by all scenarios, plus an off-screen target surface"""
+    def __init__(self, seed=0):
+        self.seed = seed
+        headless.use_dummy_drivers()
+        random.seed(seed)
+
+        from main import Game
+        self.game = Game()
+        self.level = self.game.level
+        self.platforms = list(self.game.platforms)
+        self.surface = self.make_surface()
+
+        # Scratch files such as generated levels, removed by close()
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def temp_path(self, name):
+        """Path for a scratch file that lives until the context is closed"""
+        return os.path.join(self.temp_dir.name, name)
+
+    def close(self):
+        self.temp_dir.cleanup()
+
+    def make_surface(self):
+        size = (self.game.settings.window_width, self.game.settings.window_height)
+        return pygame.Surface(size).convert()
+
+    def reset(self):
+        """Put the game back into a fresh, seeded gameplay state"""
+        headless.seed_everything(self.game, self.seed)
+        self.game.assets.particles.clear()
+        self.game.screen = self.surface
+        self.game.settings.dirty_rect_rendering = False
+        self.game.assets.quality.enabled = False
+        self.game.assets.quality.reset()
+        if self.game.level is not self.level or self.game.platforms != self.platforms:
+            self.game.level = self.level
+            self.game.platforms = list(self.platforms)
+            self.game.platforms_version += 1
+        self.game.start_game()
+        self.game.input_keys = None
+        return self.game
+
+def percentile(sorted_values, p):
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))
+    return sorted_values[index]
+
+def time_scenario(function, calls, warmup):
+    for _ in range(warmup):
+        function()
+
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)
+
+def measure_memory(function, calls):
+    """Peak KB of Python allocations above the starting point over a run of calls"""
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    for _ in range(calls):
+        function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return (peak - start) / 1024
+
+def run_benchmarks(name_filter=None, calls=200, warmup=20, seed=0, memory=False):
+    """Run every registered scenario (optionally filtered by substring) and return results"""
+    # Importing the scenario module registers its scenarios
+    from benchmarks import scenarios
+
+    context = BenchmarkContext(seed)
+    results = []
+
+    try:
+        for bench in SCENARIOS:
+            if name_filter and name_filter not in bench.label:
+                continue
+
+            context.reset()
+            function = bench.setup(context, bench.param)
+            samples = time_scenario(function, calls, warmup)
+
+            result = {
+                'name': bench.name,
+                'param': bench.param,
+                'calls': calls,
+                'median_ms': statistics.median(samples),
+                'p99_ms': percentile(samples, 99),
+                'mean_ms': statistics.mean(samples),
+                'min_ms': samples[0]
+            }
+            line = f"{bench.label:<40} median {result['median_ms']:8.3f} ms   p99 {result['p99_ms']:8.3f} ms"
+
+            # Memory runs separately, tracing would distort the timings
+            if memory:
+                result['peak_kb'] = measure_memory(function, calls)
+                line += f"   peak {result['peak_kb']:9.1f} KB"
+            results.append(result)
+            print(line)
+    finally:
+        context.close()
+
+    pygame.quit()
+    return results
+
+def write_json(results, path):
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'results': results
+    }
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+def compare(results, baseline_path):
+    """Print the median ratio of each result against a previous JSON report"""
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)['results']
+    previous = {(r['name'], r['param']): r for r in baseline}
+
+    print(f"\nCompared with {baseline_path} (median, new / old):")
+    for result in results:
+        old = previous.get((result['name'], result['param']))
+        if old is None or old['median_ms'] == 0:
+            continue
+        ratio = result['median_ms'] / old['median_ms']
+        label = Scenario(result['name'], result['param'], None).label
+        print(f"{label:<40} {old['median_ms']:8.3f} -> {result['median_ms']:8.3f} ms   x{ratio:.2f}")
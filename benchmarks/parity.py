@@ -0,0 +1,399 @@
+"""Checks that optimized code paths reproduce the reference behaviour exactly
+
+Run with: python -m benchmarks.parity
+"""
+import random
+import sys
+import pygame
+
+import headless
+from headless import InputScript, ScriptedKeys
+
+CHECKS = []
+
+def check(function):
+    CHECKS.append(function)
+    return function
+
+def random_platforms(game, count, rng):
+    width, height = game.settings.window_width, game.settings.window_height
+    return [{
+        'rect': pygame.Rect(rng.randint(-50, width), rng.randint(0, height), rng.randint(10, 300), rng.randint(5, 40)),
+        'color': game.assets.get_color('wood_dark'),
+        'texture': 'wood'
+    } for _ in range(count)]
+
+def player_state(player):
+    return (player.x, player.y, player.velocity_x, player.velocity_y, player.on_ground,
+            player.facing_right, player.frame)
+
+@check
+def platform_index_collisions(game, steps=3000):
+    """Player.update gives identical results with and without the spatial hash"""
+    from player import Player
+    from spatial_hash import SpatialHash
+
+    for seed in range(8):
+        rng = random.Random(seed)
+        platforms = random_platforms(game, rng.choice([20, 200, 1000]), rng)
+        index = SpatialHash.from_platforms(platforms, cell_size=rng.choice([32, 64, 128]))
+        linear, indexed = Player(game), Player(game)
+        script = InputScript(seed, game.settings.spell_hotkey)
+
+        for step in range(steps):
+            # Drop both players somewhere new now and then to cover fast falls
+            if step % 150 == 0:
+                x, y = rng.randint(0, game.settings.window_width), rng.randint(-300, 300)
+                velocity_y = rng.uniform(-15, 30)
+                for player in (linear, indexed):
+                    player.x, player.y = x, y
+                    player.rect.topleft = (x, y)
+                    player.velocity_y = velocity_y
+
+            keys = ScriptedKeys(script.frame_input(step)[0])
+            linear.update(platforms, keys)
+            indexed.update(platforms, keys, index)
+            if player_state(linear) != player_state(indexed):
+                return f"seed {seed}: diverged at step {step}"
+    return None
+
+@check
+def batch_physics(game, steps=1500, agents=8):
+    """BatchPhysics moves each agent exactly like a Player with the same tuning"""
+    import numpy as np
+    from batch_physics import BatchPhysics
+    from player import Player
+
+    for seed in range(4):
+        rng = random.Random(seed)
+        platforms = random_platforms(game, rng.choice([20, 200, 1000]), rng)
+        players = [Player(game) for _ in range(agents)]
+        batch = BatchPhysics(agents, platforms, (players[0].world_width, players[0].world_height))
+        for i, player in enumerate(players):
+            player.speed = batch.speed[i] = rng.choice([3, 5, 7.5])
+            player.jump_power = batch.jump_power[i] = rng.choice([-10, -15, -18.25])
+            player.gravity = batch.gravity[i] = rng.choice([0.5, 0.8, 1.1])
+        scripts = [InputScript(seed * agents + i, game.settings.spell_hotkey) for i in range(agents)]
+
+        for step in range(steps):
+            # Drop everyone somewhere new now and then to cover fast falls
+            if step % 150 == 0:
+                for i, player in enumerate(players):
+                    x, y = rng.randint(0, game.settings.window_width), rng.randint(-300, 300)
+                    player.x, player.y = batch.x[i], batch.y[i] = x, y
+                    player.rect.topleft = (batch.rect_x[i], batch.rect_y[i]) = (x, y)
+                    player.velocity_y = batch.velocity_y[i] = rng.uniform(-15, 30)
+
+            held = [script.frame_input(step)[0] for script in scripts]
+            for player, keys in zip(players, held):
+                player.update(platforms, ScriptedKeys(keys))
+            batch.step(np.array([pygame.K_LEFT in keys for keys in held]),
+                       np.array([pygame.K_RIGHT in keys for keys in held]),
+                       np.array([pygame.K_SPACE in keys for keys in held]))
+
+            for i, player in enumerate(players):
+                expected = (player.x, player.y, player.velocity_x, player.velocity_y,
+                            player.on_ground, player.facing_right, player.rect.x, player.rect.y)
+                actual = tuple(array[i].item() for array in (
+                    batch.x, batch.y, batch.velocity_x, batch.velocity_y,
+                    batch.on_ground, batch.facing_right, batch.rect_x, batch.rect_y))
+                if expected != actual:
+                    return f"seed {seed}: agent {i} diverged at step {step}: {expected} != {actual}"
+    return None
+
+@check
+def enemy_grid(game, steps=600):
+    """The enemy grid stays in step with moving enemies and finds every overlap"""
+    from enemies import EnemySystem, ENEMY_WIDTH, ENEMY_HEIGHT
+
+    def overlaps(enemy, left, top, right, bottom):
+        return (left < enemy.x + ENEMY_WIDTH and enemy.x < right and
+                top < enemy.y + ENEMY_HEIGHT and enemy.y < bottom)
+
+    for seed in range(4):
+        rng = random.Random(seed)
+        enemies = EnemySystem(game.assets, cell_size=rng.choice([32, 64, 128]))
+        for _ in range(rng.choice([10, 100, 400])):
+            x, y = rng.randint(-100, 900), rng.randint(-100, 700)
+            enemies.spawn(x, y, x - rng.randint(0, 300), x + rng.randint(0, 300), speed=rng.uniform(0.5, 4))
+
+        for step in range(steps):
+            enemies.update(game.player)
+            if step % 50 == 0:
+                # Some enemies die, which swaps pool slots around
+                for enemy in rng.sample(list(enemies), len(enemies) // 10):
+                    enemies.kill(enemy)
+
+            filed = [enemy for bucket in enemies.grid.cells.values() for enemy in bucket]
+            if sorted(map(id, filed)) != sorted(map(id, enemies)):
+                return f"seed {seed}: grid and pool disagree at step {step}"
+            if any(enemies.grid._cell(enemy) != enemy.cell for enemy in enemies):
+                return f"seed {seed}: enemy filed in a stale cell at step {step}"
+            if any(enemy is not enemies.pool.slots[enemy.index] for enemy in enemies):
+                return f"seed {seed}: pool index out of date at step {step}"
+
+            for _ in range(20):
+                left, top = rng.randint(-150, 950), rng.randint(-150, 750)
+                right, bottom = left + rng.randint(1, 120), top + rng.randint(1, 80)
+                found = enemies.grid.first_overlap(left, top, right, bottom)
+                expected = any(overlaps(enemy, left, top, right, bottom) for enemy in enemies)
+                if (found is not None) != expected or (found and not overlaps(found, left, top, right, bottom)):
+                    return f"seed {seed}: wrong overlap for {(left, top, right, bottom)} at step {step}"
+    return None
+
+@check
+def scrolling_scene(game, frames=300):
+    """Scrolling moves platforms on the cached scene and shows them with partial updates
+
+    Every frame drawn with dirty rects must match the same frame drawn
+    in full, and most of them must be presented without a full flip.
+    """
+    import os
+    import tempfile
+    from level import generate_level, load_level
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'scroll.jsonl')
+        generate_level(path, 8000, 1200)
+        game.level = load_level(path, game.screen.get_size(), game.assets.get_color)
+        game.level.load_all()
+    game.platforms = game.level.platforms
+    game.platforms_version += 1
+    game.settings.dirty_rect_rendering = True
+    game.start_game()
+    game.assets.particles.clear()
+
+    presenter = game.dirty_rects
+    partial = presenter.partial_updates
+    try:
+        for frame in range(frames):
+            # Walk right and bob up and down, now and then jumping far
+            x = 100 + frame * 7 + (frame // 100) * 1500
+            game.player.place(x, 700 + (frame % 40) * 3)
+            rng_state = game.player.effect_rng.getstate()
+            game.draw_game()
+            game.present()
+            drawn = game.screen.copy()
+
+            presenter.invalidate()
+            game.player.effect_rng.setstate(rng_state)
+            game.draw_game()
+            game.present()
+            if game.screen.get_view('2').raw != drawn.get_view('2').raw:
+                return f"frame {frame}: dirty-rect frame differs from a full redraw"
+    finally:
+        game.settings.dirty_rect_rendering = False
+        game.level_window_size = None
+        game.start_game()
+
+    partial = presenter.partial_updates - partial
+    if partial < frames * 0.9:
+        return f"only {partial} of {frames} scrolling frames were partial updates"
+    return None
+
+@check
+def full_spell_pool(game):
+    """Casting with every spell slot taken is a no-op rather than a cast without a spell"""
+    from player import Player
+
+    player = Player(game)
+    particles = game.assets.particles
+    while len(player.spells) < player.spells.capacity:
+        player.spell_cooldown = 0
+        player.cast_spell()
+
+    player.spell_cooldown = 0
+    before = len(particles)
+    player.cast_spell()
+    if player.spell_cooldown != 0:
+        return "cooldown started without a spell"
+    if len(particles) != before:
+        return "cast particles emitted without a spell"
+    particles.clear()
+    return None
+
+def reference_hit_spells(enemies, player):
+    """EnemySystem.hit_spells as it was before the NumPy prefilter: a grid walk per spell"""
+    from enemies import SPELL_HIT_SIZE
+
+    spells = player.spells
+    half = SPELL_HIT_SIZE // 2
+    i = 0
+    while i < spells.count:
+        spell = spells.slots[i]
+        left, right = sorted((int(spell.prev_x), int(spell.x)))
+        top = int(spell.y) - half
+        target = enemies.grid.first_overlap(left - half, top, right + half, top + SPELL_HIT_SIZE)
+        if target is None:
+            i += 1
+            continue
+        enemies.hits += 1
+        target.health -= spell.power
+        target.hit_flash = 6
+        spells.release(i)
+        if target.health <= 0:
+            enemies.kill(target)
+
+@check
+def enemy_spell_hits(game, steps=400):
+    """Spells hit the same enemies with and without the NumPy prefilter"""
+    from types import SimpleNamespace
+    from enemies import EnemySystem
+    from spell_pool import SpellPool
+
+    def state(enemies, player):
+        return ([(enemy.x, enemy.y, enemy.health) for enemy in enemies],
+                [(spell.x, spell.y) for spell in player.spells], enemies.hits, enemies.kills)
+
+    for seed in range(4):
+        systems = []
+        for _ in range(2):
+            rng = random.Random(seed)
+            enemies = EnemySystem(game.assets, cell_size=rng.choice([32, 64, 128]))
+            for _ in range(rng.choice([10, 100, 500])):
+                x, y = rng.randint(-100, 1500), rng.randint(-100, 1100)
+                enemies.spawn(x, y, x - rng.randint(0, 300), x + rng.randint(0, 300),
+                              speed=rng.uniform(0.5, 4), health=rng.randint(1, 6))
+            player = SimpleNamespace(spells=SpellPool(), rect=pygame.Rect(-9999, -9999, 1, 1))
+            systems.append((enemies, player, rng))
+        reference = systems[1][0]
+        reference.hit_spells = lambda player: reference_hit_spells(reference, player)
+
+        for step in range(steps):
+            for enemies, player, rng in systems:
+                for spell in player.spells:
+                    spell.prev_x = spell.x
+                    spell.x += spell.speed * spell.direction
+                for _ in range(rng.randint(0, 8)):
+                    player.spells.spawn(rng.uniform(-100, 1500), rng.uniform(-100, 1100), rng.choice([2, 10, 45]),
+                                        rng.choice([1, -1]), 70, (100, 150, 250), rng.choice([0.5, 1, 3]), False)
+                enemies.update(player)
+            if state(*systems[0][:2]) != state(*systems[1][:2]):
+                return f"seed {seed}: hits diverged at step {step}"
+    game.assets.particles.clear()
+    return None
+
+@check
+def aura_quality_tiers(game):
+    """Each quality tier draws as many aura rings as its aura_layers says"""
+    from quality import QUALITY_TIERS
+
+    glows = game.assets.glows
+    for radius in (45, 50.5, 55):
+        # Full quality must keep the original one ring per pixel
+        whole = int(radius)
+        original = tuple((r, int(150 * (r - (whole - 15)) / 15)) for r in range(whole, whole - 15, -1))
+        if glows.gradient_rings(radius, 15, 150) != original:
+            return f"radius {radius}: full gradient changed"
+
+        for tier in QUALITY_TIERS:
+            rings = glows.gradient_rings(radius, 15, 150, tier['aura_layers'])
+            if len(set(rings)) != tier['aura_layers']:
+                return f"{tier['name']} tier at radius {radius}: {len(set(rings))} rings, expected {tier['aura_layers']}"
+    return None
+
+@check
+def settings_write_behind(game, saves=200):
+    """Bursts of settings changes are coalesced into a single atomic write"""
+    import json
+    import os
+    import tempfile
+    from settings_saver import SettingsSaver
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'settings.json')
+        saver = SettingsSaver(path, delay=0.2)
+        for volume in range(saves):
+            saver.save({'music_volume': volume})
+        saver.flush()
+
+        if saver.writes != 1:
+            return f"{saves} saves took {saver.writes} writes"
+        with open(path) as f:
+            if json.load(f) != {'music_volume': saves - 1}:
+                return "latest snapshot was not the one written"
+        if os.listdir(directory) != ['settings.json']:
+            return f"left behind {os.listdir(directory)}"
+
+        # With nothing pending, the writer thread picks the next change up on its own
+        saver.save({'music_volume': -1})
+        for _ in range(100):
+            if saver.writes == 2:
+                break
+            pygame.time.wait(10)
+        else:
+            return "background write never happened"
+    return None
+
+@check
+def input_replay(game, steps=3000):
+    """Recorded sessions replay to the same player state, through a file round trip
+
+    Sessions recorded to one path are all kept, numbered. The last two
+    seeds draw every frame, with dirty rects on and a frame budget no
+    machine meets, so the quality governor changes tier between steps
+    while recording.
+    """
+    import os
+    import tempfile
+    from replay import InputRecorder, InputRecording, replay
+
+    quality = game.assets.quality
+    budget_ms = quality.budget_ms
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'session.wqir')
+        for seed in range(4):
+            render = seed >= 2
+            script = InputScript(seed, game.settings.spell_hotkey)
+            held = set()
+            recorder = InputRecorder(path, seed)
+            recorder.read_keys = lambda: ScriptedKeys(held)
+
+            game.input_recorder = recorder
+            game.settings.dirty_rect_rendering = render
+            game.start_game()
+            quality.reset()
+            quality.enabled = render
+            quality.budget_ms = 0.001
+            for step in range(steps):
+                held, pressed = script.frame_input(step)
+                for key in pressed:
+                    recorder.press(key)
+                game._run_game(render, game.timestep.step_time)
+            recording = recorder.stop()
+            game.input_recorder = None
+            dropped = quality.tier_index > 0
+            quality.budget_ms = budget_ms
+            quality.reset()
+            if render and not dropped:
+                return f"seed {seed}: quality never dropped while recording"
+
+            saved = path if seed == 0 else os.path.join(directory, f'session-{seed + 1}.wqir')
+            loaded = InputRecording.load(saved)
+            if list(loaded.masks()) != list(recording.masks()):
+                return f"seed {seed}: masks changed in the file round trip"
+            rate, matched = replay(game, loaded, render)
+            game.settings.dirty_rect_rendering = False
+            if not matched:
+                kind = 'rendered replay' if render else 'replay'
+                return f"seed {seed}: {kind} did not reproduce the recorded player state"
+    return None
+
+def main():
+    headless.use_dummy_drivers()
+    random.seed(0)
+    from main import Game
+    game = Game()
+    game.start_game()
+
+    failures = 0
+    for function in CHECKS:
+        error = function(game)
+        status = 'ok' if error is None else f"FAILED ({error})"
+        print(f"{function.__name__:<40} {status}")
+        failures += error is not None
+    pygame.quit()
+    return failures
+
+if __name__ == '__main__':
+    sys.exit(1 if main() else 0)
@@ -0,0 +1,412 @@
+import random
+import pygame
+
+from headless import InputScript, ScriptedKeys
+from spatial_hash import SpatialHash
+from level import Level, generate_level, load_level
+from benchmarks.harness import scenario
+
+def random_platforms(game, count, rng, spread=1):
+    """Wooden platforms scattered over the window, or an area spread times as wide and tall"""
+    width = game.settings.window_width * spread
+    height = game.settings.window_height * spread
+    return [{
+        'rect': pygame.Rect(rng.randint(0, width - 60), rng.randint(0, height - 20), rng.randint(40, 200), 20),
+        'color': game.assets.get_color('wood_dark'),
+        'texture': 'wood'
+    } for _ in range(count)]
+
+def fill_particles(assets, count, surface):
+    """Fill the particle store with long-lived particles spread over the surface"""
+    store = assets.particles
+    width, height = surface.get_size()
+    colors = [assets.get_color('magic_blue'), assets.get_color('magic_gold'),
+              assets.get_color('wood_light'), (220, 100, 100)]
+
+    for i in range(count // 100):
+        assets.create_particles(random.randint(0, width), random.randint(0, height),
+                                colors[i % len(colors)], count=100, speed=0.6,
+                                lifetime=1000000)
+    return store
+
+@scenario('player.update')
+def player_update(context, param):
+    game = context.game
+    player = game.player
+    script = InputScript(context.seed, game.settings.spell_hotkey)
+    frame = [0]
+
+    def step():
+        held, pressed = script.frame_input(frame[0])
+        frame[0] += 1
+        player.update(game.platforms, ScriptedKeys(held), game.get_platform_index())
+    return step
+
+def player_update_with_platforms(context, count, indexed):
+    game = context.game
+    player = game.player
+
+    # Same platform density at every count, as in a level that keeps growing
+    platforms = random_platforms(game, count, random.Random(count), spread=max(1, int((count / 100) ** 0.5)))
+    index = SpatialHash.from_platforms(platforms) if indexed else None
+    script = InputScript(context.seed, game.settings.spell_hotkey)
+    frame = [0]
+
+    def step():
+        held, pressed = script.frame_input(frame[0])
+        frame[0] += 1
+        player.update(platforms, ScriptedKeys(held), index)
+    return step
+
+@scenario('player.update.platforms', params=(10, 100, 1000, 10000))
+def player_update_platforms(context, count):
+    return player_update_with_platforms(context, count, indexed=True)
+
+@scenario('player.update.platforms.linear', params=(10, 100, 1000, 10000))
+def player_update_platforms_linear(context, count):
+    return player_update_with_platforms(context, count, indexed=False)
+
+def batch_physics_with_platforms(context, count, platform_count, spread):
+    import numpy as np
+    from batch_physics import BatchPhysics
+
+    game = context.game
+    rng = np.random.default_rng(context.seed)
+    platforms = random_platforms(game, platform_count, random.Random(count), spread=spread)
+    width, height = game.settings.window_width * spread, game.settings.window_height * spread
+    batch = BatchPhysics(count, platforms, (width, height))
+    batch.place(rng.uniform(0, width, count), rng.uniform(0, height, count))
+
+    def step():
+        # Each agent holds a random direction and jumps now and then
+        direction = rng.integers(0, 3, count)
+        batch.step(direction == 1, direction == 2, rng.random(count) < 0.05)
+    return step
+
+@scenario('batch_physics.step', params=(1, 100, 1000, 10000))
+def batch_physics_step(context, count):
+    return batch_physics_with_platforms(context, count, 100, spread=3)
+
+@scenario('batch_physics.step.platforms', params=(100, 1000, 10000))
+def batch_physics_step_platforms(context, platform_count):
+    """10000 agents in a level that grows with its platform count, at the same density"""
+    spread = max(1, int((platform_count / 100) ** 0.5))
+    return batch_physics_with_platforms(context, 10000, platform_count, spread)
+
+def spawn_enemies(enemies, count, rng, width, height):
+    enemies.clear()
+    for _ in range(count):
+        x, y = rng.randint(0, width - 32), rng.randint(0, height - 28)
+        enemies.spawn(x, y, max(0, x - 100), min(width - 32, x + 100), health=10 ** 9)
+
+@scenario('enemies.update', params=(100, 250, 500))
+def enemies_update(context, count):
+    """count enemies and count live spells, spells refilled as they hit
+
+    Includes the refill and the particle burst of every hit; see
+    enemies.hit_spells for the spell test on its own.
+    """
+    game = context.game
+    player = game.player
+    enemies = game.enemies
+    rng = random.Random(context.seed)
+    width, height = game.level.width, game.level.height
+    spawn_enemies(enemies, count, rng, width, height)
+
+    def step():
+        while len(player.spells) < count:
+            player.spells.spawn(rng.randint(0, width), rng.randint(0, height), speed=10,
+                                direction=rng.choice((1, -1)), lifetime=70,
+                                color=(100, 150, 250), power=1.0, has_image=False)
+        enemies.update(player)
+    return step
+
+@scenario('enemies.hit_spells', params=(100, 250, 500))
+def enemies_hit_spells(context, count):
+    """Steady-state spell test: count enemies and count flying spells, none of them hitting"""
+    from enemies import SPELL_HIT_SIZE
+
+    game = context.game
+    player = game.player
+    enemies = game.enemies
+    rng = random.Random(context.seed)
+    width, height = game.level.width * 3, game.level.height * 3
+    spawn_enemies(enemies, count, rng, width, height)
+
+    # Spells flying through the gaps between enemies, so every call tests them all
+    speed, half = 10, SPELL_HIT_SIZE // 2
+    while len(player.spells) < count:
+        x, y = rng.randint(speed, width), rng.randint(0, height)
+        if enemies.grid.first_overlap(x - speed - half - 1, y - half - 1, x + half + 1, y + half + 1):
+            continue
+        spell = player.spells.spawn(x, y, speed=speed, direction=1, lifetime=70,
+                                    color=(100, 150, 250), power=1.0, has_image=False)
+        spell.prev_x = x - speed
+
+    def step():
+        enemies.hit_spells(player)
+    return step
+
+@scenario('player.draw', params=(0, 10, 100))
+def player_draw(context, spell_count):
+    game = context.game
+    player = game.player
+    width = context.surface.get_width()
+
+    for i in range(spell_count):
+        player.spell_cooldown = 0
+        player.facing_right = i % 2 == 0
+        player.cast_spell()
+        player.spells[i].x = (i * 37) % width
+    game.assets.particles.clear()
+
+    def draw():
+        player.draw(context.surface)
+    return draw
+
+@scenario('player.draw.state', params=('flash', 'invulnerable'))
+def player_draw_state(context, state):
+    player = context.game.player
+    player.invulnerable = True
+    player.invulnerable_timer = 1
+    player.damage_flash = 1 if state == 'flash' else 0
+
+    def draw():
+        player.draw(context.surface)
+    return draw
+
+@scenario('game.start_game')
+def game_start(context, param):
+    return context.game.start_game
+
+def cast_spell_dict(player, spells):
+    """Cast the way Player did before the spell pool: one dict per spell"""
+    magic_color = player.customization['magic_color'][:3]
+    magic_power = player.customization.get('magic_power', 1.0)
+    hand_x = player.x + (player.width if player.facing_right else 0)
+    hand_y = player.y + 20
+    player.assets.create_particles(hand_x, hand_y, magic_color, count=int(20 * magic_power),
+                                   speed=4 * magic_power, size=3 * magic_power, lifetime=20)
+    spells.append({
+        'x': hand_x,
+        'prev_x': hand_x,
+        'y': hand_y,
+        'speed': 10 * magic_power,
+        'direction': 'left' if not player.facing_right else 'right',
+        'angle': 0,
+        'lifetime': 70,
+        'image': player.assets.get_image('magic_effect'),
+        'color': magic_color,
+        'power': magic_power
+    })
+
+def update_spell_dicts(player, spells):
+    """The pre-pool spell update loop: iterate a copy and list.remove() expired spells"""
+    for spell in spells[:]:
+        spell['prev_x'] = spell['x']
+        if spell['direction'] == 'right':
+            spell['x'] += spell['speed']
+        else:
+            spell['x'] -= spell['speed']
+        spell['lifetime'] -= 1
+        if spell['x'] < -40 or spell['x'] > player.world_width + 40 or spell['lifetime'] <= 0:
+            spells.remove(spell)
+            player.assets.create_particles(spell['x'], spell['y'], spell['color'][:3],
+                                           count=20, speed=3, lifetime=20)
+
+@scenario('player.spells.rapid_fire', params=('pool', 'dicts'))
+def spells_rapid_fire(context, storage):
+    """Six casts per step in a wide level: about 420 live spells at steady state"""
+    player = context.game.player
+    player.world_width = 1000000
+    dict_spells = []
+    frame = [0]
+
+    def step():
+        frame[0] += 1
+        for i in range(6):
+            player.facing_right = (frame[0] + i) % 2 == 0
+            if storage == 'pool':
+                player.spell_cooldown = 0
+                player.cast_spell()
+            else:
+                cast_spell_dict(player, dict_spells)
+        if storage == 'pool':
+            player.update_spells()
+        else:
+            update_spell_dicts(player, dict_spells)
+        context.game.assets.particles.clear()
+    return step
+
+@scenario('assets.update_particles', params=(1000, 10000, 50000))
+def particles_update(context, count):
+    assets = context.game.assets
+    fill_particles(assets, count, context.surface)
+    return assets.update_particles
+
+@scenario('assets.draw_particles', params=(1000, 10000, 50000))
+def particles_draw(context, count):
+    assets = context.game.assets
+    store = fill_particles(assets, count, context.surface)
+
+    # Spread ages over a normal 30-frame lifespan, like a steady stream of bursts
+    store.lifetime[:store.count] = store.rng.integers(1, 31, store.count)
+    store.max_lifetime[:store.count] = 30
+
+    def draw():
+        assets.draw_particles(context.surface)
+    return draw
+
+@scenario('wizard_renderer.draw_full_wizard')
+@scenario('wizard_renderer.draw_full_wizard.quality', params=(0, 1, 2))
+def wizard_draw(context, tier_index):
+    if tier_index is not None:
+        context.game.assets.quality.tier_index = tier_index
+    renderer = context.game.customization.wizard_renderer
+    x = context.surface.get_width() // 2
+    y = context.surface.get_height() - 250
+    color_index = [0]
+
+    def draw():
+        renderer.update_animation()
+        renderer.draw_full_wizard(context.surface, x, y, color_index[0])
+        color_index[0] = (color_index[0] + 1) % len(renderer.robe_colors)
+    return draw
+
+@scenario('particle_system.update', params=(500,))
+def particle_system_update(context, count):
+    particles = context.game.customization.particles
+    particles.particles.clear()
+    particles.create_magic_particles(400, 300, (180, 100, 240), count=count)
+    for particle in particles.particles:
+        particle['life'] = particle['max_life'] = 1000000
+    return particles.update
+
+@scenario('particle_system.draw', params=(500,))
+def particle_system_draw(context, count):
+    particles = context.game.customization.particles
+    particles.particles.clear()
+    width, height = context.surface.get_size()
+    for _ in range(count):
+        particles.create_magic_particles(random.randint(0, width), random.randint(0, height),
+                                         (180, 100, 240))
+
+    def draw():
+        particles.draw(context.surface)
+    return draw
+
+@scenario('menu.draw_main_menu')
+def menu_draw(context, param):
+    menu = context.game.menu
+    menu.screen = context.surface
+
+    def draw():
+        menu.frame += 1
+        menu.update_animations()
+        menu.draw_background()
+        menu.draw_main_menu()
+    return draw
+
+@scenario('customization.draw')
+def customization_draw(context, param):
+    customization = context.game.customization
+    customization.screen = customization.ui.screen = context.surface
+
+    def draw():
+        customization.wizard_renderer.update_animation()
+        customization.ui.update_animation()
+        customization.particles.update()
+        customization.draw()
+    return draw
+
+@scenario('game.draw_game')
+def game_draw(context, param):
+    game = context.game
+    game.assets.create_particles(400, 300, (100, 149, 237), count=200, lifetime=1000000)
+    return game.draw_game
+
+@scenario('game.present', params=('flip', 'dirty_rects'))
+def game_present(context, mode):
+    game = context.game
+    game.settings.dirty_rect_rendering = mode == 'dirty_rects'
+    game.assets.create_particles(400, 300, (100, 149, 237), count=200, lifetime=1000000)
+
+    def frame():
+        game.draw_game()
+        game.present()
+    return frame
+
+@scenario('game.draw_game.platforms', params=(10, 100, 1000))
+def game_draw_platforms(context, count):
+    game = context.game
+    game.platforms = random_platforms(game, count, random.Random(count))
+    game.platforms_version += 1
+    return game.draw_game
+
+@scenario('game.draw_game.world', params=(800, 8000, 80000))
+def game_draw_world(context, width):
+    """Draw a frame in a generated level: cost should follow what is on screen, not level size"""
+    game = context.game
+    path = context.temp_path(f"world_{width}.jsonl")
+    generate_level(path, width, 3000, seed=context.seed)
+    game.level = load_level(path, context.surface.get_size(), game.assets.get_color)
+    game.level.load_all()
+    game.platforms = game.level.platforms
+    game.platforms_version += 1
+    game.start_game()
+
+    # Spells and particles spread across the whole level
+    rng = random.Random(width)
+    for i in range(200):
+        game.player.spell_cooldown = 0
+        game.player.cast_spell()
+        game.player.spells[i].x = rng.randint(0, width)
+        game.player.spells[i].lifetime = 1000000
+    for _ in range(50):
+        game.assets.create_particles(rng.randint(0, width), rng.randint(0, 3000), (100, 149, 237),
+                                     count=100, lifetime=1000000)
+
+    # Alternate between two camera positions so the scene scrolls each call
+    frame = [0]
+
+    def draw():
+        frame[0] += 1
+        game.player.place(width // 2 + frame[0] % 2 * 10, 1500)
+        game.draw_game()
+    return draw
+
+@scenario('game.present.scroll', params=('flip', 'dirty_rects'))
+def game_present_scroll(context, mode):
+    """Walk steadily across a generated level, presenting each frame"""
+    game = context.game
+    width = 8000
+    path = context.temp_path(f"scroll_{width}.jsonl")
+    generate_level(path, width, 1200, seed=context.seed)
+    game.level = load_level(path, context.surface.get_size(), game.assets.get_color)
+    game.level.load_all()
+    game.platforms = game.level.platforms
+    game.platforms_version += 1
+    game.settings.dirty_rect_rendering = mode == 'dirty_rects'
+    game.start_game()
+    frame = [0]
+
+    def draw():
+        frame[0] += 1
+        game.player.place(frame[0] * 4 % width, 700)
+        game.draw_game()
+        game.present()
+    return draw
+
+@scenario('level.stream', params=(40000,))
+def level_stream(context, width):
+    """Walk across a large generated level, streaming chunks in and out"""
+    path = context.temp_path(f"stream_{width}.jsonl")
+    generate_level(path, width, 4000, seed=context.seed)
+    level = Level(path, context.game.assets.get_color)
+    view_size = context.surface.get_size()
+    position = [0]
+
+    def step():
+        position[0] = (position[0] + 50) % width
+        level.stream(level.area_around(position[0], 2000, view_size))
+    return step
@@ -0,0 +1,39 @@
+import pygame
+
+class Camera:
+    """Viewport onto the level that follows a target and culls what it cannot see
+
+    The camera position is the world coordinate of the top-left screen
+    pixel, kept whole so cached layers line up with sprites.
+    """
+
+    def __init__(self, view_width, view_height, world_width, world_height):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.world_width = world_width
+        self.world_height = world_height
+        self.x = 0
+        self.y = 0
+
+    @property
+    def offset(self):
+        return (self.x, self.y)
+
+    @property
+    def view_rect(self):
+        return pygame.Rect(self.x, self.y, self.view_width, self.view_height)
+
+    def resize(self, view_width, view_height):
+        self.view_width = view_width
+        self.view_height = view_height
+
+    def set_world(self, world_width, world_height):
+        self.world_width = world_width
+        self.world_height = world_height
+
+    def follow(self, x, y):
+        """Center the view on a world point, without showing anything past the level edges"""
+        max_x = max(0, self.world_width - self.view_width)
+        max_y = max(0, self.world_height - self.view_height)
+        self.x = min(max(int(x) - self.view_width // 2, 0), max_x)
+        self.y = min(max(int(y) - self.view_height // 2, 0), max_y)
@@ -6,11 +6,13 @@ import math
 from .wizard_renderer import WizardRenderer
 from .particles import ParticleSystem
 from .ui import CustomizationUI
+from frame_timing import FrameTimer
 
 class CustomizationScreen:
-    def __init__(self, settings, assets):
+    def __init__(self, settings, assets, frame_timer=None):
         self.settings = settings
         self.assets = assets
+        self.frame_timer = frame_timer if frame_timer is not None else FrameTimer()
         self.screen = pygame.display.get_surface()
         self.running = True
         self.next_screen = None
@@ -42,20 +44,34 @@ class CustomizationScreen:
         self.running = True
         clock = pygame.time.Clock()
         
+        timer = self.frame_timer
+        
         while self.running:
+            timer.begin_frame('customization')
+            self.assets.quality.begin_frame()
+            self.assets.poll_loading()
+            
             # Handle events
             self.check_events()
+            timer.mark('events')
             
             # Update animations
             self.wizard_renderer.update_animation()
             self.ui.update_animation()
             self.particles.update()
+            timer.mark('update')
             
             # Draw everything
             self.draw()
+            timer.set_counter('particles', len(self.particles.particles))
+            timer.draw_overlay(self.screen)
+            timer.mark('draw')
             
             # Update display
             pygame.display.flip()
+            timer.mark('flip')
+            self.assets.quality.end_frame()
+            timer.end_frame()
             
             # Cap framerate
             clock.tick(60)
@@ -67,8 +83,11 @@ class CustomizationScreen:
         """Handle user input events"""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                self.settings.flush()
                 pygame.quit()
                 sys.exit()
+            elif self.frame_timer.handle_event(event):
+                pass
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 self.handle_click(event.pos)
     
@@ -154,7 +173,8 @@ class CustomizationScreen:
     
     def draw_stars(self):
         """Draw animated background stars"""
-        for star in self.stars:
+        shown = int(len(self.stars) * self.assets.quality.tier['star_fraction'])
+        for star in self.stars[:shown]:
             # Animate star size with pulsing effect
             size = star['size'] * (0.7 + 0.3 * math.sin(star['pulse']))
             star['pulse'] += 0.01
@@ -85,6 +85,7 @@ class ParticleSystem:
     
     def draw(self, screen):
         """Draw all particles with proper blending"""
+        glow = self.assets.quality.tier['glow']
         for particle in self.particles:
             # Calculate opacity based on remaining life
             life_ratio = particle['life'] / particle['max_life']
@@ -111,7 +112,7 @@ class ParticleSystem:
                 pygame.draw.circle(screen, draw_color, (int(particle['x']), int(particle['y'])), radius)
                 
                 # Add a glow for magical effect
-                if life_ratio > 0.3:
+                if glow and life_ratio > 0.3:
                     glow_radius = radius * 1.5
                     pygame.draw.circle(screen, draw_color, (int(particle['x']), int(particle['y'])), glow_radius, 1)
     
@@ -8,6 +8,10 @@ class CustomizationUI:
         self.screen = pygame.display.get_surface()
         self.frame = 0
         
+        # Images scaled to a size and hover shine overlays, built on first use
+        self.scaled_images = {}
+        self.shine_surfaces = {}
+        
         # Create UI elements
         self.create_layout()
     
@@ -93,25 +97,23 @@ class CustomizationUI:
         
         # Draw glow effect
         for offset in range(3, 0, -1):
-            title_shadow = self.assets.get_font('title').render(title_text, True, self.assets.get_color('magic_purple'))
-            shadow_rect = title_shadow.get_rect(center=(self.settings.window_width//2 + offset, title_y + offset + title_offset))
             alpha = 80 - offset * 20
-            title_shadow.set_alpha(alpha)
+            title_shadow = self.assets.render_text('title', title_text, self.assets.get_color('magic_purple'), alpha=alpha)
+            shadow_rect = title_shadow.get_rect(center=(self.settings.window_width//2 + offset, title_y + offset + title_offset))
             self.screen.blit(title_shadow, shadow_rect)
         
         # Main title
-        title = self.assets.get_font('title').render(title_text, True, self.assets.get_color('magic_gold'))
+        title = self.assets.render_text('title', title_text, self.assets.get_color('magic_gold'))
         title_rect = title.get_rect(center=(self.settings.window_width//2, title_y + title_offset))
         self.screen.blit(title, title_rect)
     
     def draw_panel(self):
         """Draw the main panel for customization"""
         # Draw wooden panel background
-        panel_image = self.assets.get_image('panel_wood')
+        panel_image = self.get_scaled_image('panel_wood', self.panel_rect.size)
         if panel_image:
-            # Scale panel image to fit customization area
-            scaled_panel = pygame.transform.scale(panel_image, (self.panel_rect.width, self.panel_rect.height))
-            self.screen.blit(scaled_panel, self.panel_rect)
+            # Panel image scaled to fit customization area
+            self.screen.blit(panel_image, self.panel_rect)
         else:
             # Fallback to simple rect
             pygame.draw.rect(self.screen, self.assets.get_color('wood_dark'), self.panel_rect)
@@ -122,12 +124,12 @@ class CustomizationUI:
         header_y = self.panel_rect.top + 30
         
         # Draw header shadow
-        header_shadow = self.assets.get_font('button').render(header_text, True, (50, 30, 10))
+        header_shadow = self.assets.render_text('button', header_text, (50, 30, 10))
         shadow_rect = header_shadow.get_rect(center=(self.settings.window_width//2 + 2, header_y + 2))
         self.screen.blit(header_shadow, shadow_rect)
         
         # Draw header text
-        header_text = self.assets.get_font('button').render(header_text, True, self.assets.get_color('text_light'))
+        header_text = self.assets.render_text('button', header_text, self.assets.get_color('text_light'))
         header_rect = header_text.get_rect(center=(self.settings.window_width//2, header_y))
         self.screen.blit(header_text, header_rect)
     
@@ -153,18 +155,47 @@ class CustomizationUI:
         # Draw color index indicator
         index_text = f"{selected_color_index + 1}/{total_colors}"
         index_font = self.assets.get_font('text')
-        index_label = index_font.render(index_text, True, text_color)
+        index_label = self.assets.render_text(index_font, index_text, text_color)
         index_rect = index_label.get_rect(center=(self.settings.window_width//2, self.color_left.centery))
         self.screen.blit(index_label, index_rect)
     
+    def get_scaled_image(self, name, size):
+        """Return an image scaled to size, cached by (name, size)"""
+        key = (name, tuple(size))
+        image = self.scaled_images.get(key)
+        if image is None:
+            original = self.assets.get_image(name)
+            if original is None:
+                return None
+            image = self.scaled_images[key] = pygame.transform.scale(original, key[1])
+        return image
+    
+    def get_shine_surface(self, size):
+        """Return the hover shine overlay for a button of the given size"""
+        shine_surface = self.shine_surfaces.get(size)
+        if shine_surface is None:
+            width, height = size
+            shine_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            for i in range(5):
+                alpha = 50 - i * 10
+                y_pos = i * 2
+                pygame.draw.line(
+                    shine_surface, 
+                    (255, 255, 255, alpha), 
+                    (0, y_pos), 
+                    (width, y_pos), 
+                    2
+                )
+            self.shine_surfaces[size] = shine_surface
+        return shine_surface
+    
     def _draw_navigation_button(self, rect, text, mouse_pos, button_color, hover_color, text_color, border_color):
         """Draw a navigation button with hover effects"""
         # Draw button with wooden texture
-        button_image = self.assets.get_image('button_wood')
+        button_image = self.get_scaled_image('button_wood', rect.size)
         if button_image and not rect.collidepoint(mouse_pos):
-            # Scale image to button size
-            scaled_button = pygame.transform.scale(button_image, (rect.width, rect.height))
-            self.screen.blit(scaled_button, rect)
+            # Image scaled to button size
+            self.screen.blit(button_image, rect)
         else:
             # Draw custom background for hover or fallback
             if rect.collidepoint(mouse_pos):
@@ -177,28 +208,17 @@ class CustomizationUI:
         
         # Add shine effect on hover
         if rect.collidepoint(mouse_pos):
-            shine_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-            for i in range(5):
-                alpha = 50 - i * 10
-                y_pos = i * 2
-                pygame.draw.line(
-                    shine_surface, 
-                    (255, 255, 255, alpha), 
-                    (0, y_pos), 
-                    (rect.width, y_pos), 
-                    2
-                )
-            self.screen.blit(shine_surface, rect)
+            self.screen.blit(self.get_shine_surface(rect.size), rect)
         
         # Draw button text with shadow
         font = self.assets.get_font('button')
         # Text shadow
-        shadow_text = font.render(text, True, (40, 20, 0))
+        shadow_text = self.assets.render_text(font, text, (40, 20, 0))
         shadow_rect = shadow_text.get_rect(center=(rect.center[0] + 2, rect.center[1] + 2))
         self.screen.blit(shadow_text, shadow_rect)
         
         # Main text
-        button_text = font.render(text, True, text_color)
+        button_text = self.assets.render_text(font, text, text_color)
         text_rect = button_text.get_rect(center=rect.center)
         self.screen.blit(button_text, text_rect)
     
@@ -1,8 +1,14 @@
 import pygame
 import math
 import random
+from collections import OrderedDict
 
 class WizardRenderer:
+    # Layers are baked around this point on a surface of BAKE_SIZE, large
+    # enough for everything from the hat tip to the staff foot, then cropped
+    BAKE_ORIGIN = (60, 130)
+    BAKE_SIZE = (130, 290)
+    
     def __init__(self, settings, assets):
         self.settings = settings
         self.assets = assets
@@ -40,6 +46,16 @@ class WizardRenderer:
             (200, 180, 240),  # Lavender magic
             (240, 160, 160)   # Rose magic
         ]
+        
+        # Pre-baked wizard layers: robes in an LRU cache keyed by
+        # (color index, scaled width, scaled height), plus the shared
+        # face/hat/staff layer and a staff crystal per color
+        self.robe_bakes = OrderedDict()
+        self.bake_cache_size = 128
+        self.bake_hits = 0
+        self.bake_misses = 0
+        self.front_bake = None
+        self.crystals = {}
     
     def update_animation(self):
         """Update animation values for rendering"""
@@ -118,59 +134,99 @@ class WizardRenderer:
         pygame.draw.circle(screen, self.magic_colors[color_index], (x, emblem_y), glow_size, 1)
         
         # Draw color name label
-        color_label = self.assets.get_font('text').render(
+        color_label = self.assets.render_text(
+            'text',
             self.color_names[color_index], 
-            True, 
             self.assets.get_color('text_light')
         )
         screen.blit(color_label, (x - color_label.get_width() // 2, y + color_sample_height//2 + 15))
     
     def draw_full_wizard(self, screen, x, y, color_index):
-        """Draw the full wizard with the selected color"""
-        # Apply animation
-        y_offset = self.preview_bob * 1.5
+        """Draw the full wizard with the selected color
+        
+        The robe, face, hat and staff are blitted from pre-baked layers;
+        only the animated parts are drawn here.
+        """
+        # Apply animation, in whole pixels so animated parts line up with the baked layers
+        y_offset = round(self.preview_bob * 1.5)
         
         # Draw magical aura under the wizard
         self._draw_magical_aura(screen, x, y + 75, color_index)
         
-        # Draw full wizard
-        wizard_width = 60
-        wizard_height = 120
-        
         # Apply scale effect
-        wizard_width = int(wizard_width * self.preview_scale)
-        wizard_height = int(wizard_height * self.preview_scale)
-        
-        # Robe is tapered at the bottom for a more realistic look
-        robe_top_width = wizard_width
-        robe_bottom_width = wizard_width * 1.3  # Wider at bottom
-        
-        # Main robe shape
-        robe_points = [
-            (x - robe_top_width//2, y - wizard_height//2 + y_offset),                    # top left
-            (x + robe_top_width//2, y - wizard_height//2 + y_offset),                    # top right
-            (x + robe_bottom_width//2, y + wizard_height//2 + y_offset),                 # bottom right
-            (x - robe_bottom_width//2, y + wizard_height//2 + y_offset)                  # bottom left
-        ]
+        scaled_width = int(wizard_width * self.preview_scale)
+        scaled_height = int(wizard_height * self.preview_scale)
         
-        # Draw robe
-        pygame.draw.polygon(screen, self.robe_colors[color_index], robe_points)
-        pygame.draw.polygon(screen, (40, 40, 40), robe_points, 2)
+        # Robe and arms, then the rotating robe symbols over them
+        robe, robe_offset = self._get_robe_bake(color_index, scaled_width, scaled_height)
+        screen.blit(robe, (x + robe_offset[0], y + y_offset + robe_offset[1]))
+        self._draw_robe_symbols(screen, x, y, y_offset, color_index)
         
-        # Draw arms with sleeve details
-        self._draw_wizard_arms(screen, x, y, y_offset, color_index)
+        # Face, hat and staff body, then the hat emblem and sparkles
+        front, front_offset = self._get_front_bake()
+        screen.blit(front, (x + front_offset[0], y + y_offset + front_offset[1]))
+        self._draw_hat_sparkles(screen, x, y + y_offset, color_index)
         
-        # Add decorative elements to robe
-        self._draw_robe_details(screen, x, y, y_offset, robe_points, color_index)
-        
-        # Draw wizard's face with more detail
-        self._draw_wizard_face(screen, x, y + y_offset)
-        
-        # Draw wizard's hat
-        self._draw_wizard_hat(screen, x, y + y_offset, color_index)
-        
-        # Draw wizard's staff
-        self._draw_wizard_staff(screen, x, y, y_offset, color_index)
+        # Crystal, its glow and particles
+        self._draw_staff_magic(screen, x, y, y_offset, color_index)
+    
+    def _get_robe_bake(self, color_index, scaled_width, scaled_height):
+        """Return the baked robe, arms and robe details as (surface, offset from the wizard center)
+        
+        Bakes depend on the robe color and the scaled robe size, and are kept
+        in an LRU cache keyed by (color index, width, height).
+        """
+        key = (color_index, scaled_width, scaled_height)
+        bake = self.robe_bakes.get(key)
+        if bake is not None:
+            self.robe_bakes.move_to_end(key)
+            self.bake_hits += 1
+            return bake
+        
+        self.bake_misses += 1
+        x, y = self.BAKE_ORIGIN
+        surface = pygame.Surface(self.BAKE_SIZE, pygame.SRCALPHA)
+        robe_points = self._get_robe_points(x, y, 0, scaled_width, scaled_height)
+        pygame.draw.polygon(surface, self.robe_colors[color_index], robe_points)
+        pygame.draw.polygon(surface, (40, 40, 40), robe_points, 2)
+        self._draw_wizard_arms(surface, x, y, 0, color_index)
+        self._draw_robe_details(surface, x, y, 0, robe_points, color_index)
+        
+        bake = self._crop_bake(surface)
+        self.robe_bakes[key] = bake
+        if len(self.robe_bakes) > self.bake_cache_size:
+            self.robe_bakes.popitem(last=False)
+        return bake
+    
+    def _get_front_bake(self):
+        """Return the baked face, hat and staff body, which look the same for every robe color"""
+        if self.front_bake is None:
+            x, y = self.BAKE_ORIGIN
+            surface = pygame.Surface(self.BAKE_SIZE, pygame.SRCALPHA)
+            self._draw_wizard_face(surface, x, y)
+            self._draw_wizard_hat(surface, x, y)
+            self._draw_wizard_staff(surface, x, y, 0)
+            self.front_bake = self._crop_bake(surface)
+        return self.front_bake
+    
+    def _crop_bake(self, surface):
+        """Trim a baked layer to its drawn pixels, returning (surface, offset from BAKE_ORIGIN)"""
+        bounds = surface.get_bounding_rect()
+        cropped = surface.subsurface(bounds).copy()
+        if pygame.display.get_surface() is not None:
+            cropped = cropped.convert_alpha()
+        return cropped, (bounds.x - self.BAKE_ORIGIN[0], bounds.y - self.BAKE_ORIGIN[1])
+    
+    def _get_robe_points(self, x, y, y_offset, scaled_width, scaled_height):
+        """Main robe shape, tapered at the bottom for a more realistic look"""
+        robe_top_width = scaled_width
+        robe_bottom_width = scaled_width * 1.3  # Wider at bottom
+        return [
+            (x - robe_top_width//2, y - scaled_height//2 + y_offset),                    # top left
+            (x + robe_top_width//2, y - scaled_height//2 + y_offset),                    # top right
+            (x + robe_bottom_width//2, y + scaled_height//2 + y_offset),                 # bottom right
+            (x - robe_bottom_width//2, y + scaled_height//2 + y_offset)                  # bottom left
+        ]
     
     def _draw_magical_aura(self, screen, x, y, color_index):
         """Draw magical aura/circle under the wizard"""
@@ -180,13 +236,12 @@ class WizardRenderer:
         # Use the magic color associated with the robe color
         magic_color = self.magic_colors[color_index]
         
-        # Draw multiple circles with fading opacity for a glow effect
-        for r in range(int(radius), int(radius - 15), -1):
-            alpha = int(150 * (r - (radius - 15)) / 15)
-            # Create a surface for the semi-transparent circle
-            circle_surf = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
-            pygame.draw.circle(circle_surf, (*magic_color, alpha), (r, r), r)
-            screen.blit(circle_surf, (x-r, y-r))
+        # Circles with fading opacity for a glow effect, pre-rendered as one
+        # texture, with fewer rings when quality is reduced
+        layers = self.assets.quality.tier['aura_layers']
+        aura = self.assets.glows.ring_gradient(magic_color, radius, 15, 150, layers)
+        r = aura.get_width() // 2
+        screen.blit(aura, (x-r, y-r))
         
         # Add magical symbols within the aura
         self._draw_magical_symbols(screen, x, y, color_index)
@@ -283,23 +338,26 @@ class WizardRenderer:
         pygame.draw.circle(screen, (255, 220, 100), (x, belt_y), buckle_size)
         pygame.draw.circle(screen, (40, 40, 40), (x, belt_y), buckle_size, 1)
         
-        # Magical embroidery/symbols on robe
-        magic_color = self.magic_colors[color_index]
-        symbol_positions = [
+        # Emblem backgrounds for the magical symbols on the robe
+        for pos in self._get_robe_symbol_positions(x, y, y_offset):
+            pygame.draw.circle(screen, (255, 220, 100), pos, 8)
+    
+    def _get_robe_symbol_positions(self, x, y, y_offset):
+        return [
             (x, y - wizard_height//4 + y_offset),                     # chest symbol
             (x - wizard_width//3, y + wizard_height//4 + y_offset),   # left side
             (x + wizard_width//3, y + wizard_height//4 + y_offset)    # right side
         ]
-        
-        for pos in symbol_positions:
-            # Draw emblem background
-            pygame.draw.circle(screen, (255, 220, 100), pos, 8)
-            
+    
+    def _draw_robe_symbols(self, screen, x, y, y_offset, color_index):
+        """Draw the rotating magical embroidery/symbols on the robe emblems"""
+        magic_color = self.magic_colors[color_index]
+        for index, pos in enumerate(self._get_robe_symbol_positions(x, y, y_offset)):
             # Draw magical symbol inside
             self._draw_small_magical_symbol(screen, pos[0], pos[1], magic_color)
             
             # Add glow
-            glow_size = 8 + math.sin(self.frame * 0.1 + symbol_positions.index(pos)) * 2
+            glow_size = 8 + math.sin(self.frame * 0.1 + index) * 2
             pygame.draw.circle(screen, magic_color, pos, glow_size, 1)
     
     def _draw_small_magical_symbol(self, screen, x, y, color):
@@ -389,10 +447,9 @@ class WizardRenderer:
                           (line_x - 2, beard_top + face_height//2 + 5), 
                           1)
     
-    def _draw_wizard_hat(self, screen, x, y, color_index):
+    def _draw_wizard_hat(self, screen, x, y):
         """Draw a more detailed wizard hat"""
         hat_color = (80, 60, 120)  # Deep purple base for the hat
-        magic_color = self.magic_colors[color_index]
         
         # Hat base shape - wider brim
         brim_width = wizard_width * 1.5
@@ -432,6 +489,15 @@ class WizardRenderer:
         emblem_x = x + wizard_width//6
         emblem_y = band_y
         pygame.draw.circle(screen, (255, 220, 100), (emblem_x, emblem_y), 7)
+    
+    def _draw_hat_sparkles(self, screen, x, y, color_index):
+        """Draw the rotating star in the hat emblem and the blinking sparkles on the hat"""
+        magic_color = self.magic_colors[color_index]
+        brim_height = 12
+        brim_y = y - wizard_height//2
+        cone_height = 50
+        emblem_x = x + wizard_width//6
+        emblem_y = brim_y - brim_height + 5
         
         # Star symbol in emblem
         star_size = 4
@@ -455,11 +521,10 @@ class WizardRenderer:
                 pygame.draw.circle(screen, (255, 255, 200), (spark_x, spark_y), size)
                 pygame.draw.circle(screen, magic_color, (spark_x, spark_y), size+1, 1)
     
-    def _draw_wizard_staff(self, screen, x, y, y_offset, color_index):
-        """Draw a detailed wizard staff"""
+    def _draw_wizard_staff(self, screen, x, y, y_offset):
+        """Draw the wooden body of the wizard's staff"""
         staff_width = 8
         staff_height = 140
-        magic_color = self.magic_colors[color_index]
         
         # Staff base position - held by the right hand
         staff_x = x + wizard_width//2 + 15
@@ -487,14 +552,15 @@ class WizardRenderer:
                          (staff_x + curve_offset, line_y), 
                          (staff_x + staff_width + curve_offset, line_y), 
                          1)
-        
-        # Crystal top for the staff
+    
+    def _make_staff_crystal(self, color_index):
+        """Render the translucent crystal for the staff top, centered on its surface"""
+        magic_color = self.magic_colors[color_index]
         crystal_width = 20
         crystal_height = 30
-        crystal_x = staff_x - crystal_width//2 + staff_width//2
-        crystal_y = staff_y - crystal_height
         
         # Crystal shape - more complex with multiple facets
+        crystal_x, crystal_y = crystal_width, crystal_height
         crystal_points = [
             (crystal_x, crystal_y + crystal_height),                    # bottom center
             (crystal_x - crystal_width//2, crystal_y + crystal_height*2//3),  # bottom left
@@ -507,8 +573,7 @@ class WizardRenderer:
         # Crystal base color with transparency
         crystal_surface = pygame.Surface((crystal_width*2, crystal_height*2), pygame.SRCALPHA)
         crystal_color = (*magic_color, 180)  # Add alpha channel
-        pygame.draw.polygon(crystal_surface, crystal_color, 
-                         [(p[0]-crystal_x+crystal_width, p[1]-crystal_y+crystal_height) for p in crystal_points])
+        pygame.draw.polygon(crystal_surface, crystal_color, crystal_points)
         
         # Add highlight to crystal
         highlight_points = [
@@ -516,10 +581,28 @@ class WizardRenderer:
             crystal_points[2],  # middle left
             crystal_points[4]   # middle right
         ]
-        pygame.draw.polygon(crystal_surface, (255, 255, 255, 100), 
-                         [(p[0]-crystal_x+crystal_width, p[1]-crystal_y+crystal_height) for p in highlight_points])
+        pygame.draw.polygon(crystal_surface, (255, 255, 255, 100), highlight_points)
+        if pygame.display.get_surface() is not None:
+            crystal_surface = crystal_surface.convert_alpha()
+        return crystal_surface
+    
+    def _draw_staff_magic(self, screen, x, y, y_offset, color_index):
+        """Draw the crystal on the staff top with its pulsing glow and particles"""
+        staff_width = 8
+        magic_color = self.magic_colors[color_index]
+        staff_x = x + wizard_width//2 + 15
+        staff_y = y + 10 + y_offset
         
-        # Add crystal to the screen
+        crystal_width = 20
+        crystal_height = 30
+        crystal_x = staff_x - crystal_width//2 + staff_width//2
+        crystal_y = staff_y - crystal_height
+        
+        # Add crystal to the screen, kept apart from the baked layers so it
+        # blends with the screen rather than with a transparent bake
+        crystal_surface = self.crystals.get(color_index)
+        if crystal_surface is None:
+            crystal_surface = self.crystals[color_index] = self._make_staff_crystal(color_index)
         screen.blit(crystal_surface, (crystal_x-crystal_width, crystal_y-crystal_height))
         
         # Add magical glow around crystal
@@ -527,13 +610,12 @@ class WizardRenderer:
         glow_x = crystal_x
         glow_y = crystal_y + crystal_height//2
         
-        # Create a surface for the glow with transparency
-        glow_surface = pygame.Surface((glow_size*2, glow_size*2), pygame.SRCALPHA)
-        for i in range(3):
-            alpha = 100 - i*30
-            pygame.draw.circle(glow_surface, (*magic_color, alpha), (glow_size, glow_size), glow_size-i*3)
-        
-        screen.blit(glow_surface, (glow_x-glow_size, glow_y-glow_size))
+        # Three nested translucent circles, pre-rendered per whole-pixel size
+        if self.assets.quality.tier['glow']:
+            glow_size = int(glow_size)
+            glow_surface = self.assets.glows.get(magic_color, [(glow_size-i*3, 100 - i*30) for i in range(3)],
+                                                 stacked=False)
+            screen.blit(glow_surface, (glow_x-glow_size, glow_y-glow_size))
         
         # Add small magical particles around the crystal
         if random.random() < 0.2:  # Occasional particles
@@ -0,0 +1,76 @@
+import pygame
+
+class DirtyRectRenderer:
+    """Presents only the screen areas that changed since the previous frame
+
+    Each frame the areas drawn last frame are restored from a cached
+    background, moving things are drawn and their bounding rects added,
+    then present() pushes the old and new rects to the display. Parts of
+    the background that changed themselves are passed to repaint(). A
+    full flip is used instead when the dirty area gets too large or after
+    invalidate().
+    """
+
+    def __init__(self, max_dirty_fraction=0.35):
+        self.max_dirty_fraction = max_dirty_fraction
+        self.previous_rects = []
+        self.current_rects = []
+        self.repaint_rects = []
+        self.full_redraw = True
+
+        # Presentation statistics
+        self.partial_updates = 0
+        self.full_flips = 0
+        self.last_dirty_area = 0
+
+    def invalidate(self):
+        """Force the next frame to repaint and flip the whole screen"""
+        self.full_redraw = True
+        self.repaint_rects = []
+
+    def repaint(self, rects):
+        """Areas of the background that changed; restore() copies them and present() shows them"""
+        if not self.full_redraw:
+            self.repaint_rects.extend(rects)
+
+    def restore(self, screen, background):
+        """Erase last frame's moving things by copying the background back under them
+
+        Returns False if the whole frame has to be redrawn instead.
+        """
+        if self.full_redraw:
+            return False
+        rects = self.previous_rects + self.repaint_rects
+        screen.blits([(background, rect, rect) for rect in rects], doreturn=False)
+        return True
+
+    def add(self, rect):
+        if rect is not None and rect.width > 0 and rect.height > 0:
+            self.current_rects.append(rect)
+
+    def add_all(self, rects):
+        for rect in rects:
+            self.add(rect)
+
+    def present(self, screen):
+        """Show the frame with display.update on the dirty rects, or a full flip"""
+        screen_rect = screen.get_rect()
+        rects = self.previous_rects + self.current_rects + self.repaint_rects
+        rects = [rect.clip(screen_rect) for rect in rects]
+        rects = [rect for rect in rects if rect.width > 0 and rect.height > 0]
+
+        # Overlaps are counted twice, so this errs toward flipping
+        self.last_dirty_area = sum(rect.width * rect.height for rect in rects)
+        max_area = screen_rect.width * screen_rect.height * self.max_dirty_fraction
+
+        if self.full_redraw or self.last_dirty_area > max_area:
+            pygame.display.flip()
+            self.full_flips += 1
+        else:
+            pygame.display.update(rects)
+            self.partial_updates += 1
+
+        self.previous_rects = self.current_rects
+        self.current_rects = []
+        self.repaint_rects = []
+        self.full_redraw = False
@@ -0,0 +1,318 @@
+import numpy as np
+import pygame
+
+from spell_pool import RIGHT, LEFT
+
+ENEMY_WIDTH = 32
+ENEMY_HEIGHT = 28
+CONTACT_DAMAGE = 10
+
+# Spells hit anything within this square around their center
+SPELL_HIT_SIZE = 16
+
+# Vertical drawing offset through a hover cycle; cosmetic only
+BOB = (0, 0, -1, -1, -2, -2, -3, -3, -4, -4, -4, -3, -3, -2, -2, -1, -1, 0)
+
+class Enemy:
+    """One patrolling wisp; instances live in an EnemyPool and are reused"""
+    __slots__ = ('index', 'x', 'prev_x', 'y', 'speed', 'direction', 'left', 'right',
+                 'health', 'hit_flash', 'phase', 'cell')
+
+    def __init__(self, index):
+        self.index = index  # Slot in the pool, kept up to date as slots swap
+        self.x = 0.0
+        self.prev_x = 0.0
+        self.y = 0.0
+        self.speed = 0.0
+        self.direction = RIGHT
+        self.left = 0
+        self.right = 0
+        self.health = 0
+        self.hit_flash = 0
+        self.phase = 0
+        self.cell = None
+
+class EnemyPool:
+    """Fixed number of preallocated Enemy slots; the first count of them are live
+
+    Like SpellPool, removing an enemy swaps the last live one into its slot.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.slots = [Enemy(index) for index in range(capacity)]
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.slots[:self.count])
+
+    def spawn(self):
+        """Return the next free slot, or None if the pool is full"""
+        if self.count >= self.capacity:
+            return None
+        enemy = self.slots[self.count]
+        self.count += 1
+        return enemy
+
+    def release(self, enemy):
+        last = self.slots[self.count - 1]
+        slots = self.slots
+        slots[enemy.index], slots[last.index] = last, enemy
+        enemy.index, last.index = last.index, enemy.index
+        self.count -= 1
+
+    def clear(self):
+        self.count = 0
+
+class EnemyGrid:
+    """Uniform grid of enemies, keyed by the cell of each enemy's top left corner
+
+    Enemies are moved between cells only when they cross a cell border, so
+    keeping the grid current costs almost nothing per step. Buckets are
+    dicts used as ordered sets, which keeps query order deterministic.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.moves = 0
+
+    def _cell(self, enemy):
+        size = self.cell_size
+        return (int(enemy.x) // size, int(enemy.y) // size)
+
+    def insert(self, enemy):
+        enemy.cell = self._cell(enemy)
+        self.cells.setdefault(enemy.cell, {})[enemy] = None
+
+    def remove(self, enemy):
+        bucket = self.cells[enemy.cell]
+        del bucket[enemy]
+        if not bucket:
+            del self.cells[enemy.cell]
+        enemy.cell = None
+
+    def move(self, enemy):
+        """Refile an enemy after it moved; cheap when it stayed in its cell"""
+        if self._cell(enemy) != enemy.cell:
+            self.remove(enemy)
+            self.insert(enemy)
+            self.moves += 1
+
+    def first_overlap(self, left, top, right, bottom):
+        """First enemy overlapping the area, scanning cells row by row, or None"""
+        size = self.cell_size
+        cells = self.cells
+        for cell_y in range((top - ENEMY_HEIGHT) // size, (bottom - 1) // size + 1):
+            for cell_x in range((left - ENEMY_WIDTH) // size, (right - 1) // size + 1):
+                bucket = cells.get((cell_x, cell_y))
+                if bucket:
+                    for enemy in bucket:
+                        x, y = enemy.x, enemy.y
+                        if left < x + ENEMY_WIDTH and x < right and top < y + ENEMY_HEIGHT and y < bottom:
+                            return enemy
+        return None
+
+    def clear(self):
+        self.cells.clear()
+
+class EnemySystem:
+    """Patrolling enemies that spells can destroy and that hurt the player on contact"""
+
+    def __init__(self, assets, capacity=1024, cell_size=64):
+        self.assets = assets
+        self.pool = EnemyPool(capacity)
+        self.grid = EnemyGrid(cell_size)
+        self.tick = 0
+
+        # Sprites keyed by (flashing, facing right), made on first draw
+        self.sprites = {}
+
+        # Statistics
+        self.hits = 0
+        self.kills = 0
+
+    def __len__(self):
+        return len(self.pool)
+
+    def __iter__(self):
+        return iter(self.pool)
+
+    def clear(self):
+        self.pool.clear()
+        self.grid.clear()
+        self.tick = 0
+
+    def spawn(self, x, y, left, right, speed=1.5, health=3):
+        """Add an enemy at (x, y) that patrols between left and right (its x range)"""
+        enemy = self.pool.spawn()
+        if enemy is None:
+            return None
+        enemy.x = enemy.prev_x = float(x)
+        enemy.y = float(y)
+        enemy.left = left
+        enemy.right = right
+        enemy.speed = speed
+        enemy.direction = RIGHT
+        enemy.health = health
+        enemy.hit_flash = 0
+        enemy.phase = (int(x) + int(y)) % len(BOB)
+        self.grid.insert(enemy)
+        return enemy
+
+    def kill(self, enemy):
+        self.grid.remove(enemy)
+        self.pool.release(enemy)
+        self.kills += 1
+        self.assets.create_particles(enemy.x + ENEMY_WIDTH // 2, enemy.y + ENEMY_HEIGHT // 2,
+                                     (150, 80, 200), count=25, speed=3, lifetime=25)
+
+    def update(self, player):
+        """Move every enemy one step, then resolve spell hits and contact with the player"""
+        self.tick += 1
+        grid = self.grid
+        cell_size = grid.cell_size
+        for enemy in self.pool:
+            enemy.prev_x = enemy.x
+            enemy.x += enemy.speed * enemy.direction
+            if enemy.x >= enemy.right:
+                enemy.x = enemy.right
+                enemy.direction = LEFT
+            elif enemy.x <= enemy.left:
+                enemy.x = enemy.left
+                enemy.direction = RIGHT
+            if enemy.hit_flash > 0:
+                enemy.hit_flash -= 1
+            # Same test as grid.move, inlined as enemies rarely change cell
+            if (int(enemy.x) // cell_size, int(enemy.y) // cell_size) != enemy.cell:
+                grid.move(enemy)
+
+        self.hit_spells(player)
+        self.touch_player(player)
+
+    def hit_spells(self, player):
+        """Burst spells on the first enemy they touch since the last step
+
+        One NumPy pass over all spells and enemies picks out the spells that
+        touch any enemy at all; only those walk the grid for the first one.
+        """
+        spells = player.spells
+        touching = self.spells_touching_enemies(spells)
+        if not touching:
+            return
+
+        slots = spells.slots
+        first_overlap = self.grid.first_overlap
+        half = SPELL_HIT_SIZE // 2
+        i = 0
+        while i < spells.count:
+            spell = slots[i]
+            if spell not in touching:
+                i += 1
+                continue
+
+            # Cover the whole path since the last step so fast spells cannot skip past
+            if spell.prev_x < spell.x:
+                left, right = int(spell.prev_x) - half, int(spell.x) + half
+            else:
+                left, right = int(spell.x) - half, int(spell.prev_x) + half
+            top = int(spell.y) - half
+
+            target = first_overlap(left, top, right, top + SPELL_HIT_SIZE)
+            if target is None:
+                i += 1
+                continue
+
+            self.hits += 1
+            target.health -= spell.power
+            target.hit_flash = 6
+            spells.release(i)
+            self.assets.create_particles(spell.x, spell.y, spell.color, count=20, speed=3, lifetime=20)
+            if target.health <= 0:
+                self.kill(target)
+
+    def spells_touching_enemies(self, spells):
+        """Set of live spells whose path since the last step overlaps any enemy
+
+        Enemies are sorted by x, so each spell is only tested against the
+        ones in its horizontal range. The boxes are widened by a pixel to
+        stay clear of float rounding; the grid makes the exact test.
+        """
+        count, enemy_count = spells.count, self.pool.count
+        if count == 0 or enemy_count == 0:
+            return set()
+        live = spells.slots[:count]
+        x = np.fromiter((spell.x for spell in live), np.float64, count)
+        prev_x = np.fromiter((spell.prev_x for spell in live), np.float64, count)
+        y = np.fromiter((spell.y for spell in live), np.float64, count)
+        enemies = self.pool.slots[:enemy_count]
+        enemy_x = np.fromiter((enemy.x for enemy in enemies), np.float64, enemy_count)
+        enemy_y = np.fromiter((enemy.y for enemy in enemies), np.float64, enemy_count)
+
+        half = SPELL_HIT_SIZE // 2
+        left = np.trunc(np.minimum(prev_x, x)) - half - 1
+        right = np.trunc(np.maximum(prev_x, x)) + half + 1
+        top = np.trunc(y) - half - 1
+        bottom = top + SPELL_HIT_SIZE + 2
+
+        # Enemies whose x is in (left - ENEMY_WIDTH, right), as (spell, enemy) pairs
+        order = np.argsort(enemy_x)
+        sorted_x = enemy_x[order]
+        first = np.searchsorted(sorted_x, left - ENEMY_WIDTH, 'right')
+        counts = np.searchsorted(sorted_x, right, 'left') - first
+        counts = np.maximum(counts, 0)
+        pair_spell = np.repeat(np.arange(count), counts)
+        starts = np.cumsum(counts) - counts
+        pair_enemy = order[np.arange(len(pair_spell)) - np.repeat(starts - first, counts)]
+
+        pair_y = enemy_y[pair_enemy]
+        hit = (top[pair_spell] < pair_y + ENEMY_HEIGHT) & (pair_y < bottom[pair_spell])
+        return {live[i] for i in np.unique(pair_spell[hit])}
+
+    def touch_player(self, player):
+        rect = player.rect
+        if self.grid.first_overlap(rect.left, rect.top, rect.right, rect.bottom):
+            player.take_damage(CONTACT_DAMAGE)
+
+    def _make_sprite(self, flashing, facing_right):
+        surface = pygame.Surface((ENEMY_WIDTH, ENEMY_HEIGHT), pygame.SRCALPHA)
+        body = (255, 230, 255) if flashing else (110, 60, 160)
+        glow = (255, 255, 255, 90) if flashing else (170, 110, 230, 90)
+        pygame.draw.ellipse(surface, glow, surface.get_rect())
+        pygame.draw.ellipse(surface, body, surface.get_rect().inflate(-6, -6))
+
+        # Eyes look the way the enemy is moving
+        look = 2 if facing_right else -2
+        for eye_x in (11, 21):
+            pygame.draw.circle(surface, (255, 240, 120), (eye_x + look, 12), 3)
+            pygame.draw.circle(surface, (40, 20, 60), (eye_x + look + look // 2, 12), 1)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+
+    def get_sprite(self, enemy):
+        key = (enemy.hit_flash > 0, enemy.direction == RIGHT)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self.sprites[key] = self._make_sprite(*key)
+        return sprite
+
+    def get_draw_rect(self, enemy, alpha=1.0, offset=(0, 0)):
+        """Screen area an enemy is drawn over, interpolated between simulation steps"""
+        x = enemy.prev_x + (enemy.x - enemy.prev_x) * alpha
+        y = enemy.y + BOB[(self.tick + enemy.phase) % len(BOB)]
+        return pygame.Rect(int(x) - offset[0], int(y) - offset[1], ENEMY_WIDTH, ENEMY_HEIGHT)
+
+    def draw(self, surface, alpha=1.0, offset=(0, 0)):
+        view = surface.get_rect()
+        for enemy in self.pool:
+            rect = self.get_draw_rect(enemy, alpha, offset)
+            if view.colliderect(rect):
+                surface.blit(self.get_sprite(enemy), rect)
+
+    def dirty_rects(self, alpha=1.0, offset=(0, 0)):
+        """Areas drawn over this frame, for the dirty-rect presenter"""
+        return [self.get_draw_rect(enemy, alpha, offset) for enemy in self.pool]
@@ -0,0 +1,48 @@
+import time
+
+class FixedTimestep:
+    """Turns elapsed real time into a whole number of fixed simulation steps
+
+    advance() returns how many steps to run this frame; afterwards alpha
+    is how far real time has moved into the next step (0..1), used to
+    interpolate drawing between the previous and current states.
+    """
+
+    def __init__(self, rate=60, max_steps=5):
+        self.step_time = 1.0 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.last_time = None
+
+        # Real time given up by the catch-up cap
+        self.dropped_time = 0.0
+
+    def reset(self):
+        """Start timing afresh, e.g. after a pause or a scene change"""
+        self.last_time = None
+        self.accumulator = 0.0
+        self.alpha = 1.0
+
+    def advance(self, elapsed=None):
+        """Add elapsed seconds (measured with the clock if None) and return steps due"""
+        if elapsed is None:
+            now = time.perf_counter()
+            # The first frame after a reset runs exactly one step
+            elapsed = self.step_time if self.last_time is None else now - self.last_time
+            self.last_time = now
+
+        self.accumulator += elapsed
+        # The epsilon absorbs float error from summing many small frame times
+        steps = int(self.accumulator / self.step_time + 1e-6)
+
+        # Cap catch-up work so a slow frame cannot snowball into slower ones;
+        # the time that could not be simulated is dropped
+        if steps > self.max_steps:
+            self.dropped_time += (steps - self.max_steps) * self.step_time
+            steps = self.max_steps
+            self.accumulator = self.step_time * steps
+
+        self.accumulator -= steps * self.step_time
+        self.alpha = min(1.0, max(0.0, self.accumulator / self.step_time))
+        return steps
@@ -0,0 +1,185 @@
+import csv
+import time
+import numpy as np
+import pygame
+
+class FrameTimer:
+    """Per-phase frame timings recorded into a fixed-size ring buffer
+
+    Call begin_frame() at the top of a loop iteration, mark(phase) after
+    each phase and end_frame() once the frame is presented. Every call
+    returns immediately while the timer is disabled.
+    """
+
+    MAX_PHASES = 16
+    SPARKLINE_BUDGET_MS = 33.3  # Top of the sparkline graph
+
+    def __init__(self, capacity=300):
+        self.enabled = False
+        self.show_overlay = False
+        self.capacity = capacity
+
+        # Ring buffer: one row per frame, one column per phase
+        self.phase_names = []
+        self.phase_columns = {}
+        self.durations = np.zeros((capacity, self.MAX_PHASES), dtype=np.float64)
+        self.frame_times = np.zeros(capacity, dtype=np.float64)
+        self.scenes = [''] * capacity
+        self.index = 0
+        self.count = 0
+
+        # Live counters shown on the overlay (particles, spells, ...), cleared
+        # whenever the scene changes
+        self.counters = {}
+
+        self.scene = ''
+        self.frame_phases = []
+        self.last_phases = []
+        self.frame_start = 0.0
+        self.last_mark = 0.0
+        self.previous_frame_start = None
+        self.font = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.show_overlay = self.enabled
+        self.previous_frame_start = None
+        print(f"Frame timing overlay {'on' if self.enabled else 'off'}")
+
+    def handle_event(self, event):
+        """Handle the timing hotkeys: F3 toggles the overlay, F4 exports CSV"""
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == pygame.K_F3:
+            self.toggle()
+            return True
+        if event.key == pygame.K_F4:
+            self.export_csv('frame_timings.csv')
+            return True
+        return False
+
+    def begin_frame(self, scene):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if scene != self.scene:
+            # Counters belong to the scene that set them
+            self.counters.clear()
+            self.scene = scene
+        self.frame_start = now
+        self.last_mark = now
+        self.frame_phases = []
+        self.durations[self.index].fill(0.0)
+
+    def mark(self, phase):
+        """Record the time spent since the previous mark under the given phase name"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        column = self.phase_columns.get(phase)
+        if column is None:
+            column = self._add_phase(phase)
+        self.durations[self.index, column] += now - self.last_mark
+        self.last_mark = now
+        self.frame_phases.append(phase)
+
+    def set_counter(self, name, value):
+        if self.enabled:
+            self.counters[name] = value
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+
+        # Frame time is start-to-start so it includes time spent waiting on the clock
+        if self.previous_frame_start is not None:
+            self.frame_times[(self.index - 1) % self.capacity] = self.frame_start - self.previous_frame_start
+        self.previous_frame_start = self.frame_start
+
+        self.frame_times[self.index] = self.last_mark - self.frame_start
+        self.scenes[self.index] = self.scene
+        self.last_phases = self.frame_phases
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _add_phase(self, phase):
+        if len(self.phase_names) >= self.MAX_PHASES:
+            raise ValueError(f"Too many timing phases (max {self.MAX_PHASES})")
+        column = len(self.phase_names)
+        self.phase_names.append(phase)
+        self.phase_columns[phase] = column
+        return column
+
+    def recent_rows(self, frames=None):
+        """Indices of the most recent recorded frames, oldest first"""
+        frames = self.count if frames is None else min(frames, self.count)
+        return [(self.index - frames + i) % self.capacity for i in range(frames)]
+
+    def phase_averages(self, frames=60):
+        """Average milliseconds per phase over the last frames of the current scene"""
+        rows = [row for row in self.recent_rows(frames) if self.scenes[row] == self.scene]
+        if not rows:
+            return {}
+        means = self.durations[rows].mean(axis=0) * 1000
+        return {phase: means[self.phase_columns[phase]] for phase in dict.fromkeys(self.last_phases)}
+
+    def fps(self, frames=60):
+        rows = self.recent_rows(frames)[:-1]
+        if not rows:
+            return 0.0
+        mean_frame = self.frame_times[rows].mean()
+        return 1.0 / mean_frame if mean_frame > 0 else 0.0
+
+    def export_csv(self, path):
+        """Write every buffered frame as one CSV row with per-phase milliseconds"""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'scene', 'frame_ms'] + self.phase_names)
+            for frame, row in enumerate(self.recent_rows()):
+                phase_ms = [f"{value * 1000:.4f}" for value in self.durations[row, :len(self.phase_names)]]
+                writer.writerow([frame, self.scenes[row], f"{self.frame_times[row] * 1000:.4f}"] + phase_ms)
+        print(f"Exported {self.count} frame timings to {path}")
+
+    def draw_overlay(self, surface):
+        """Draw FPS, per-phase milliseconds, counters and a frame-time sparkline
+
+        Returns the rect of the drawn panel, or None when the overlay is hidden.
+        """
+        if not self.show_overlay:
+            return None
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+
+        lines = [f"{self.scene}  FPS: {self.fps():.1f}"]
+        for phase, ms in self.phase_averages().items():
+            lines.append(f"{phase:<10} {ms:6.2f} ms")
+        for name, value in self.counters.items():
+            lines.append(f"{name}: {value}")
+
+        line_height = self.font.get_linesize()
+        graph_height = 40
+        width = 200
+        height = len(lines) * line_height + graph_height + 15
+        x = surface.get_width() - width - 10
+        y = 10
+
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        surface.blit(panel, (x, y))
+
+        for i, line in enumerate(lines):
+            text = self.font.render(line, True, (220, 255, 220))
+            surface.blit(text, (x + 5, y + 5 + i * line_height))
+
+        # Sparkline of recent frame times, clipped at the budget line
+        rows = self.recent_rows(width - 10)[:-1]
+        if len(rows) > 1:
+            graph_bottom = y + height - 5
+            frame_ms = np.minimum(self.frame_times[rows] * 1000, self.SPARKLINE_BUDGET_MS)
+            points = [(x + 5 + i, graph_bottom - ms / self.SPARKLINE_BUDGET_MS * graph_height)
+                      for i, ms in enumerate(frame_ms.tolist())]
+            target_y = graph_bottom - 16.7 / self.SPARKLINE_BUDGET_MS * graph_height
+            pygame.draw.line(surface, (90, 90, 90), (x + 5, target_y), (x + width - 5, target_y))
+            pygame.draw.lines(surface, (255, 220, 100), False, points)
+
+        return pygame.Rect(x, y, width, height)
@@ -0,0 +1,86 @@
+import numpy as np
+import pygame
+
+class GlowCache:
+    """Radial glow textures, computed once with NumPy and reused every frame
+
+    A glow is described by concentric rings of (radius, alpha), the way the
+    effects used to be drawn: translucent filled circles, either each
+    blended over the last (stacked) or each replacing the pixels it covers.
+    The texture holds the combined result, so a pulsing glow is one blit of
+    the texture for its current radius.
+    """
+
+    def __init__(self):
+        self.textures = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, color, rings, stacked=True):
+        """Texture for rings of (radius, alpha), drawn in order around the center of a square surface
+
+        The surface is twice the largest radius wide and should be blitted
+        at the glow center minus that radius.
+        """
+        key = (tuple(color[:3]), tuple(rings), stacked)
+        texture = self.textures.get(key)
+        if texture is not None:
+            self.hits += 1
+            return texture
+
+        self.misses += 1
+        texture = self._render(*key)
+        self.textures[key] = texture
+        return texture
+
+    def ring_gradient(self, color, radius, depth, max_alpha, layers=None):
+        """Texture for rings from radius down over depth pixels, alpha falling to zero outward
+
+        radius is rounded to a whole pixel, so a pulsing glow reuses at most
+        one texture per pixel of pulse.
+        """
+        return self.get(color, self.gradient_rings(radius, depth, max_alpha, layers))
+
+    def gradient_rings(self, radius, depth, max_alpha, layers=None):
+        """(radius, alpha) of layers rings spread evenly over depth; one per pixel by default"""
+        radius = int(radius)
+        if layers is None:
+            layers = depth
+        radii = np.linspace(radius, radius - depth, layers, endpoint=False).round().astype(int)
+        return tuple((int(r), int(max_alpha * (int(r) - (radius - depth)) / depth))
+                     for r in radii if r > 0)
+
+    def _render(self, color, rings, stacked):
+        size = max((radius for radius, _ in rings), default=0)
+        surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        surface.fill((*color, 0))
+        if size == 0:
+            return surface
+
+        # Each ring covers the pixels pygame.draw.circle would fill; stacked
+        # translucent rings leave 1 - product(1 - alpha) of the color
+        transparency = np.ones((size * 2, size * 2))
+        for radius, alpha in rings:
+            if radius <= 0:
+                continue
+            offset = size - radius
+            covered = self._circle_mask(radius)
+            area = transparency[offset:offset + radius * 2, offset:offset + radius * 2]
+            if stacked:
+                area[covered] *= 1 - alpha / 255
+            else:
+                area[covered] = 1 - alpha / 255
+
+        alpha_channel = pygame.surfarray.pixels_alpha(surface)
+        alpha_channel[:] = np.round((1 - transparency) * 255).astype(np.uint8)
+        del alpha_channel
+
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+
+    def _circle_mask(self, radius):
+        mask_surface = pygame.Surface((radius * 2, radius * 2), depth=8)
+        mask_surface.fill(0)
+        pygame.draw.circle(mask_surface, 1, (radius, radius), radius)
+        return pygame.surfarray.array2d(mask_surface) != 0
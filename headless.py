@@ -0,0 +1,133 @@
+import os
+import random
+import time
+import statistics
+import zlib
+import pygame
+
+from frame_timing import FrameTimer
+
+class ScriptedKeys:
+    """Stand-in for pygame.key.get_pressed() backed by a set of held keys"""
+    def __init__(self, held=()):
+        self.held = set(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+class InputScript:
+    """Deterministic per-frame input: wander left and right, jump and cast spells"""
+    def __init__(self, seed, spell_hotkey):
+        self.rng = random.Random(seed)
+        self.spell_hotkey = spell_hotkey
+        self.direction = None
+        self.next_change = 0
+
+    def frame_input(self, frame):
+        """Return (held keys, keys pressed this frame) for the given frame"""
+        if frame >= self.next_change:
+            self.direction = self.rng.choice([pygame.K_LEFT, pygame.K_RIGHT, None])
+            self.next_change = frame + self.rng.randint(20, 90)
+
+        held = set()
+        if self.direction is not None:
+            held.add(self.direction)
+        if self.rng.random() < 0.05:
+            held.add(pygame.K_SPACE)
+
+        pressed = []
+        if self.rng.random() < 0.1:
+            pressed.append(self.spell_hotkey)
+        return held, pressed
+
+def use_dummy_drivers():
+    """Route SDL video and audio to dummy drivers; must run before pygame.init()"""
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+def seed_everything(game, seed):
+    random.seed(seed)
+    game.assets.particles.seed(seed)
+
+def state_checksum(game):
+    """CRC of the gameplay state, for checking that two runs simulated the same thing"""
+    player = game.player
+    particles = game.assets.particles
+    n = particles.count
+    state = (
+        player.x, player.y, player.velocity_x, player.velocity_y, player.health,
+        sorted((spell.x, spell.y, spell.lifetime) for spell in player.spells),
+        particles.x[:n].tobytes(), particles.y[:n].tobytes(),
+        [(star['x'], star['y']) for star in game.stars],
+        [(enemy.x, enemy.y, enemy.health) for enemy in game.enemies]
+    )
+    return zlib.crc32(repr(state).encode())
+
+def run_headless(frames, seed=0, render=True, dirty_rects=False, render_fps=None):
+    """Run the gameplay loop for a fixed number of frames without a window
+
+    Scripted input is applied per simulation step. With render_fps set, each
+    frame advances the fixed-timestep clock by 1 / render_fps seconds, so the
+    same simulated time gives the same gameplay at any render rate.
+    """
+    use_dummy_drivers()
+
+    # Seed before construction so stars and menus are reproducible too
+    random.seed(seed)
+    from main import Game
+    game = Game()
+    game.settings.dirty_rect_rendering = dirty_rects
+    
+    # Full quality throughout, so results do not depend on machine speed
+    game.assets.quality.enabled = False
+    game.assets.quality.reset()
+    seed_everything(game, seed)
+    game.start_game()
+
+    script = InputScript(seed, game.settings.spell_hotkey)
+    elapsed = game.timestep.step_time if render_fps is None else 1.0 / render_fps
+    
+    def apply_input(game):
+        held, pressed = script.frame_input(game.step_count)
+        game.input_keys = ScriptedKeys(held)
+        if game.settings.spell_hotkey in pressed:
+            game.player.cast_spell()
+    game.before_step = apply_input
+    frame_times = []
+    
+    # Record per-phase timings for every frame without drawing the overlay
+    timer = FrameTimer(capacity=max(frames, 1))
+    timer.enabled = True
+    game.frame_timer = timer
+
+    start_time = time.perf_counter()
+    for frame in range(frames):
+        frame_start = time.perf_counter()
+        game._run_game(render, elapsed)
+        frame_times.append(time.perf_counter() - frame_start)
+    total_time = time.perf_counter() - start_time
+
+    report(frame_times, total_time, render)
+    print(f"  simulated {game.step_count} steps, state checksum {state_checksum(game):08x}")
+    for phase, ms in timer.phase_averages(frames).items():
+        print(f"  {phase:<10} {ms:.3f} ms/frame")
+    if dirty_rects:
+        presenter = game.dirty_rects
+        print(f"  presented: {presenter.partial_updates} partial updates, {presenter.full_flips} full flips")
+    pygame.quit()
+    return frame_times
+
+def report(frame_times, total_time, render):
+    frame_ms = sorted(t * 1000 for t in frame_times)
+    count = len(frame_ms)
+    if count == 0:
+        print("No frames simulated")
+        return
+
+    def percentile(p):
+        return frame_ms[min(count - 1, int(count * p / 100))]
+
+    print(f"Headless run: {count} frames, rendering {'on' if render else 'off'}")
+    print(f"  total: {total_time:.3f} s, {count / total_time:.1f} ticks/s")
+    print(f"  frame ms: mean {statistics.mean(frame_ms):.3f}, median {statistics.median(frame_ms):.3f}, "
+          f"p95 {percentile(95):.3f}, p99 {percentile(99):.3f}, max {frame_ms[-1]:.3f}")
@@ -0,0 +1,221 @@
+import json
+import random
+import time
+import tracemalloc
+import pygame
+
+FORMAT_VERSION = 1
+
+class Level:
+    """A level file whose platforms and decorations are split into square chunks
+
+    The file is JSON lines: a header object first, then one object per chunk
+    in the order listed in the header's "chunks" table. Only the header is
+    parsed up front; chunk lines are read from disk when stream() asks for
+    them and dropped again when the player moves away.
+
+    Platforms overlapping several chunks are stored in each of them under
+    the same id. The active platform list is always ordered by id, which is
+    the order the level was authored in.
+    """
+
+    def __init__(self, path, get_color=None):
+        self.path = path
+        self.get_color = get_color
+
+        start = time.perf_counter()
+        with open(path, 'rb') as f:
+            header = json.loads(f.readline())
+            if header.get('format') != FORMAT_VERSION:
+                raise ValueError(f"{path}: unsupported level format {header.get('format')}")
+
+            # Byte offset of every chunk line, found without parsing them
+            self.chunk_offsets = {}
+            chunk_keys = [tuple(key) for key in header['chunks']]
+            offset = f.tell()
+            for key in chunk_keys:
+                line = f.readline()
+                if not line:
+                    raise ValueError(f"{path}: missing chunk {key}")
+                self.chunk_offsets[key] = offset
+                offset += len(line)
+
+        self.name = header.get('name', path)
+        self.width = header['width']
+        self.height = header['height']
+        self.chunk_size = header['chunk_size']
+        self.spawn = tuple(header['spawn'])
+
+        # Enemies are few, so they live in the header: position and patrol range
+        self.enemies = [(entry['pos'][0], entry['pos'][1], entry['patrol'][0], entry['patrol'][1])
+                        for entry in header.get('enemies', [])]
+
+        # Loaded chunks and the merged view over them
+        self.chunks = {}
+        self.platforms = []
+        self.decorations = []
+        self.version = 0
+
+        # Load statistics
+        self.header_time = time.perf_counter() - start
+        self.chunk_loads = 0
+        self.chunk_time = 0.0
+
+    def area_around(self, x, y, view_size):
+        """Area to keep loaded around a point: a view centered on it plus a chunk each way"""
+        width, height = view_size
+        margin = self.chunk_size
+        return pygame.Rect(int(x) - width // 2 - margin, int(y) - height // 2 - margin,
+                           width + margin * 2, height + margin * 2)
+
+    def chunks_in(self, area):
+        """Keys of the chunks in the file that overlap the area rect"""
+        size = self.chunk_size
+        left, top = area.left // size, area.top // size
+        right, bottom = (area.right - 1) // size, (area.bottom - 1) // size
+        return {(cx, cy) for cx in range(left, right + 1) for cy in range(top, bottom + 1)
+                if (cx, cy) in self.chunk_offsets}
+
+    def stream(self, area, keep_margin=None):
+        """Load the chunks overlapping area and unload those well outside it
+
+        Chunks are only unloaded once they leave area grown by keep_margin
+        (one chunk by default), so walking along a border does not thrash.
+        Returns True if the set of loaded chunks changed.
+        """
+        if keep_margin is None:
+            keep_margin = self.chunk_size
+        wanted = self.chunks_in(area)
+        keep = self.chunks_in(area.inflate(keep_margin * 2, keep_margin * 2))
+
+        changed = False
+        for key in wanted - self.chunks.keys():
+            self.chunks[key] = self._load_chunk(key)
+            changed = True
+        for key in self.chunks.keys() - keep:
+            del self.chunks[key]
+            changed = True
+
+        if changed:
+            self._merge_chunks()
+        return changed
+
+    def load_all(self):
+        return self.stream(pygame.Rect(0, 0, self.width, self.height))
+
+    def _load_chunk(self, key):
+        start = time.perf_counter()
+        with open(self.path, 'rb') as f:
+            f.seek(self.chunk_offsets[key])
+            data = json.loads(f.readline())
+
+        chunk = {
+            'platforms': [self._make_platform(entry) for entry in data.get('platforms', [])],
+            'decorations': [dict(entry, pos=tuple(entry['pos'])) for entry in data.get('decorations', [])]
+        }
+        self.chunk_loads += 1
+        self.chunk_time += time.perf_counter() - start
+        return chunk
+
+    def _make_platform(self, entry):
+        color = entry.get('color', 'wood_dark')
+        return {
+            'id': entry['id'],
+            'rect': pygame.Rect(entry['rect']),
+            'color': self.get_color(color) if self.get_color else color,
+            'texture': entry.get('texture', 'wood')
+        }
+
+    def _merge_chunks(self):
+        platforms = {}
+        decorations = {}
+        for chunk in self.chunks.values():
+            for platform in chunk['platforms']:
+                platforms.setdefault(platform['id'], platform)
+            for decoration in chunk['decorations']:
+                decorations.setdefault(decoration['id'], decoration)
+        self.platforms = [platforms[key] for key in sorted(platforms)]
+        self.decorations = [decorations[key] for key in sorted(decorations)]
+        self.version += 1
+
+    def report(self):
+        print(f"Level '{self.name}': {self.width}x{self.height}, "
+              f"{len(self.chunks)}/{len(self.chunk_offsets)} chunks loaded, "
+              f"{len(self.platforms)} platforms, "
+              f"header {self.header_time * 1000:.2f} ms, "
+              f"{self.chunk_loads} chunk loads {self.chunk_time * 1000:.2f} ms")
+
+def load_level(path, view_size, get_color=None):
+    """Open a level, stream in the chunks around its spawn point and report time and memory"""
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+
+    level = Level(path, get_color)
+    level.stream(level.area_around(*level.spawn, view_size))
+
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    if not tracing:
+        tracemalloc.stop()
+
+    level.report()
+    print(f"  loaded in {elapsed * 1000:.2f} ms, {(current - before) / 1024:.1f} KB held, "
+          f"{(peak - before) / 1024:.1f} KB peak")
+    return level
+
+def save_level(path, name, width, height, spawn, platforms, decorations=(), chunk_size=512, enemies=()):
+    """Write platforms ({'rect', 'color', 'texture'}), decorations ({'image', 'pos'})
+    and enemies ({'pos', 'patrol'}) as a level file
+
+    Ids follow list order, so collision order is preserved when loaded.
+    """
+    chunks = {}
+
+    def add(kind, entry, rect):
+        left, top = rect.left // chunk_size, rect.top // chunk_size
+        right, bottom = (rect.right - 1) // chunk_size, (rect.bottom - 1) // chunk_size
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                chunks.setdefault((cx, cy), {'platforms': [], 'decorations': []})[kind].append(entry)
+
+    for index, platform in enumerate(platforms):
+        rect = pygame.Rect(platform['rect'])
+        entry = {'id': index, 'rect': list(rect), 'color': platform.get('color', 'wood_dark'),
+                 'texture': platform.get('texture', 'wood')}
+        add('platforms', entry, rect)
+
+    for index, decoration in enumerate(decorations):
+        entry = dict(decoration, id=index, pos=list(decoration['pos']))
+        add('decorations', entry, pygame.Rect(entry['pos'], (1, 1)))
+
+    keys = sorted(chunks)
+    header = {
+        'format': FORMAT_VERSION,
+        'name': name,
+        'width': width,
+        'height': height,
+        'chunk_size': chunk_size,
+        'spawn': list(spawn),
+        'chunks': [list(key) for key in keys]
+    }
+    if enemies:
+        header['enemies'] = [{'pos': list(enemy['pos']), 'patrol': list(enemy['patrol'])} for enemy in enemies]
+    with open(path, 'w') as f:
+        f.write(json.dumps(header) + '\n')
+        for key in keys:
+            f.write(json.dumps(chunks[key], separators=(',', ':')) + '\n')
+
+def generate_level(path, width, height, seed=0, chunk_size=512):
+    """Write a large random level, for testing streaming and benchmarks"""
+    rng = random.Random(seed)
+    platforms = [{'rect': (0, height - 50, width, 50)}]
+    for _ in range(width * height // 40000):
+        platforms.append({'rect': (rng.randint(0, width - 200), rng.randint(100, height - 100),
+                                   rng.randint(60, 250), 25)})
+    decorations = [{'image': 'magic_effect', 'pos': (rng.randint(0, width), rng.randint(0, height))}
+                   for _ in range(width * height // 200000)]
+    save_level(path, f"Generated {seed}", width, height, (width // 2, height // 2),
+               platforms, decorations, chunk_size)
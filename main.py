@@ -1,40 +1,135 @@
+import time
+
+# Launch time, before the (slow) pygame and numpy imports
+LAUNCH_TIME = time.perf_counter()
+
 import pygame
 import sys
+import argparse
+import os
 import random
 import math
+import itertools
 from settings import Settings
 from player import Player
-from menu import Menu
 from assets_manager import AssetsManager
-from customization import CustomizationScreen
+from frame_timing import FrameTimer
+from startup_profile import StartupProfile
+from dirty_rects import DirtyRectRenderer
+from fixed_timestep import FixedTimestep
+from spatial_hash import SpatialHash
+from level import load_level
+from camera import Camera
+from enemies import EnemySystem
 
 class Game:
-    def __init__(self):
+    # Transparent color for cached layers
+    LAYER_COLORKEY = (255, 0, 255)
+    
+    # The first level, authored for each window size the settings menu offers
+    LEVEL_PATHS = {
+        (800, 600): os.path.join('levels', 'level1.jsonl'),
+        (1024, 768): os.path.join('levels', 'level1_1024x768.jsonl')
+    }
+    
+    # Size of the cached square tiles platforms are pre-drawn into
+    PLATFORM_TILE_SIZE = 256
+    
+    def __init__(self, background_loading=False, startup_profile=None):
+        """Set up the game; with background_loading, assets keep loading while run() shows progress
+        
+        startup_profile collects launch phase timings up to the first frame.
+        """
+        self.startup_profile = startup_profile if startup_profile is not None else StartupProfile()
+        self.first_frame_shown = False
+        profile = self.startup_profile
+        
         pygame.init()
+        profile.mark('pygame.init')
         self.settings = Settings()
+        profile.mark('settings')
         self.screen = pygame.display.set_mode((self.settings.window_width, self.settings.window_height))
         pygame.display.set_caption("Wizard Quest")
+        profile.mark('set_mode')
         
         self.clock = pygame.time.Clock()
-        self.assets = AssetsManager()
-        self.menu = Menu(self)
-        self.customization = CustomizationScreen(self.settings, self.assets)
+        self.frame_timer = FrameTimer()
+        self.assets = AssetsManager(background=background_loading)
+        self.assets.quality.enabled = self.settings.adaptive_quality
+        profile.mark('assets')
+        
+        # Scenes are built on first entry, see the menu and customization properties
+        self._menu = None
+        self._customization = None
         self.player = None
         self.game_active = False
         
-        # Load and play background music
+        # Held-key state for the player; None reads the real keyboard
+        self.input_keys = None
+        
+        # Fixed-rate simulation clock, and an optional callback run before
+        # every simulation step (used to feed scripted input)
+        self.timestep = FixedTimestep(self.settings.simulation_rate, self.settings.max_catchup_steps)
+        self.before_step = None
+        self.step_count = 0
+        
+        # Optional replay.InputRecorder that records each game session
+        self.input_recorder = None
+        
+        # Play background music as soon as it is loaded
+        self.assets.on_music_loaded = self.play_music
         if self.assets.get_music('background'):
-            pygame.mixer.music.load(self.assets.get_music('background'))
-            pygame.mixer.music.set_volume(self.settings.music_volume)
-            pygame.mixer.music.play(-1)  # -1 means loop indefinitely
+            self.play_music('background')
             
         # Background elements
         self.stars = []
         self.create_stars()
         
-        # Platform elements
+        # Level data; platforms are streamed in by chunk around the player
+        self.level = None
         self.platforms = []
-        self.create_platforms()
+        self.platforms_version = 0
+        self.load_level(self.level_path())
+        
+        # Enemies from the level, spawned afresh for every game
+        self.enemies = EnemySystem(self.assets)
+        
+        # Grid index over the platforms for collision, rebuilt when they change
+        self.platform_index = None
+        self.platform_index_key = None
+        
+        # Camera following the player around the level
+        self.camera = Camera(self.settings.window_width, self.settings.window_height,
+                             self.level.width, self.level.height)
+        
+        # Platforms pre-drawn into colorkeyed tiles keyed by tile position,
+        # the window-sized background, and the static scene (background
+        # plus platforms) for the camera position in static_layer_offset
+        self.platform_tiles = {}
+        self.platform_tile_areas = {}
+        self.platform_tiles_key = None
+        self.background_layer = None
+        self.static_layer = None
+        self.static_layer_key = None
+        self.static_layer_offset = None
+        
+        # Partial screen updates, used when settings.dirty_rect_rendering is on
+        self.dirty_rects = DirtyRectRenderer()
+        profile.mark('game setup')
+    
+    @property
+    def menu(self):
+        if self._menu is None:
+            from menu import Menu
+            self._menu = Menu(self)
+        return self._menu
+    
+    @property
+    def customization(self):
+        if self._customization is None:
+            from customization import CustomizationScreen
+            self._customization = CustomizationScreen(self.settings, self.assets, self.frame_timer)
+        return self._customization
 
     def create_stars(self):
         for _ in range(100):
@@ -45,50 +140,80 @@ class Game:
                 'speed': random.uniform(0.05, 0.2)
             })
     
-    def create_platforms(self):
-        # Ground platform - full width at bottom
-        self.platforms.append({
-            'rect': pygame.Rect(0, self.settings.window_height - 50, self.settings.window_width, 50),
-            'color': self.assets.get_color('wood_dark'),
-            'texture': 'wood'
-        })
-        
-        # Platform arrangement for better gameplay
-        # Left side platform
-        self.platforms.append({
-            'rect': pygame.Rect(100, 420, 250, 25),
-            'color': self.assets.get_color('wood_dark'),
-            'texture': 'wood'
-        })
-        
-        # Right side platform
-        self.platforms.append({
-            'rect': pygame.Rect(450, 420, 250, 25),
-            'color': self.assets.get_color('wood_dark'),
-            'texture': 'wood'
-        })
-        
-        # Middle platform higher up
-        self.platforms.append({
-            'rect': pygame.Rect(300, 300, 200, 25),
-            'color': self.assets.get_color('wood_dark'),
-            'texture': 'wood'
-        })
-        
-        # Two platforms at the top level
-        self.platforms.append({
-            'rect': pygame.Rect(150, 200, 150, 25),
-            'color': self.assets.get_color('wood_dark'),
-            'texture': 'wood'
-        })
-        
-        self.platforms.append({
-            'rect': pygame.Rect(500, 200, 150, 25),
-            'color': self.assets.get_color('wood_dark'),
-            'texture': 'wood'
-        })
+    def level_path(self):
+        """Level file for the current window size"""
+        size = (self.settings.window_width, self.settings.window_height)
+        return self.LEVEL_PATHS.get(size, self.LEVEL_PATHS[(800, 600)])
+    
+    def load_level(self, path):
+        """Load a level file and stream in the chunks around its spawn point"""
+        view_size = (self.settings.window_width, self.settings.window_height)
+        self.level = load_level(path, view_size, self.assets.get_color)
+        self.level_window_size = view_size
+        self.platforms = self.level.platforms
+        self.platforms_version += 1
+    
+    def stream_level(self):
+        """Load and unload level chunks as the player moves"""
+        view_size = (self.settings.window_width, self.settings.window_height)
+        if self.level.stream(self.level.area_around(self.player.x, self.player.y, view_size)):
+            self.platforms = self.level.platforms
+            self.platforms_version += 1
+    
+    def play_music(self, name):
+        if name == 'background':
+            pygame.mixer.music.load(self.assets.get_music('background'))
+            pygame.mixer.music.set_volume(self.settings.music_volume)
+            pygame.mixer.music.play(-1)  # -1 means loop indefinitely
+    
+    def update_loading(self):
+        """Finish any background asset loading that is ready; call once per frame"""
+        self.assets.poll_loading()
+    
+    def report_first_frame(self):
+        """Print the time from launch to the first presented frame, once"""
+        if not self.first_frame_shown:
+            self.first_frame_shown = True
+            profile = self.startup_profile
+            profile.mark('first flip')
+            if profile.enabled:
+                profile.report()
+            else:
+                print(f"First frame {profile.total * 1000:.1f} ms after launch")
+    
+    def show_loading_screen(self):
+        """Draw loading progress until the main menu's assets are ready"""
+        # The default font is built in, so it needs nothing from the loader
+        font = pygame.font.Font(None, 36)
+        bar = pygame.Rect(0, 0, 400, 16)
+        
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.settings.flush()
+                    pygame.quit()
+                    sys.exit()
+            self.update_loading()
+            
+            bar.center = (self.settings.window_width // 2, self.settings.window_height // 2 + 30)
+            progress = self.assets.loader.progress
+            self.screen.fill(self.assets.get_color('background'))
+            label = font.render(f"Loading... {int(progress * 100)}%", True, self.assets.get_color('text_light'))
+            self.screen.blit(label, label.get_rect(midbottom=(bar.centerx, bar.top - 12)))
+            pygame.draw.rect(self.screen, self.assets.get_color('wood_dark'), bar)
+            pygame.draw.rect(self.screen, self.assets.get_color('magic_gold'),
+                             (bar.x, bar.y, int(bar.width * progress), bar.height))
+            pygame.display.flip()
+            self.report_first_frame()
+            
+            if self.assets.is_loaded(self.assets.MENU_ASSETS):
+                return
+            self.clock.tick(60)
     
     def run(self):
+        if not self.assets.is_loaded(self.assets.MENU_ASSETS):
+            self.show_loading_screen()
+        
         while True:
             if not self.game_active:
                 if self.menu.run():
@@ -98,77 +223,307 @@ class Game:
             else:
                 self._run_game()
             
-            self.clock.tick(60)
+            # Menus animate per frame, so only gameplay uses the render rate
+            self.clock.tick(self.settings.render_fps if self.game_active else 60)
+
+    def _run_game(self, render=True, elapsed=None):
+        """Handle events, run the simulation steps that are due and draw one frame
 
-    def _run_game(self):
+        elapsed overrides the real time since the last frame, in seconds.
+        """
+        timer = self.frame_timer
+        timer.begin_frame('game')
+        self.assets.quality.begin_frame()
+        
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                if self.input_recorder and self.input_recorder.active:
+                    self.input_recorder.stop()
+                self.settings.flush()
                 pygame.quit()
                 sys.exit()
+            elif timer.handle_event(event):
+                pass
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
+                if self.input_recorder and self.input_recorder.press(event.key):
+                    pass  # Applied at the next simulation step, as a replay would
+                elif event.key == pygame.K_ESCAPE:
                     self.game_active = False
                 elif event.key == self.settings.spell_hotkey:
                     self.player.cast_spell()
                 elif event.key == pygame.K_p:  # P for pause/settings
                     self.settings.show_settings = True
+        timer.mark('events')
+        
+        for _ in range(self.timestep.advance(elapsed)):
+            self.step_simulation()
+        
+        # Leaving the game ends the recorded session
+        if not self.game_active and self.input_recorder and self.input_recorder.active:
+            self.input_recorder.stop()
+
+        # Draw, interpolated between the last two simulation steps
+        if render:
+            self.draw_game(self.timestep.alpha)
+            timer.set_counter('particles', len(self.assets.particles))
+            timer.set_counter('spells', len(self.player.spells))
+            timer.set_counter('enemies', len(self.enemies))
+            timer.set_counter('quality', self.assets.quality.tier['name'])
+            overlay_rect = timer.draw_overlay(self.screen)
+            timer.mark('draw')
+            self.present(overlay_rect)
+            timer.mark('flip')
+        
+        self.assets.quality.end_frame()
+        timer.end_frame()
 
+    def step_simulation(self):
+        """Advance the game world by one fixed timestep"""
+        timer = self.frame_timer
+        if self.before_step:
+            self.before_step(self)
+        
         # Update stars
         for star in self.stars:
             star['x'] -= star['speed']
             if star['x'] < 0:
                 star['x'] = self.settings.window_width
                 star['y'] = random.randint(0, self.settings.window_height)
+        timer.mark('stars')
         
         # Update particles
         self.assets.update_particles()
+        timer.mark('particles')
         
         # Update player
-        self.player.update(self.platforms)
-
-        # Draw
-        self.draw_game()
-        pygame.display.flip()
-
-    def draw_game(self):
-        # Draw background
-        background = self.assets.get_image('background')
-        if background:
-            self.screen.blit(background, (0, 0))
+        self.player.update(self.platforms, self.input_keys, self.get_platform_index())
+        timer.mark('player')
+        
+        # Move enemies and resolve spell hits and contact damage
+        self.enemies.update(self.player)
+        timer.mark('enemies')
+        
+        self.stream_level()
+        timer.mark('level')
+        self.step_count += 1
+    
+    def draw_game(self, alpha=1.0):
+        # Center the view on where the player is drawn this frame
+        self.camera.resize(*self.screen.get_size())
+        player_x, player_y = self.player.get_draw_position(alpha)
+        self.camera.follow(player_x + self.player.width // 2, player_y + self.player.height // 2)
+        offset = self.camera.offset
+        
+        # Draw the cached background and platforms
+        self.update_static_layers()
+        dirty = self.use_dirty_rects()
+        if dirty and self.dirty_rects.restore(self.screen, self.static_layer):
+            # Only the areas drawn over last frame need the background back
+            pass
+        elif self.static_layer:
+            self.screen.blit(self.static_layer, (0, 0))
         else:
             self.screen.fill(self.assets.get_color('background'))
             
-            # Draw stars
-            for star in self.stars:
+            # Draw stars, fewer of them at reduced quality
+            shown = int(len(self.stars) * self.assets.quality.tier['star_fraction'])
+            for star in itertools.islice(self.stars, shown):
                 brightness = 100 + int(155 * star['size'] / 3)
                 color = (brightness, brightness, brightness)
-                pygame.draw.circle(self.screen, color, (int(star['x']), int(star['y'])), int(star['size']))
-        
-        # Draw platforms
-        for platform in self.platforms:
-            pygame.draw.rect(self.screen, platform['color'], platform['rect'])
-            # Add wood texture
-            if platform['texture'] == 'wood':
-                for i in range(0, platform['rect'].width, 20):
-                    pygame.draw.line(self.screen, self.assets.get_color('wood_accent'), 
-                                  (platform['rect'].left + i, platform['rect'].top),
-                                  (platform['rect'].left + i, platform['rect'].bottom), 2)
-                
-                # Add some detail
-                for i in range(max(1, platform['rect'].width // 100)):
-                    x = platform['rect'].left + random.randint(10, platform['rect'].width - 10)
-                    y = platform['rect'].top + random.randint(2, platform['rect'].height - 2)
-                    size = random.randint(2, 4)
-                    pygame.draw.circle(self.screen, self.assets.get_color('wood_light'), (x, y), size)
-        
-        # Draw player
-        self.player.draw(self.screen)
+                x = star['x'] + star['speed'] * (1 - alpha)
+                pygame.draw.circle(self.screen, color, (int(x), int(star['y'])), int(star['size']))
+            
+            # Platforms go over the moving stars
+            self.draw_platform_tiles(self.screen)
+        
+        # Draw enemies, then the player over them
+        self.enemies.draw(self.screen, alpha, offset)
+        self.player.draw(self.screen, alpha, offset)
         
         # Draw particles
-        self.assets.draw_particles(self.screen)
+        self.assets.draw_particles(self.screen, alpha, offset)
         
         # Draw player health
-        self.draw_health()
+        health_rect = self.draw_health()
+        
+        if dirty:
+            self.dirty_rects.add_all(self.enemies.dirty_rects(alpha, offset))
+            self.dirty_rects.add_all(self.player.get_dirty_rects(alpha, offset))
+            self.dirty_rects.add_all(self.assets.particles.dirty_rects(alpha=alpha, offset=offset))
+            self.dirty_rects.add(health_rect)
+    
+    def use_dirty_rects(self):
+        # Dirty rects need a static background; scrolling stars change every pixel
+        return self.settings.dirty_rect_rendering and self.static_layer is not None
+    
+    def present(self, overlay_rect=None):
+        """Show the drawn frame, updating only the dirty areas when enabled"""
+        if self.use_dirty_rects():
+            self.dirty_rects.add(overlay_rect)
+            self.dirty_rects.present(self.screen)
+            self.frame_timer.set_counter('dirty px', self.dirty_rects.last_dirty_area)
+        else:
+            pygame.display.flip()
+    
+    def get_platform_index(self):
+        key = (self.platforms_version, len(self.platforms))
+        if key != self.platform_index_key:
+            self.platform_index = SpatialHash.from_platforms(self.platforms)
+            self.platform_index_key = key
+        return self.platform_index
+    
+    def update_static_layers(self):
+        """Keep the cached scene in step with the platforms, window size and camera position
+
+        New platforms or a new window size rebuild the whole scene. When only
+        the camera moved, just the platform tiles move: the background is
+        put back where they were and they are drawn where they are now.
+        """
+        platforms_key = (self.platforms_version, len(self.platforms))
+        if platforms_key != self.platform_tiles_key:
+            self.platform_tiles = {}
+            self.platform_tile_areas = {}
+            self.platform_tiles_key = platforms_key
+        
+        size = self.screen.get_size()
+        key = (platforms_key, size)
+        if key == self.static_layer_key:
+            if self.static_layer and self.camera.offset != self.static_layer_offset:
+                self.scroll_static_layer()
+            return
+        self.static_layer_key = key
+        self.static_layer_offset = self.camera.offset
+        
+        # With a background image, the whole static scene is a single surface
+        background = self.assets.get_image('background')
+        if background:
+            if self.static_layer is None or self.static_layer.get_size() != size:
+                self.background_layer = pygame.Surface(size).convert()
+                self.static_layer = pygame.Surface(size).convert()
+            # The image is made for 800x600; tile it to cover larger windows
+            width, height = background.get_size()
+            self.background_layer.blits([(background, (x, y))
+                                         for x in range(0, size[0], width)
+                                         for y in range(0, size[1], height)], doreturn=False)
+            self.static_layer.blit(self.background_layer, (0, 0))
+            self.draw_platform_tiles(self.static_layer)
+        else:
+            self.background_layer = self.static_layer = None
+        self.dirty_rects.invalidate()
+    
+    def scroll_static_layer(self):
+        """Move the platform tiles on the cached scene to the current camera position
+
+        Only the drawn areas of each tile are touched, and each area that
+        moved is repainted on screen as one rect covering where it was and is now.
+        """
+        old_tiles = self.visible_platform_tiles(pygame.Rect(self.static_layer_offset, self.screen.get_size()))
+        new_tiles = self.visible_platform_tiles(self.camera.view_rect)
+        areas = self.platform_tile_areas
+        old_rects = {key: [area.move(position) for area in areas[key]]
+                     for key, (tile, position) in old_tiles.items()}
+        new_rects = {key: [area.move(position) for area in areas[key]]
+                     for key, (tile, position) in new_tiles.items()}
+        
+        self.static_layer.blits([(self.background_layer, rect, rect)
+                                 for rects in old_rects.values() for rect in rects], doreturn=False)
+        self.static_layer.blits(list(new_tiles.values()), doreturn=False)
+        self.static_layer_offset = self.camera.offset
+        
+        if self.use_dirty_rects():
+            changed = []
+            for key in old_rects.keys() | new_rects.keys():
+                if key in old_rects and key in new_rects:
+                    changed += [old.union(new) for old, new in zip(old_rects[key], new_rects[key])]
+                else:
+                    changed += old_rects.get(key) or new_rects[key]
+            self.dirty_rects.repaint(changed)
+    
+    def draw_platform_tiles(self, surface):
+        """Blit the cached platform tiles that overlap the camera view"""
+        surface.blits(list(self.visible_platform_tiles(self.camera.view_rect).values()), doreturn=False)
+    
+    def visible_platform_tiles(self, view):
+        """(tile, screen position) for each non-empty platform tile overlapping a view of the level
+
+        Keyed by tile position.
+        """
+        tile_size = self.PLATFORM_TILE_SIZE
+        tiles = {}
+        for tile_x in range(view.left // tile_size, (view.right - 1) // tile_size + 1):
+            for tile_y in range(view.top // tile_size, (view.bottom - 1) // tile_size + 1):
+                tile = self.get_platform_tile(tile_x, tile_y)
+                if tile:
+                    tiles[tile_x, tile_y] = (tile, (tile_x * tile_size - view.x, tile_y * tile_size - view.y))
+        return tiles
+    
+    def get_platform_tile(self, tile_x, tile_y):
+        """Platforms and decorations within one tile, drawn on a transparent surface
+
+        Returns None for empty tiles so they can be skipped. The areas drawn
+        on, in tile coordinates, go in platform_tile_areas.
+        """
+        key = (tile_x, tile_y)
+        if key in self.platform_tiles:
+            return self.platform_tiles[key]
+        
+        tile_size = self.PLATFORM_TILE_SIZE
+        area = pygame.Rect(tile_x * tile_size, tile_y * tile_size, tile_size, tile_size)
+        platforms = [platform for platform in self.get_platform_index().query(area)
+                     if area.colliderect(platform['rect'])]
+        decorations = [decoration for decoration in self.level.decorations
+                       if area.colliderect(self.get_decoration_rect(decoration))]
+        
+        tile = None
+        if decorations:
+            # Decoration images have soft edges, which a colorkey cannot keep
+            tile = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA).convert_alpha()
+            tile.fill((0, 0, 0, 0))
+        elif platforms:
+            tile = pygame.Surface((tile_size, tile_size)).convert()
+            tile.fill(self.LAYER_COLORKEY)
+            tile.set_colorkey(self.LAYER_COLORKEY)
+        if tile:
+            for platform in platforms:
+                self.draw_platform(tile, platform, (-area.x, -area.y))
+            for decoration in decorations:
+                self.draw_decoration(tile, decoration, (-area.x, -area.y))
+            
+            # Knots can poke out of a platform by a few pixels
+            drawn = ([platform['rect'].inflate(8, 8) for platform in platforms] +
+                     [self.get_decoration_rect(decoration) for decoration in decorations])
+            self.platform_tile_areas[key] = [rect.clip(area).move(-area.x, -area.y) for rect in drawn]
+        self.platform_tiles[key] = tile
+        return tile
+    
+    def draw_platform(self, surface, platform, offset=(0, 0)):
+        world_rect = platform['rect']
+        rect = world_rect.move(offset)
+        pygame.draw.rect(surface, platform['color'], rect)
+        # Add wood texture
+        if platform['texture'] == 'wood':
+            for i in range(0, rect.width, 20):
+                pygame.draw.line(surface, self.assets.get_color('wood_accent'), 
+                              (rect.left + i, rect.top),
+                              (rect.left + i, rect.bottom), 2)
+            
+            # Add some knots, seeded by the platform so they stay put
+            rng = random.Random(f"{world_rect.x},{world_rect.y},{world_rect.width},{world_rect.height}")
+            for i in range(max(1, rect.width // 100)):
+                x = rect.left + rng.randint(10, rect.width - 10)
+                y = rect.top + rng.randint(2, rect.height - 2)
+                size = rng.randint(2, 4)
+                pygame.draw.circle(surface, self.assets.get_color('wood_light'), (x, y), size)
+    
+    def get_decoration_rect(self, decoration):
+        image = self.assets.get_image(decoration['image'])
+        size = image.get_size() if image else (0, 0)
+        return pygame.Rect(decoration['pos'], size)
+    
+    def draw_decoration(self, surface, decoration, offset=(0, 0)):
+        image = self.assets.get_image(decoration['image'])
+        if image:
+            surface.blit(image, (decoration['pos'][0] + offset[0], decoration['pos'][1] + offset[1]))
     
     def draw_health(self):
         """Draw the player's health bar"""
@@ -197,13 +552,72 @@ class Game:
         # Text
         health_text = f"Health: {self.player.health}/{self.player.max_health}"
         health_font = self.assets.get_font('text')
-        text_surface = health_font.render(health_text, True, (255, 255, 255))
-        self.screen.blit(text_surface, (bar_x + 10, bar_y + bar_height // 2 - text_surface.get_height() // 2))
+        text_surface = self.assets.render_text(health_font, health_text, (255, 255, 255))
+        text_pos = (bar_x + 10, bar_y + bar_height // 2 - text_surface.get_height() // 2)
+        self.screen.blit(text_surface, text_pos)
+        
+        return pygame.Rect(bar_x, bar_y, bar_width, bar_height).union(text_surface.get_rect(topleft=text_pos))
 
     def start_game(self):
+        # Gameplay needs every asset, normally loaded long before this
+        self.assets.finish_loading()
+        
+        # The window may have been resized in the settings menu since the last game
+        if self.level_window_size != (self.settings.window_width, self.settings.window_height):
+            self.load_level(self.level_path())
+        
         self.game_active = True
+        if self.input_recorder:
+            self.input_recorder.start(self)
         self.player = Player(self)
+        self.player.place(*self.level.spawn)
+        self.enemies.clear()
+        for enemy in self.level.enemies:
+            self.enemies.spawn(*enemy)
+        self.camera.set_world(self.level.width, self.level.height)
+        
+        # The menu or customization screen owned the display until now
+        self.dirty_rects.invalidate()
+        self.timestep.reset()
+        self.step_count = 0
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Wizard Quest")
+    parser.add_argument('--headless', action='store_true',
+                        help="run a scripted simulation without a window and print timings")
+    parser.add_argument('--frames', type=int, default=600,
+                        help="number of frames to simulate in headless mode")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="random seed for headless mode")
+    parser.add_argument('--no-render', action='store_true',
+                        help="skip drawing in headless mode")
+    parser.add_argument('--render-fps', type=int, default=None,
+                        help="simulated render rate in headless mode (default: one step per frame)")
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help="present only changed screen areas in headless mode")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="print how long each launch phase takes up to the first frame")
+    parser.add_argument('--record', metavar='FILE',
+                        help="record the input of each game session to FILE, numbering later sessions")
+    parser.add_argument('--replay', metavar='FILE',
+                        help="replay a recorded session headless and check the final player state")
+    return parser.parse_args()
 
 if __name__ == '__main__':
-    game = Game()
-    game.run() 
\ No newline at end of file
+    args = parse_args()
+    if args.replay:
+        import replay
+        sys.exit(0 if replay.run_replay(args.replay) else 1)
+    elif args.headless:
+        import headless
+        headless.run_headless(args.frames, args.seed, render=not args.no_render,
+                              dirty_rects=args.dirty_rects, render_fps=args.render_fps)
+    else:
+        profile = StartupProfile(LAUNCH_TIME)
+        profile.enabled = args.profile_startup
+        profile.mark('imports')
+        game = Game(background_loading=True, startup_profile=profile)
+        if args.record:
+            from replay import InputRecorder
+            game.input_recorder = InputRecorder(args.record)
+        game.run() 
\ No newline at end of file
@@ -76,13 +76,21 @@ class Menu:
         )
     
     def run(self):
+        timer = self.game.frame_timer
         while True:
             self.frame += 1
+            timer.begin_frame('menu')
+            self.assets.quality.begin_frame()
+            self.game.update_loading()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
+                    self.settings.flush()
                     pygame.quit()
                     exit()
                 
+                if timer.handle_event(event):
+                    continue
+                
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     mouse_pos = pygame.mouse.get_pos()
                     
@@ -121,8 +129,11 @@ class Menu:
                             # Create particles at button click
                             self.create_button_particles(self.back_button.centerx, self.back_button.centery)
             
+            timer.mark('events')
+            
             # Update animations
             self.update_animations()
+            timer.mark('update')
             
             # Draw
             self.draw_background()
@@ -134,8 +145,15 @@ class Menu:
             
             # Draw particles
             self.draw_particles()
+            timer.set_counter('particles', len(self.particles))
+            timer.draw_overlay(self.screen)
+            timer.mark('draw')
             
             pygame.display.flip()
+            self.game.report_first_frame()
+            timer.mark('flip')
+            self.assets.quality.end_frame()
+            timer.end_frame()
     
     def create_button_particles(self, x, y):
         # Get gold color for particles
@@ -144,7 +162,7 @@ class Menu:
         if not isinstance(gold_color, tuple):
             gold_color = (255, 215, 0)  # Default gold
         
-        for _ in range(20):
+        for _ in range(int(20 * self.assets.quality.tier['particle_scale'])):
             angle = random.uniform(0, 2 * 3.14159)
             speed = random.uniform(0.5, 3)
             size = random.uniform(1, 3)
@@ -185,8 +203,9 @@ class Menu:
             # Fallback to gradient background
             self.screen.fill(self.assets.get_color('background'))
             
-            # Draw animated stars
-            for star in self.stars:
+            # Draw animated stars, fewer of them at reduced quality
+            shown = int(len(self.stars) * self.assets.quality.tier['star_fraction'])
+            for star in self.stars[:shown]:
                 size = star['size'] * (0.7 + 0.3 * math.sin(star['pulse']))
                 brightness = 150 + int(105 * math.sin(star['pulse']))
                 color = (brightness, brightness, brightness)
@@ -220,14 +239,13 @@ class Menu:
         
         # Glowing outline
         for offset in range(3, 0, -1):
-            title_shadow = self.assets.get_font('title').render("Wizard Quest", True, self.assets.get_color('magic_purple'))
-            shadow_rect = title_shadow.get_rect(center=(self.settings.window_width//2 + offset, title_y + offset + title_offset))
             alpha = 100 - offset * 30
-            title_shadow.set_alpha(alpha)
+            title_shadow = self.assets.render_text('title', "Wizard Quest", self.assets.get_color('magic_purple'), alpha=alpha)
+            shadow_rect = title_shadow.get_rect(center=(self.settings.window_width//2 + offset, title_y + offset + title_offset))
             self.screen.blit(title_shadow, shadow_rect)
         
         # Main title
-        title = self.assets.get_font('title').render("Wizard Quest", True, self.assets.get_color('magic_blue'))
+        title = self.assets.render_text('title', "Wizard Quest", self.assets.get_color('magic_blue'))
         title_rect = title.get_rect(center=(self.settings.window_width//2, title_y + title_offset))
         self.screen.blit(title, title_rect)
         
@@ -262,7 +280,7 @@ class Menu:
             pygame.draw.rect(self.screen, self.assets.get_color('wood_dark'), self.start_button)
             pygame.draw.rect(self.screen, self.assets.get_color('wood_light'), self.start_button, 2)
         
-        start_text = self.assets.get_font('button').render("Start Game", True, self.assets.get_color('text_light'))
+        start_text = self.assets.render_text('button', "Start Game", self.assets.get_color('text_light'))
         self.screen.blit(start_text, (self.start_button.centerx - start_text.get_width()//2,
                                     self.start_button.centery - start_text.get_height()//2))
         
@@ -283,13 +301,13 @@ class Menu:
             pygame.draw.rect(self.screen, self.assets.get_color('wood_dark'), self.settings_button)
             pygame.draw.rect(self.screen, self.assets.get_color('wood_light'), self.settings_button, 2)
         
-        settings_text = self.assets.get_font('button').render("Settings", True, self.assets.get_color('text_light'))
+        settings_text = self.assets.render_text('button', "Settings", self.assets.get_color('text_light'))
         self.screen.blit(settings_text, (self.settings_button.centerx - settings_text.get_width()//2,
                                        self.settings_button.centery - settings_text.get_height()//2))
     
     def draw_settings_menu(self):
         # Draw title
-        title = self.assets.get_font('title').render("Settings", True, self.assets.get_color('text_light'))
+        title = self.assets.render_text('title', "Settings", self.assets.get_color('text_light'))
         title_rect = title.get_rect(center=(self.settings.window_width//2, self.settings.window_height//4))
         self.screen.blit(title, title_rect)
         
@@ -317,7 +335,7 @@ class Menu:
         volume_indicator = pygame.Rect(volume_pos - 5, self.volume_slider.y - 5, 10, 20)
         pygame.draw.rect(self.screen, self.assets.get_color('magic_gold'), volume_indicator)
         
-        volume_text = self.assets.get_font('button').render(f"Music Volume: {int(self.settings.music_volume * 100)}%", True, self.assets.get_color('text_light'))
+        volume_text = self.assets.render_text('button', f"Music Volume: {int(self.settings.music_volume * 100)}%", self.assets.get_color('text_light'))
         self.screen.blit(volume_text, (self.volume_slider.x, self.volume_slider.y - 30))
         
         # Draw buttons with hover effects
@@ -336,7 +354,7 @@ class Menu:
             pygame.draw.rect(self.screen, self.assets.get_color('wood_dark'), self.window_size_button)
             pygame.draw.rect(self.screen, self.assets.get_color('wood_light'), self.window_size_button, 2)
         
-        size_text = self.assets.get_font('button').render(f"Window Size: {self.settings.window_width}x{self.settings.window_height}", True, self.assets.get_color('text_light'))
+        size_text = self.assets.render_text('button', f"Window Size: {self.settings.window_width}x{self.settings.window_height}", self.assets.get_color('text_light'))
         self.screen.blit(size_text, (self.window_size_button.centerx - size_text.get_width()//2,
                                    self.window_size_button.centery - size_text.get_height()//2))
         
@@ -352,6 +370,6 @@ class Menu:
             pygame.draw.rect(self.screen, self.assets.get_color('wood_dark'), self.back_button)
             pygame.draw.rect(self.screen, self.assets.get_color('wood_light'), self.back_button, 2)
         
-        back_text = self.assets.get_font('button').render("Back", True, self.assets.get_color('text_light'))
+        back_text = self.assets.render_text('button', "Back", self.assets.get_color('text_light'))
         self.screen.blit(back_text, (self.back_button.centerx - back_text.get_width()//2,
                                    self.back_button.centery - back_text.get_height()//2)) 
\ No newline at end of file
@@ -0,0 +1,84 @@
+import math
+import array
+import time
+import numpy as np
+
+SAMPLE_RATE = 44100  # CD quality
+DURATION = 10.0      # 10 seconds loop
+AMPLITUDE = 32767    # Max amplitude for 16-bit audio
+FADE_SAMPLES = 1000  # Envelope length to avoid pops/clicks
+
+# Simple melody in C major: C(261.63), D(293.66), E(329.63), F(349.23), G(392.00), A(440.00), B(493.88)
+MELODY = [261.63, 329.63, 392.00, 440.00, 392.00, 329.63, 261.63, 0,  # Simple ascending/descending pattern
+          293.66, 349.23, 440.00, 493.88, 440.00, 349.23, 293.66, 0]  # Another pattern
+
+def total_samples(sample_rate=SAMPLE_RATE, duration=DURATION):
+    return int(sample_rate * duration)
+
+def synthesize_note(note_freq, note_samples, sample_rate=SAMPLE_RATE, amplitude=AMPLITUDE):
+    """Return one enveloped sine note (or silence for 0 Hz) as an int16 buffer"""
+    if note_freq == 0:
+        return np.zeros(note_samples, dtype=np.int16)
+
+    i = np.arange(note_samples, dtype=np.float64)
+
+    # Linear fade in and fade out, flat in between
+    env = np.ones(note_samples, dtype=np.float64)
+    fade_in = min(FADE_SAMPLES, note_samples)
+    env[:fade_in] = i[:fade_in] / FADE_SAMPLES
+    fade_out_start = max(note_samples - FADE_SAMPLES + 1, fade_in)
+    env[fade_out_start:] = (note_samples - i[fade_out_start:]) / FADE_SAMPLES
+
+    t = i / sample_rate
+    samples = amplitude * env * np.sin(2 * math.pi * note_freq * t)
+    return np.trunc(samples).astype(np.int16)
+
+def melody_chunks(notes=MELODY, sample_rate=SAMPLE_RATE, duration=DURATION):
+    """Yield the melody note by note as little-endian 16-bit PCM bytes"""
+    note_samples = int(duration / len(notes) * sample_rate)
+    for note_freq in notes:
+        yield synthesize_note(note_freq, note_samples, sample_rate).astype('<i2').tobytes()
+
+def synthesize_melody_loop(notes=MELODY, sample_rate=SAMPLE_RATE, duration=DURATION):
+    """Original per-sample synthesis, kept as the reference for comparisons"""
+    data = array.array('h')
+    note_duration = duration / len(notes)
+
+    for note_freq in notes:
+        note_samples = int(note_duration * sample_rate)
+
+        if note_freq == 0:
+            for i in range(note_samples):
+                data.append(0)
+        else:
+            for i in range(note_samples):
+                if i < 1000:  # fade in
+                    env = i / 1000.0
+                elif i > note_samples - 1000:  # fade out
+                    env = (note_samples - i) / 1000.0
+                else:
+                    env = 1.0
+
+                t = float(i) / sample_rate  # time in seconds
+                sample = int(AMPLITUDE * env * math.sin(2 * math.pi * note_freq * t))
+                data.append(sample)
+
+    return data
+
+def compare_with_loop():
+    """Time the per-sample loop against the buffered synthesis and check they match"""
+    start = time.perf_counter()
+    reference = np.frombuffer(synthesize_melody_loop().tobytes(), dtype=np.int16)
+    loop_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    buffered = np.frombuffer(b''.join(melody_chunks()), dtype='<i2')
+    buffered_ms = (time.perf_counter() - start) * 1000
+
+    max_difference = int(np.abs(reference.astype(np.int32) - buffered.astype(np.int32)).max())
+    print(f"Per-sample loop: {loop_ms:.1f} ms")
+    print(f"Buffered synthesis: {buffered_ms:.1f} ms ({loop_ms / buffered_ms:.0f}x faster)")
+    print(f"Samples: {len(reference)} vs {len(buffered)}, max difference: {max_difference}")
+
+if __name__ == '__main__':
+    compare_with_loop()
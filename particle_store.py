@@ -0,0 +1,235 @@
+import pygame
+import numpy as np
+
+class ParticleStore:
+    """Particle storage kept as preallocated NumPy arrays (struct of arrays)"""
+
+    # Fade stages used by draw as (base weight, white weight):
+    # original color, then blended 30% and 70% toward white
+    FADE_BLENDS = ((1.0, 0.0), (0.7, 0.3), (0.3, 0.7))
+
+    def __init__(self, capacity=65536):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np.random.default_rng()
+
+        # Particle attributes, one slot per particle
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.dx = np.zeros(capacity, dtype=np.float32)
+        self.dy = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.max_lifetime = np.ones(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.color_index = np.zeros(capacity, dtype=np.int32)
+
+        # Palette of base colors referenced by color_index
+        self.palette = []
+        self.palette_lookup = {}
+
+        # Circle pixel offsets keyed by radius, and pre-rendered circle stamps
+        # keyed by (shade index, radius) for surfaces that cannot be locked
+        self.circle_offsets = {}
+        self.stamps = {}
+
+    def __len__(self):
+        return self.count
+
+    def seed(self, seed):
+        """Reseed the random generator used for particle emission"""
+        self.rng = np.random.default_rng(seed)
+
+    def clear(self):
+        self.count = 0
+
+    def get_color_index(self, color):
+        """Return the palette index for an RGB color, registering it if new"""
+        index = self.palette_lookup.get(color)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(color)
+            self.palette_lookup[color] = index
+        return index
+
+    def emit(self, x, y, color, count, speed, size, lifetime):
+        """Add a burst of particles moving outward in random directions"""
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return
+
+        start = self.count
+        end = start + count
+
+        angle = self.rng.uniform(0, 2 * np.pi, count)
+        speed_val = self.rng.uniform(0.5, speed, count)
+        lifetime_val = self.rng.integers(lifetime // 2, lifetime, count, endpoint=True)
+
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.dx[start:end] = speed_val * np.cos(angle)
+        self.dy[start:end] = speed_val * np.sin(angle)
+        self.lifetime[start:end] = lifetime_val
+        self.max_lifetime[start:end] = np.maximum(lifetime_val, 1)
+        self.size[start:end] = self.rng.integers(1, size, count, endpoint=True)
+        self.color_index[start:end] = self.get_color_index(color)
+
+        self.count = end
+
+    def update(self):
+        """Move all particles one frame and compact the dead ones away"""
+        n = self.count
+        if n == 0:
+            return
+
+        self.x[:n] += self.dx[:n]
+        self.y[:n] += self.dy[:n]
+        self.lifetime[:n] -= 1
+
+        alive = self.lifetime[:n] > 0
+        if alive.all():
+            return
+
+        # Single compaction pass keeping survivors in their original order
+        keep = np.flatnonzero(alive)
+        k = len(keep)
+        for array in (self.x, self.y, self.dx, self.dy, self.lifetime,
+                      self.max_lifetime, self.size, self.color_index):
+            array[:k] = array[keep]
+        self.count = k
+
+    def positions(self, alpha=1.0):
+        """Particle positions interpolated by alpha between the last two updates"""
+        n = self.count
+        if alpha >= 1.0:
+            return self.x[:n], self.y[:n]
+        back = 1.0 - alpha
+        return self.x[:n] - self.dx[:n] * back, self.y[:n] - self.dy[:n] * back
+
+    def draw(self, surface, alpha=1.0, offset=(0, 0)):
+        """Draw every live particle that touches the surface as a filled circle
+
+        offset is the camera position subtracted from particle positions.
+        """
+        n = self.count
+        if n == 0:
+            return
+
+        fade_ratio = self.lifetime[:n] / self.max_lifetime[:n]
+        stage = np.where(fade_ratio > 0.7, 0, np.where(fade_ratio > 0.4, 1, 2))
+        radius = np.maximum(1, (self.size[:n] * fade_ratio).astype(np.int32))
+        shade = self.color_index[:n] * 3 + stage
+        x, y = self.positions(alpha)
+        cx = (x - offset[0]).astype(np.int32)
+        cy = (y - offset[1]).astype(np.int32)
+
+        # Cull particles whose circles lie entirely outside the clip area
+        clip = surface.get_clip()
+        visible = ((cx + radius >= clip.left) & (cx - radius < clip.right) &
+                   (cy + radius >= clip.top) & (cy - radius < clip.bottom))
+        if not visible.all():
+            cx, cy, radius, shade = cx[visible], cy[visible], radius[visible], shade[visible]
+            if len(cx) == 0:
+                return
+
+        # Write circle pixels straight into the surface where the pixel
+        # format allows it, otherwise fall back to one blit per particle
+        if surface.get_bytesize() in (1, 2, 4):
+            self._draw_pixels(surface, cx, cy, radius, shade)
+        else:
+            self._draw_stamps(surface, cx, cy, radius, shade)
+
+    def dirty_rects(self, tile_size=32, alpha=1.0, offset=(0, 0)):
+        """Screen rects covering every live particle, one per occupied tile"""
+        n = self.count
+        if n == 0:
+            return []
+
+        # Circles never extend further than the particle size from the center
+        margin = int(self.size[:n].max()) + 1
+        x, y = self.positions(alpha)
+        tx = np.floor_divide(x - offset[0], tile_size).astype(np.int32)
+        ty = np.floor_divide(y - offset[1], tile_size).astype(np.int32)
+        tiles = np.unique(np.stack((tx, ty), axis=1), axis=0)
+
+        span = tile_size + margin * 2
+        return [pygame.Rect(tile_x * tile_size - margin, tile_y * tile_size - margin, span, span)
+                for tile_x, tile_y in tiles.tolist()]
+
+    def _draw_pixels(self, surface, cx, cy, radius, shade):
+        bytesize = surface.get_bytesize()
+        pixel_type = {1: np.uint8, 2: np.uint16, 4: np.uint32}[bytesize]
+        mapped = np.array([surface.map_rgb(color) for color in self._get_shade_colors()],
+                          dtype=pixel_type)
+        row_length = surface.get_pitch() // bytesize
+        width, height = surface.get_size()
+        clip = surface.get_clip()
+        left, right = max(clip.left, 0), min(clip.right, width)
+        top, bottom = max(clip.top, 0), min(clip.bottom, height)
+
+        # Flat view of the locked pixel rows (including any pitch padding)
+        buffer = surface.get_buffer()
+        pixels = np.frombuffer(buffer, dtype=pixel_type)
+        for r in np.unique(radius).tolist():
+            selected = radius == r
+            offset_x, offset_y = self._get_circle_offsets(r)
+            px = (cx[selected, None] + offset_x).ravel()
+            py = (cy[selected, None] + offset_y).ravel()
+            colors = np.repeat(mapped[shade[selected]], len(offset_x))
+
+            inside = (px >= left) & (px < right) & (py >= top) & (py < bottom)
+            pixels[py[inside] * row_length + px[inside]] = colors[inside]
+        del pixels
+        del buffer
+
+    def _draw_stamps(self, surface, cx, cy, radius, shade):
+        stamps = {}
+        keys = (shade * 1024 + radius).tolist()
+        for key in set(keys):
+            shade_index, r = divmod(key, 1024)
+            stamps[key] = self._get_stamp(shade_index, r)
+
+        left = (cx - radius).tolist()
+        top = (cy - radius).tolist()
+        surface.blits(zip(map(stamps.__getitem__, keys), zip(left, top)), doreturn=False)
+
+    def _get_shade_colors(self):
+        """Return the drawn color for every (palette color, fade stage) pair"""
+        colors = []
+        for base_color in self.palette:
+            for base_weight, white_weight in self.FADE_BLENDS:
+                colors.append((
+                    int(base_color[0] * base_weight + 255 * white_weight),
+                    int(base_color[1] * base_weight + 255 * white_weight),
+                    int(base_color[2] * base_weight + 255 * white_weight)
+                ))
+        return colors
+
+    def _get_circle_offsets(self, radius):
+        """Pixel offsets, relative to the center, covered by pygame.draw.circle"""
+        offsets = self.circle_offsets.get(radius)
+        if offsets is None:
+            mask_surface = pygame.Surface((radius * 2, radius * 2), depth=8)
+            mask_surface.set_palette_at(1, (255, 255, 255))
+            mask_surface.fill(0)
+            pygame.draw.circle(mask_surface, 1, (radius, radius), radius)
+            offset_x, offset_y = np.nonzero(pygame.surfarray.array2d(mask_surface))
+            offsets = (offset_x.astype(np.int32) - radius, offset_y.astype(np.int32) - radius)
+            self.circle_offsets[radius] = offsets
+        return offsets
+
+    def _get_stamp(self, shade_index, radius):
+        key = (shade_index, radius)
+        stamp = self.stamps.get(key)
+        if stamp is None:
+            color = self._get_shade_colors()[shade_index]
+
+            # Colorkeyed stamp so only the circle pixels are copied
+            stamp = pygame.Surface((radius * 2, radius * 2))
+            colorkey = (0, 0, 0) if color != (0, 0, 0) else (255, 0, 255)
+            stamp.fill(colorkey)
+            pygame.draw.circle(stamp, color, (radius, radius), radius)
+            if pygame.display.get_surface() is not None:
+                stamp = stamp.convert()
+            stamp.set_colorkey(colorkey, pygame.RLEACCEL)
+            self.stamps[key] = stamp
+        return stamp
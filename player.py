@@ -1,6 +1,7 @@
 import pygame
 import random
 import math
+from spell_pool import SpellPool, LEFT, RIGHT
 
 class Player:
     def __init__(self, game):
@@ -37,10 +38,23 @@ class Player:
         # Create player rect
         self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
         
+        # Bounds of the level the player moves in
+        level = getattr(game, 'level', None)
+        self.world_width = level.width if level else self.settings.window_width
+        self.world_height = level.height if level else self.settings.window_height
+        
+        # Position before the last simulation step, for interpolated drawing
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
+        # Cosmetic randomness used while drawing, kept apart from the
+        # gameplay random stream so the render rate cannot change gameplay
+        self.effect_rng = random.Random(random.getrandbits(32))
+        
         # Spell properties - magic now comes directly from hands
         self.spell_cooldown = 0
         self.spell_cooldown_time = 20  # Faster without staff
-        self.spells = []
+        self.spells = SpellPool()
         
         # Load customization
         self.customization = self.settings.wizard_customization
@@ -49,6 +63,45 @@ class Player:
         self.create_player_surfaces()
     
     def create_player_surfaces(self):
+        """Look up the body and hat sprites for this customization, drawing them on first use
+        
+        The sprite variants are shared through the assets manager, keyed by
+        the customization, so restarting the game does not redraw them.
+        """
+        key = (self.width, self.height, repr(sorted(self.customization.items())))
+        sprites = self.assets.player_sprites.get(key)
+        if sprites is None:
+            self._draw_player_surfaces()
+            sprites = self.assets.player_sprites[key] = self._make_sprite_variants()
+        self.sprites = sprites
+        self.body_surface = sprites['body', 'normal', True]
+        self.hat_surface = sprites['hat', 'normal', True]
+    
+    def _make_sprite_variants(self):
+        """Normal and translucent (invulnerable) body and hat, plus a damage flash body, facing both ways
+        
+        Keyed by (part, variant, facing right). The hat does not flash.
+        """
+        sprites = {}
+        for part, surface in (('body', self.body_surface), ('hat', self.hat_surface)):
+            for facing_right in (True, False):
+                normal = surface if facing_right else pygame.transform.flip(surface, True, False)
+                
+                # Semi-transparent copy for invulnerability blinking
+                translucent = normal.copy()
+                translucent.set_alpha(150)
+                
+                sprites[part, 'normal', facing_right] = normal
+                sprites[part, 'translucent', facing_right] = translucent
+                
+                # Red tinted copy
+                if part == 'body':
+                    flash = normal.copy()
+                    flash.fill((255, 0, 0, 100), special_flags=pygame.BLEND_RGBA_ADD)
+                    sprites[part, 'flash', facing_right] = flash
+        return sprites
+    
+    def _draw_player_surfaces(self):
         # Create body surface with the customized color
         self.body_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
         
@@ -205,10 +258,7 @@ class Player:
             spark_x = hat_width // 4 + i * hat_width // 6
             spark_y = hat_height // 3 + i * hat_height // 8
             pygame.draw.circle(self.hat_surface, (255, 255, 200), (spark_x, spark_y), 1)
-        
-        # Create flipped versions
-        self.body_surface_flipped = pygame.transform.flip(self.body_surface, True, False)
-        self.hat_surface_flipped = pygame.transform.flip(self.hat_surface, True, False)
+
     
     def _lighter_shade(self, color, amount):
         """Create a lighter shade of the given color"""
@@ -226,9 +276,13 @@ class Player:
             max(0, color[2] - amount)
         )
     
-    def update(self, platforms):
-        # Handle movement
-        keys = pygame.key.get_pressed()
+    def update(self, platforms, keys=None, platform_index=None):
+        # Handle movement (keys can be supplied by scripted or replayed input)
+        if keys is None:
+            keys = pygame.key.get_pressed()
+        
+        self.prev_x = self.x
+        self.prev_y = self.y
         
         # Horizontal movement with smoother acceleration/deceleration
         if keys[pygame.K_LEFT]:
@@ -253,7 +307,7 @@ class Player:
         self.rect.x = int(self.x)
         
         # Check for horizontal collisions with platforms
-        for platform in platforms:
+        for platform in self._nearby_platforms(platforms, platform_index, prev_x, prev_y):
             platform_rect = platform['rect']
             
             # Check if colliding horizontally
@@ -269,13 +323,13 @@ class Player:
                     self.x = self.rect.x
                     self.velocity_x = 0
         
-        # Keep player within screen bounds
+        # Keep player within the level bounds
         if self.x < 0:
             self.x = 0
             self.rect.x = 0
             self.velocity_x = 0
-        elif self.x > self.settings.window_width - self.width:
-            self.x = self.settings.window_width - self.width
+        elif self.x > self.world_width - self.width:
+            self.x = self.world_width - self.width
             self.rect.x = int(self.x)
             self.velocity_x = 0
             
@@ -301,7 +355,7 @@ class Player:
         
         # Check for vertical collisions with platforms
         self.on_ground = False
-        for platform in platforms:
+        for platform in self._nearby_platforms(platforms, platform_index, self.x, prev_y):
             platform_rect = platform['rect']
             
             # Only check for vertical collision if we're within the platform's horizontal bounds
@@ -340,9 +394,9 @@ class Player:
                     self.y = self.rect.y
                     self.velocity_y = 0
         
-        # Bottom screen boundary check
-        if self.y > self.settings.window_height:
-            self.y = self.settings.window_height - self.height
+        # Bottom level boundary check
+        if self.y > self.world_height:
+            self.y = self.world_height - self.height
             self.rect.y = int(self.y)
             self.velocity_y = 0
             self.on_ground = True
@@ -370,114 +424,134 @@ class Player:
             self.damage_flash -= 1
         
         # Update spells
-        for spell in self.spells[:]:
-            # Move spell based on direction
-            if spell['direction'] == 'right':
-                spell['x'] += spell['speed']
-            else:
-                spell['x'] -= spell['speed']
-            
-            # Update lifetime
-            spell['lifetime'] -= 1
+        self.update_spells()
+    
+    def update_spells(self):
+        """Move spells and burst the ones that expired or left the level"""
+        spells = self.spells
+        slots = spells.slots
+        i = 0
+        while i < spells.count:
+            spell = slots[i]
+            spell.prev_x = spell.x
+            spell.x += spell.speed * spell.direction
+            spell.lifetime -= 1
             
-            # Remove if out of screen or lifetime ended
-            if (spell['x'] < -40 or 
-                spell['x'] > self.settings.window_width + 40 or 
-                spell['lifetime'] <= 0):
-                self.spells.remove(spell)
+            # Remove if out of the level or lifetime ended
+            if spell.x < -40 or spell.x > self.world_width + 40 or spell.lifetime <= 0:
+                # The last live spell moves into this slot and is updated next
+                spells.release(i)
                 
                 # Create explosion particles when spell expires
-                if 'color' in spell and isinstance(spell['color'], tuple) and len(spell['color']) >= 3:
-                    spell_color = spell['color'][:3]
-                else:
-                    spell_color = (150, 100, 250)
-                    
                 self.assets.create_particles(
-                    spell['x'], 
-                    spell['y'], 
-                    spell_color, 
+                    spell.x, 
+                    spell.y, 
+                    spell.color, 
                     count=20, 
                     speed=3, 
                     lifetime=20
                 )
+            else:
+                i += 1
+    
+    def place(self, x, y):
+        """Put the player at a position, at rest"""
+        self.x = self.prev_x = x
+        self.y = self.prev_y = y
+        self.rect.topleft = (int(x), int(y))
+        self.velocity_x = self.velocity_y = 0
+    
+    def _nearby_platforms(self, platforms, platform_index, from_x, from_y):
+        """Platforms that can collide while moving from (from_x, from_y) to self.rect"""
+        if platform_index is None:
+            return platforms
+        
+        # Collision pushes stay between the old and new positions and the
+        # edge tolerances are at most 5px, so the padded sweep covers every hit
+        swept = self.rect.union(pygame.Rect(int(from_x), int(from_y), self.width, self.height))
+        return platform_index.query(swept.inflate(16, 16))
+    
+    def get_draw_position(self, alpha=1.0):
+        """Position between the previous and current simulation step"""
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
+    
+    def get_spell_draw_x(self, spell, alpha=1.0):
+        return spell.prev_x + (spell.x - spell.prev_x) * alpha
+    
+    def get_spell_image(self, spell):
+        """Cached sprite for a spell's power and direction, or None for the fallback trail"""
+        if not spell.has_image:
+            return None
+        
+        # Scale effect based on power
+        scale = max(0.5, min(2.0, spell.power))
+        return self.assets.get_image_variant('magic_effect', scale, spell.direction == LEFT)
+    
+    def get_spell_rect(self, spell, spell_x):
+        """World-space area a spell draws over"""
+        image = self.get_spell_image(spell)
+        if image:
+            width, height = image.get_size()
+            return pygame.Rect(spell_x - width // 2, spell.y - height // 2, width, height)
+        # Trail of circles behind the spell
+        return pygame.Rect(spell_x - 30, spell.y - 5, 60, 10)
     
-    def draw(self, surface):
+    def draw(self, surface, alpha=1.0, offset=(0, 0)):
+        """Draw the player and spells, interpolated by alpha between simulation steps
+
+        offset is the camera position; spells outside the surface are skipped.
+        """
+        offset_x, offset_y = offset
+        draw_x, draw_y = self.get_draw_position(alpha)
+        draw_x -= offset_x
+        draw_y -= offset_y
+        view = surface.get_clip().move(offset_x, offset_y)
+        
         # Draw spells
         for spell in self.spells:
             # Calculate spell position
-            spell_x = spell['x']
-            spell_y = spell['y']
+            world_x = self.get_spell_draw_x(spell, alpha)
+            if not view.colliderect(self.get_spell_rect(spell, world_x)):
+                continue
+            spell_x = world_x - offset_x
+            spell_y = spell.y - offset_y
             
             # Create magical effect
-            if 'image' in spell and spell['image']:
-                # Scale effect based on power
-                scale = 1.0
-                if 'power' in spell:
-                    scale = max(0.5, min(2.0, spell['power']))
-                
-                orig_image = spell['image']
-                width = int(orig_image.get_width() * scale)
-                height = int(orig_image.get_height() * scale)
-                
-                image = pygame.transform.scale(orig_image, (width, height))
-                
-                # Flip based on direction
-                if spell['direction'] == 'left':
-                    image = pygame.transform.flip(image, True, False)
+            image = self.get_spell_image(spell)
+            if image:
+                width, height = image.get_size()
                 
                 # Draw at spell position
                 surface.blit(image, (spell_x - width // 2, spell_y - height // 2))
             else:
-                # Fallback to simple magical effect
-                # Get customized magic color
-                if 'color' in spell and isinstance(spell['color'], tuple) and len(spell['color']) >= 3:
-                    magic_color = spell['color'][:3]
-                else:
-                    magic_color = (150, 100, 250)
-                
-                # Create a trail of particles
+                # Fallback to simple magical effect in the spell's color
                 for i in range(5):
-                    offset_x = -i * 5 if spell['direction'] == 'right' else i * 5
-                    pygame.draw.circle(surface, magic_color, 
+                    offset_x = -i * 5 * spell.direction
+                    pygame.draw.circle(surface, spell.color, 
                                     (int(spell_x + offset_x), int(spell_y)), 
                                     5 - i)
         
         # Apply a "bobbing" effect based on animation frame
         bob_offset = math.sin(self.frame * 0.5) * 2
         
-        # Get body surface based on direction
-        body_surface = self.body_surface_flipped if not self.facing_right else self.body_surface
-        
-        # Apply damage flash effect
+        # Damage flash tints the body red, invulnerability blinks body and hat
+        blinking = self.invulnerable and self.invulnerable_timer % 6 < 3
         if self.damage_flash > 0:
-            # Create a red tinted copy of the body surface
-            flash_surface = body_surface.copy()
-            flash_surface.fill((255, 0, 0, 100), special_flags=pygame.BLEND_RGBA_ADD)
-            surface.blit(flash_surface, (self.x, self.y + bob_offset))
-        # Apply invulnerability blinking effect
-        elif self.invulnerable and self.invulnerable_timer % 6 < 3:
-            # Draw semi-transparent body for invulnerability blinking
-            body_surface.set_alpha(150)
-            surface.blit(body_surface, (self.x, self.y + bob_offset))
-            body_surface.set_alpha(255)  # Reset alpha
+            body_variant = 'flash'
+        elif blinking:
+            body_variant = 'translucent'
         else:
-            # Normal drawing
-            surface.blit(body_surface, (self.x, self.y + bob_offset))
-        
-        # Draw hat with proper positioning to match customization screen
-        hat_y = self.y - self.hat_surface.get_height() + 20 + bob_offset  # Better vertical position
-        hat_x = self.x + self.width//2 - self.hat_surface.get_width()//2  # Center hat precisely
+            body_variant = 'normal'
+        hat_variant = 'translucent' if blinking else 'normal'
         
-        # Choose hat surface based on direction
-        hat_surface = self.hat_surface_flipped if not self.facing_right else self.hat_surface
+        # Pre-rendered body for the facing direction
+        surface.blit(self.sprites['body', body_variant, self.facing_right], (draw_x, draw_y + bob_offset))
         
-        # Apply hat transparency effect when invulnerable
-        if self.invulnerable and self.invulnerable_timer % 6 < 3:
-            hat_surface.set_alpha(150)
-            surface.blit(hat_surface, (hat_x, hat_y))
-            hat_surface.set_alpha(255)  # Reset alpha
-        else:
-            surface.blit(hat_surface, (hat_x, hat_y))
+        # Draw hat with proper positioning to match customization screen
+        hat_y = draw_y - self.hat_surface.get_height() + 20 + bob_offset  # Better vertical position
+        hat_x = draw_x + self.width//2 - self.hat_surface.get_width()//2  # Center hat precisely
+        surface.blit(self.sprites['hat', hat_variant, self.facing_right], (hat_x, hat_y))
         
         # Draw magic aura when casting
         if self.spell_cooldown > self.spell_cooldown_time - 10:
@@ -488,8 +562,8 @@ class Player:
                 magic_color = (150, 100, 250)  # Default purple if invalid
             
             # Draw magical hand gesture (replacing staff)
-            hand_x = self.x + (self.width + 5 if self.facing_right else -5)
-            hand_y = self.y + 20 + bob_offset
+            hand_x = draw_x + (self.width + 5 if self.facing_right else -5)
+            hand_y = draw_y + 20 + bob_offset
             
             # Draw magic circle
             circle_radius = 8 + math.sin(self.frame * 0.2) * 2
@@ -498,13 +572,41 @@ class Player:
             
             # Draw radiating particles
             for _ in range(3):
-                angle = random.uniform(0, 2 * 3.14159)
-                dist = random.uniform(5, 30)
-                x = self.x + self.width // 2 + math.cos(angle) * dist
-                y = self.y + self.height // 2 + math.sin(angle) * dist
-                size = random.randint(1, 3)
+                angle = self.effect_rng.uniform(0, 2 * 3.14159)
+                dist = self.effect_rng.uniform(5, 30)
+                x = draw_x + self.width // 2 + math.cos(angle) * dist
+                y = draw_y + self.height // 2 + math.sin(angle) * dist
+                size = self.effect_rng.randint(1, 3)
                 pygame.draw.circle(surface, magic_color, (int(x), int(y)), size)
     
+    def get_dirty_rects(self, alpha=1.0, offset=(0, 0)):
+        """Screen rects covering everything draw() paints this frame"""
+        offset_x, offset_y = offset
+        draw_x, draw_y = self.get_draw_position(alpha)
+        draw_x -= offset_x
+        draw_y -= offset_y
+        rects = []
+        for spell in self.spells:
+            rect = self.get_spell_rect(spell, self.get_spell_draw_x(spell, alpha))
+            rects.append(rect.move(-offset_x, -offset_y).inflate(2, 2))
+
+        # Body and hat, with room for the bobbing
+        body = pygame.Rect(draw_x, draw_y - 2, self.width, self.height + 4)
+        hat_width, hat_height = self.hat_surface.get_size()
+        hat = pygame.Rect(draw_x + self.width // 2 - hat_width // 2,
+                          draw_y - hat_height + 18, hat_width, hat_height + 4)
+        body.union_ip(hat)
+
+        # Hand circle and radiating aura particles while casting
+        if self.spell_cooldown > self.spell_cooldown_time - 10:
+            center_x = draw_x + self.width // 2
+            center_y = draw_y + self.height // 2
+            body.union_ip(pygame.Rect(center_x - 34, center_y - 34, 68, 68))
+            hand_x = draw_x + (self.width + 5 if self.facing_right else -5)
+            body.union_ip(pygame.Rect(hand_x - 11, draw_y + 7, 22, 26))
+        rects.append(body.inflate(4, 4))
+        return rects
+
     def _draw_wizard_face(self, surface, x, y):
         """Draw a detailed wizard face matching the customization screen"""
         # Face
@@ -570,6 +672,21 @@ class Player:
             hand_x = self.x + (self.width if self.facing_right else 0)
             hand_y = self.y + 20
             
+            # Create a spell with magical effect, reusing a free pool slot;
+            # with every slot taken nothing is cast
+            spell = self.spells.spawn(
+                hand_x, 
+                hand_y, 
+                speed=10 * magic_power,  # Faster without staff
+                direction=RIGHT if self.facing_right else LEFT, 
+                lifetime=70, 
+                color=magic_color, 
+                power=magic_power, 
+                has_image=self.assets.get_image('magic_effect') is not None
+            )
+            if spell is None:
+                return
+            
             # Create magical particles
             particle_count = int(20 * magic_power)
             particle_speed = 4 * magic_power
@@ -584,28 +701,12 @@ class Player:
                 size=particle_size, 
                 lifetime=20
             )
-            
-            # Create a spell with magical effect
-            magic_effect = self.assets.get_image('magic_effect')
-            
-            spell = {
-                'x': hand_x,
-                'y': hand_y,
-                'speed': 10 * magic_power,  # Faster without staff
-                'direction': 'left' if not self.facing_right else 'right',
-                'angle': 0,
-                'lifetime': 70,
-                'image': magic_effect,
-                'color': magic_color,
-                'power': magic_power
-            }
-            self.spells.append(spell)
             self.spell_cooldown = self.spell_cooldown_time
     
     def take_damage(self, amount=10):
         """Take damage and become temporarily invulnerable"""
         if not self.invulnerable:
-            self.health -= amount
+            self.health = max(0, self.health - amount)
             self.invulnerable = True
             self.invulnerable_timer = 60  # 1 second at 60 fps
             self.damage_flash = 5  # Flash for 5 frames 
\ No newline at end of file
@@ -0,0 +1,79 @@
+import collections
+import time
+
+# Effect settings per tier, best first
+QUALITY_TIERS = (
+    {'name': 'high', 'particle_scale': 1.0, 'max_particles': 65536,
+     'glow': True, 'aura_layers': 15, 'star_fraction': 1.0},
+    {'name': 'medium', 'particle_scale': 0.5, 'max_particles': 4000,
+     'glow': True, 'aura_layers': 8, 'star_fraction': 0.6},
+    {'name': 'low', 'particle_scale': 0.25, 'max_particles': 1000,
+     'glow': False, 'aura_layers': 4, 'star_fraction': 0.3},
+)
+
+class QualityGovernor:
+    """Moves visual effects between quality tiers based on recent frame times
+
+    Call begin_frame() and end_frame() around the work of each frame (not
+    the clock wait). When the average over a full window misses the budget,
+    quality drops one tier; after recover_frames in a row with the average
+    under headroom * budget it goes back up one tier. Effects read the
+    current settings from `tier`.
+    """
+
+    def __init__(self, budget_ms=16.7, window=60, headroom=0.6, recover_frames=180):
+        self.enabled = True
+        self.budget_ms = budget_ms
+        self.headroom = headroom
+        self.recover_frames = recover_frames
+        self.frame_ms = collections.deque(maxlen=window)
+        self.tier_index = 0
+        self.frames_with_headroom = 0
+        self.frame_start = None
+
+    @property
+    def tier(self):
+        return QUALITY_TIERS[self.tier_index]
+
+    def reset(self):
+        """Back to the best tier with no frame history, without logging"""
+        self.tier_index = 0
+        self.frame_ms.clear()
+        self.frames_with_headroom = 0
+        self.frame_start = None
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if self.frame_start is not None:
+            self.record((time.perf_counter() - self.frame_start) * 1000)
+            self.frame_start = None
+
+    def record(self, frame_ms):
+        """Add one frame's work time and change tier if needed"""
+        if not self.enabled:
+            return
+        self.frame_ms.append(frame_ms)
+        if len(self.frame_ms) < self.frame_ms.maxlen:
+            return
+
+        average = sum(self.frame_ms) / len(self.frame_ms)
+        if average > self.budget_ms:
+            if self.tier_index < len(QUALITY_TIERS) - 1:
+                self.set_tier(self.tier_index + 1, average)
+        elif average < self.budget_ms * self.headroom and self.tier_index > 0:
+            self.frames_with_headroom += 1
+            if self.frames_with_headroom >= self.recover_frames:
+                self.set_tier(self.tier_index - 1, average)
+        else:
+            self.frames_with_headroom = 0
+
+    def set_tier(self, index, average=None):
+        old = self.tier['name']
+        self.tier_index = index
+        self.frame_ms.clear()
+        self.frames_with_headroom = 0
+
+        reason = f" (average frame {average:.1f} ms, budget {self.budget_ms:.1f} ms)" if average is not None else ""
+        print(f"Quality {old} -> {self.tier['name']}{reason}")
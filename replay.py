@@ -0,0 +1,273 @@
+import os
+import random
+import time
+import zlib
+import pygame
+
+from headless import ScriptedKeys, seed_everything, use_dummy_drivers
+
+MAGIC = b'WQIR'
+FORMAT_VERSION = 1
+
+# Bits of the per-step input mask. Held keys are sampled before every
+# simulation step; presses are KEYDOWN events since the previous step.
+HELD_KEYS = [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE]
+HELD_SPELL = 1 << 5
+HELD_ESCAPE = 1 << 6
+PRESSED_SPELL = 1 << 7
+PRESSED_ESCAPE = 1 << 8
+
+def write_varint(out, value):
+    """Append an unsigned integer, 7 bits per byte, low bits first"""
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, pos):
+    """Return (value, position after it)"""
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("truncated input recording")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def player_checksum(player):
+    """CRC of the player's simulated state and live spells"""
+    state = (
+        player.x, player.y, player.velocity_x, player.velocity_y, player.on_ground,
+        player.facing_right, player.health, player.invulnerable, player.invulnerable_timer,
+        player.spell_cooldown,
+        [(spell.x, spell.y, spell.direction, spell.lifetime) for spell in player.spells]
+    )
+    return zlib.crc32(repr(state).encode())
+
+def apply_input(game, mask, spell_hotkey):
+    """Feed one step's input mask to the game, the same way for live and replayed play"""
+    held = [key for bit, key in enumerate(HELD_KEYS) if mask & (1 << bit)]
+    if mask & HELD_SPELL:
+        held.append(spell_hotkey)
+    if mask & HELD_ESCAPE:
+        held.append(pygame.K_ESCAPE)
+    game.input_keys = ScriptedKeys(held)
+
+    if mask & PRESSED_ESCAPE:
+        game.game_active = False
+    if mask & PRESSED_SPELL:
+        game.player.cast_spell()
+
+class InputRecording:
+    """Per-step input masks of one play session, with what is needed to replay it
+
+    The file is MAGIC, a version byte, then varints: seed, spell hotkey,
+    window width and height, step count, player checksum, number of runs,
+    and for each run its length in steps and its mask XORed with the
+    previous run's. Held keys rarely change from one step to the next,
+    so a recording takes well under a byte per step.
+
+    Replays use the current level and wizard customization; a different
+    one shows up as a checksum mismatch.
+    """
+
+    def __init__(self, seed, spell_hotkey, window_size):
+        self.seed = seed
+        self.spell_hotkey = spell_hotkey
+        self.window_size = window_size
+        self.runs = []  # [mask, length] pairs
+        self.steps = 0
+        self.checksum = None
+
+    def append(self, mask):
+        if self.runs and self.runs[-1][0] == mask:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([mask, 1])
+        self.steps += 1
+
+    def masks(self):
+        for mask, length in self.runs:
+            for _ in range(length):
+                yield mask
+
+    def to_bytes(self):
+        out = bytearray(MAGIC)
+        out.append(FORMAT_VERSION)
+        for value in (self.seed, self.spell_hotkey, *self.window_size, self.steps,
+                      self.checksum or 0, len(self.runs)):
+            write_varint(out, value)
+        previous = 0
+        for mask, length in self.runs:
+            write_varint(out, length)
+            write_varint(out, mask ^ previous)
+            previous = mask
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:4] != MAGIC:
+            raise ValueError("not an input recording")
+        if data[4] != FORMAT_VERSION:
+            raise ValueError(f"unsupported input recording version {data[4]}")
+        pos = 5
+        values = []
+        for _ in range(7):
+            value, pos = read_varint(data, pos)
+            values.append(value)
+        seed, spell_hotkey, width, height, steps, checksum, run_count = values
+
+        recording = cls(seed, spell_hotkey, (width, height))
+        previous = 0
+        for _ in range(run_count):
+            length, pos = read_varint(data, pos)
+            delta, pos = read_varint(data, pos)
+            previous ^= delta
+            recording.runs.append([previous, length])
+        recording.steps = sum(length for _, length in recording.runs)
+        if recording.steps != steps:
+            raise ValueError(f"input recording has {recording.steps} steps, header says {steps}")
+        recording.checksum = checksum
+        return recording
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+class InputRecorder:
+    """Records live play into an InputRecording, written to path when the session ends
+
+    Existing files are never overwritten: when path is taken, the session
+    goes to the first free numbered name beside it, e.g. session-2.wqir.
+
+    While recording, the game takes its input from the recorded masks
+    rather than straight from the keyboard, so play and replay run exactly
+    the same code.
+    """
+
+    def __init__(self, path=None, seed=None):
+        self.path = path
+        self.seed = seed  # None picks a new random seed per session
+        self.recording = None
+        self.pressed = 0
+        self.game = None
+
+        # Where held keys come from; replaced to record scripted input
+        self.read_keys = pygame.key.get_pressed
+
+    @property
+    def active(self):
+        return self.recording is not None
+
+    def start(self, game):
+        """Seed the game and begin recording; call before the player is created"""
+        seed = self.seed
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(32)
+        seed_everything(game, seed)
+        self.recording = InputRecording(seed, game.settings.spell_hotkey,
+                                        (game.settings.window_width, game.settings.window_height))
+        self.pressed = 0
+        self.game = game
+        game.before_step = self.capture
+
+    def press(self, key):
+        """Note a KEYDOWN for the next step; returns True if the recorder handles the key"""
+        if not self.active:
+            return False
+        if key == self.recording.spell_hotkey:
+            self.pressed |= PRESSED_SPELL
+        elif key == pygame.K_ESCAPE:
+            self.pressed |= PRESSED_ESCAPE
+        else:
+            return False
+        return True
+
+    def capture(self, game):
+        keys = self.read_keys()
+        mask = self.pressed
+        for bit, key in enumerate(HELD_KEYS):
+            if keys[key]:
+                mask |= 1 << bit
+        if keys[self.recording.spell_hotkey]:
+            mask |= HELD_SPELL
+        if keys[pygame.K_ESCAPE]:
+            mask |= HELD_ESCAPE
+        self.pressed = 0
+
+        self.recording.append(mask)
+        apply_input(game, mask, self.recording.spell_hotkey)
+
+    def free_path(self):
+        """self.path, or the first numbered name beside it that is not taken"""
+        path = self.path
+        base, ext = os.path.splitext(path)
+        number = 1
+        while os.path.exists(path):
+            number += 1
+            path = f"{base}-{number}{ext}"
+        return path
+
+    def stop(self):
+        """Finish recording, save it if a path was given, and hand input back to the keyboard"""
+        recording = self.recording
+        recording.checksum = player_checksum(self.game.player)
+        if self.path:
+            path = self.free_path()
+            recording.save(path)
+            print(f"Recorded {recording.steps} steps to {path} "
+                  f"({len(recording.to_bytes())} bytes, checksum {recording.checksum:08x})")
+
+        self.game.before_step = None
+        self.game.input_keys = None
+        self.recording = None
+        self.game = None
+        return recording
+
+def replay(game, recording, render=False):
+    """Play a recording back through the gameplay loop as fast as possible
+
+    Returns (steps per second, True if the final player state matches).
+    """
+    game.settings.window_width, game.settings.window_height = recording.window_size
+    game.assets.quality.enabled = False
+    seed_everything(game, recording.seed)
+    game.start_game()
+
+    masks = recording.masks()
+    game.before_step = lambda game: apply_input(game, next(masks), recording.spell_hotkey)
+
+    step_time = game.timestep.step_time
+    start_time = time.perf_counter()
+    while game.step_count < recording.steps:
+        game._run_game(render, step_time)
+    elapsed = time.perf_counter() - start_time
+    game.before_step = None
+
+    rate = recording.steps / elapsed if elapsed > 0 else float('inf')
+    return rate, player_checksum(game.player) == recording.checksum
+
+def run_replay(path, render=False):
+    """Replay a recording file headless and report whether it reproduced the session"""
+    recording = InputRecording.load(path)
+    use_dummy_drivers()
+    from main import Game
+    game = Game()
+
+    rate, matched = replay(game, recording, render)
+    checksum = player_checksum(game.player)
+    print(f"Replayed {recording.steps} steps from {path} at {rate:.0f} steps/s")
+    if matched:
+        print(f"  player checksum {checksum:08x} matches")
+    else:
+        print(f"  player checksum {checksum:08x} does not match recorded {recording.checksum:08x}")
+    pygame.quit()
+    return matched
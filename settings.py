@@ -1,8 +1,11 @@
 import json
 import os
 import pygame
+from settings_saver import SettingsSaver
 
 class Settings:
+    PATH = 'settings.json'
+    
     def __init__(self):
         self.window_width = 800
         self.window_height = 600
@@ -10,6 +13,17 @@ class Settings:
         self.spell_hotkey = pygame.K_1
         self.show_settings = False
         
+        # Present only changed screen areas during gameplay (helps software rendering)
+        self.dirty_rect_rendering = False
+        
+        # Gameplay is simulated at a fixed rate, independent of the render rate
+        self.simulation_rate = 60
+        self.render_fps = 60  # 0 renders as fast as possible
+        self.max_catchup_steps = 5
+        
+        # Lower effect quality automatically when frames run over budget
+        self.adaptive_quality = True
+        
         # Default wizard customization
         self.wizard_customization = {
             'color': (180, 30, 30),  # Crimson
@@ -20,17 +34,25 @@ class Settings:
             'magic_power': 1.0
         }
         
+        # Changes are written to disk in the background, a moment after they stop
+        self.saver = SettingsSaver(self.PATH)
+        
         # Load settings if they exist
         self.load_settings()
     
     def load_settings(self):
-        if os.path.exists('settings.json'):
-            with open('settings.json', 'r') as f:
+        if os.path.exists(self.PATH):
+            with open(self.PATH, 'r') as f:
                 settings = json.load(f)
                 self.window_width = settings.get('window_width', self.window_width)
                 self.window_height = settings.get('window_height', self.window_height)
                 self.music_volume = settings.get('music_volume', self.music_volume)
                 self.spell_hotkey = settings.get('spell_hotkey', self.spell_hotkey)
+                self.dirty_rect_rendering = settings.get('dirty_rect_rendering', self.dirty_rect_rendering)
+                self.simulation_rate = settings.get('simulation_rate', self.simulation_rate)
+                self.render_fps = settings.get('render_fps', self.render_fps)
+                self.max_catchup_steps = settings.get('max_catchup_steps', self.max_catchup_steps)
+                self.adaptive_quality = settings.get('adaptive_quality', self.adaptive_quality)
                 
                 # Load wizard customization if available
                 if 'wizard_customization' in settings:
@@ -44,15 +66,24 @@ class Settings:
                     self.wizard_customization.update(wizard_settings)
     
     def save_settings(self):
+        """Schedule the current settings to be written; see flush()"""
         settings = {
             'window_width': self.window_width,
             'window_height': self.window_height,
             'music_volume': self.music_volume,
             'spell_hotkey': self.spell_hotkey,
-            'wizard_customization': self.wizard_customization
+            'dirty_rect_rendering': self.dirty_rect_rendering,
+            'simulation_rate': self.simulation_rate,
+            'render_fps': self.render_fps,
+            'max_catchup_steps': self.max_catchup_steps,
+            'adaptive_quality': self.adaptive_quality,
+            'wizard_customization': dict(self.wizard_customization)
         }
-        with open('settings.json', 'w') as f:
-            json.dump(settings, f)
+        self.saver.save(settings)
+    
+    def flush(self):
+        """Write any unsaved settings now, before quitting"""
+        self.saver.flush()
     
     def update_window_size(self, width, height):
         self.window_width = width
@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+import time
+
+class SettingsSaver:
+    """Writes settings to disk on a background thread, coalescing changes made close together
+
+    save() only records the latest snapshot; the writer thread waits until
+    no new snapshot has arrived for `delay` seconds, then writes it to a
+    temporary file and renames it over the target, so a crash mid-write
+    never leaves a truncated file. flush() writes anything pending right
+    away on the calling thread.
+    """
+
+    def __init__(self, path, delay=0.5):
+        self.path = path
+        self.delay = delay
+
+        # Latest unsaved snapshot, when it is due, and when it first became dirty
+        self.condition = threading.Condition()
+        self.pending = None
+        self.due = 0.0
+        self.dirty_since = None
+        self.thread = None
+
+        # Held while writing so flush() and the writer thread never overlap
+        self.write_lock = threading.Lock()
+
+        # Statistics
+        self.requests = 0
+        self.writes = 0
+        self.last_latency = None
+        self.max_latency = 0.0
+        self.write_time = 0.0
+
+    def save(self, data):
+        """Schedule data (a JSON-serializable snapshot the caller will not modify) to be written"""
+        now = time.perf_counter()
+        with self.condition:
+            self.pending = data
+            self.due = now + self.delay
+            if self.dirty_since is None:
+                self.dirty_since = now
+            self.requests += 1
+
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='settings-saver', daemon=True)
+                self.thread.start()
+            self.condition.notify()
+
+    def flush(self):
+        """Write any pending snapshot now and wait for it to reach the disk"""
+        with self.write_lock:
+            data, dirty_since = self._take_pending()
+            if data is not None:
+                self._write(data, dirty_since)
+
+    def _take_pending(self):
+        with self.condition:
+            data, dirty_since = self.pending, self.dirty_since
+            self.pending = None
+            self.dirty_since = None
+            return data, dirty_since
+
+    def _run(self):
+        while True:
+            with self.condition:
+                # Sleep until there is a snapshot and no newer one for `delay` seconds
+                while self.pending is None or time.perf_counter() < self.due:
+                    if self.pending is None:
+                        self.condition.wait()
+                    else:
+                        self.condition.wait(self.due - time.perf_counter())
+
+            with self.write_lock:
+                data, dirty_since = self._take_pending()
+                if data is not None:
+                    self._write(data, dirty_since)
+
+    def _write(self, data, dirty_since):
+        start = time.perf_counter()
+        temp_path = self.path + '.tmp'
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error saving settings: {e}")
+            return
+
+        end = time.perf_counter()
+        self.writes += 1
+        self.write_time += end - start
+        self.last_latency = end - dirty_since
+        self.max_latency = max(self.max_latency, self.last_latency)
+
+    def stats(self):
+        return {
+            'requests': self.requests,
+            'writes': self.writes,
+            'last_latency_ms': None if self.last_latency is None else self.last_latency * 1000,
+            'max_latency_ms': self.max_latency * 1000,
+            'write_ms': self.write_time * 1000
+        }
@@ -0,0 +1,46 @@
+class SpatialHash:
+    """Uniform grid of buckets over axis-aligned rects
+
+    Items are stored in every cell their rect touches. Queries return the
+    items whose cells overlap the query rect, in insertion order, so code
+    that used to scan the full list sees candidates in the same order.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.items = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, (rect.right - 1) // size,
+                rect.top // size, (rect.bottom - 1) // size)
+
+    def insert(self, item, rect):
+        index = len(self.items)
+        self.items.append(item)
+        left, right, top, bottom = self._cell_range(rect)
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                self.cells.setdefault((cell_x, cell_y), []).append(index)
+
+    def query(self, rect):
+        """Return candidate items near rect (a superset of the ones it overlaps)"""
+        left, right, top, bottom = self._cell_range(rect)
+        found = set()
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                bucket = self.cells.get((cell_x, cell_y))
+                if bucket:
+                    found.update(bucket)
+        return [self.items[index] for index in sorted(found)]
+
+    @classmethod
+    def from_platforms(cls, platforms, cell_size=128):
+        index = cls(cell_size)
+        for platform in platforms:
+            index.insert(platform, platform['rect'])
+        return index
@@ -0,0 +1,69 @@
+import itertools
+
+# Spell directions, used as the sign of the horizontal velocity
+RIGHT = 1
+LEFT = -1
+
+class Spell:
+    """One spell projectile; instances live in a SpellPool and are reused"""
+    __slots__ = ('x', 'prev_x', 'y', 'speed', 'direction', 'lifetime', 'color', 'power', 'has_image')
+
+    def __init__(self):
+        self.x = 0.0
+        self.prev_x = 0.0
+        self.y = 0.0
+        self.speed = 0.0
+        self.direction = RIGHT
+        self.lifetime = 0
+        self.color = (0, 0, 0)
+        self.power = 1.0
+        self.has_image = False
+
+class SpellPool:
+    """Fixed number of preallocated Spell slots; the first count of them are live
+
+    Removing a spell swaps the last live spell into its slot, so live
+    spells do not keep their casting order.
+    """
+
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self.slots = [Spell() for _ in range(capacity)]
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return itertools.islice(self.slots, self.count)
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self.slots[index]
+
+    def spawn(self, x, y, speed, direction, lifetime, color, power, has_image):
+        """Fill the next free slot and return it, or None if the pool is full"""
+        if self.count >= self.capacity:
+            return None
+        spell = self.slots[self.count]
+        spell.x = spell.prev_x = x
+        spell.y = y
+        spell.speed = speed
+        spell.direction = direction
+        spell.lifetime = lifetime
+        spell.color = color
+        spell.power = power
+        spell.has_image = has_image
+        self.count += 1
+        return spell
+
+    def release(self, index):
+        """Free the spell at index; the released Spell stays valid until the next spawn"""
+        last = self.count - 1
+        slots = self.slots
+        slots[index], slots[last] = slots[last], slots[index]
+        self.count = last
+
+    def clear(self):
+        self.count = 0
@@ -0,0 +1,26 @@
+import time
+
+class StartupProfile:
+    """Wall-clock time of each launch phase, from the start of main.py to the first frame"""
+
+    def __init__(self, start=None):
+        self.start = start if start is not None else time.perf_counter()
+        self.last = self.start
+        self.phases = []
+        self.enabled = False
+
+    def mark(self, phase):
+        """Close the phase that ran since the previous mark"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    @property
+    def total(self):
+        return self.last - self.start
+
+    def report(self):
+        print("Startup profile:")
+        for phase, seconds in self.phases:
+            print(f"  {phase:<16} {seconds * 1000:8.1f} ms")
+        print(f"  {'total':<16} {self.total * 1000:8.1f} ms")